@@ -0,0 +1,132 @@
+"""Benchmark of batching GraphQL operations.
+
+Sends concurrent form reads through the GraphQL client, with and without
+batching, to a stub server that answers every request after a fixed
+round-trip time, handles a limited number of requests at a time and
+supports JSON array batches. Results are checked against the requested
+forms, including forms that don't exist.
+
+Usage:
+    python benchmarks/batching.py --size 1 --size 16 --size 64 --rtt 0.02
+        --connections 10
+"""
+
+import argparse
+import asyncio
+import json
+from time import perf_counter
+
+import httpx
+
+from api.graphql import errors as ge
+from api.graphql import models as gm
+from api.graphql.client import GraphQLRawClient
+
+
+class StubGraphQLServer:
+    """GraphQL server answering form reads after a fixed round-trip time."""
+
+    def __init__(self, rtt: float, fields: int, connections: int) -> None:
+        self._rtt = rtt
+        self._fields = fields
+        self._connections = asyncio.Semaphore(connections)
+        self.requests = 0
+
+    def _form(self, id: str) -> dict:
+        return {
+            "id": id,
+            "title": f"Form {id}",
+            "fields": [
+                {
+                    "id": f"{id}-field{i}",
+                    "idx": i,
+                    "title": f"Field {i}",
+                    "type": "textfield",
+                    "description": "",
+                    "required": False,
+                    "defaultValue": None,
+                    "options": [],
+                }
+                for i in range(self._fields)
+            ],
+        }
+
+    def _answer(self, payload: dict) -> dict:
+        id = payload["variables"]["id"]
+
+        if id.startswith("missing"):
+            return {
+                "data": None,
+                "errors": [
+                    {
+                        "message": "invalid id passed",
+                        "extensions": {"code": "INTERNAL_SERVER_ERROR"},
+                    }
+                ],
+            }
+
+        return {"data": {"form": self._form(id)}}
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+
+        async with self._connections:
+            await asyncio.sleep(self._rtt)
+
+        payload = json.loads(request.content)
+
+        if isinstance(payload, list):
+            return httpx.Response(200, json=[self._answer(p) for p in payload])
+
+        return httpx.Response(200, json=self._answer(payload))
+
+
+async def benchmark(args: argparse.Namespace, size: int) -> tuple[float, int, bool]:
+    """Read forms concurrently and measure the time, requests and correctness."""
+
+    server = StubGraphQLServer(args.rtt, args.fields, args.connections)
+    client = GraphQLRawClient(
+        "http://graphql/graphql", batch_size=size, batch_window=args.window
+    )
+    # Route the HTTPX client of the transport to the stub server
+    client._client.transport.kwargs["transport"] = httpx.MockTransport(server.handle)
+
+    tokens = gm.Tokens(access="access", refresh="refresh")
+    ids = [f"missing{i}" if i % 7 == 0 else f"form{i}" for i in range(args.reads)]
+
+    async with client:
+        start = perf_counter()
+        results = await asyncio.gather(
+            *(client.get_form(gm.GetFormRequest(id=id), tokens) for id in ids),
+            return_exceptions=True,
+        )
+        elapsed = perf_counter() - start
+
+    correct = all(
+        isinstance(result, ge.NotFoundError)
+        if id.startswith("missing")
+        else isinstance(result, gm.GetFormResponse) and result.form.id == id
+        for id, result in zip(ids, results)
+    )
+    return elapsed, server.requests, correct
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, action="append")
+    parser.add_argument("--window", type=float, default=0.002)
+    parser.add_argument("--rtt", type=float, default=0.02)
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument("--reads", type=int, default=500)
+    parser.add_argument("--fields", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'size':<6}{'time':>10}{'requests':>10}{'correct':>10}")
+
+    for size in args.size or [1, 16, 64]:
+        elapsed, requests, correct = asyncio.run(benchmark(args, size))
+        print(f"{size:<6}{elapsed:>9.3f}s{requests:>10}{str(correct):>10}")
+
+
+if __name__ == "__main__":
+    main()
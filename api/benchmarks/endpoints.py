@@ -0,0 +1,215 @@
+"""Throughput benchmark of the form endpoints.
+
+Drives the app in-process through ASGI, with the GraphQL client replaced by
+a stub that returns canned responses, so only the app itself is measured.
+
+The pydantic row encodes models with pydantic's own JSON serializer, as a
+baseline for the codecs.
+
+Usage:
+    python benchmarks/endpoints.py --codec pydantic --codec msgspec --codec orjson
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Any, Self
+
+from litestar import Litestar
+from pydantic import BaseModel
+
+from api.api.app import AppBuilder
+from api.codecs import Codec, MsgspecCodec
+from api.config.models import Config
+from api.graphql import models as gm
+
+
+class PydanticCodec(MsgspecCodec):
+    """Codec encoding models with pydantic's own JSON serializer."""
+
+    def encode(self, model: BaseModel) -> bytes:
+        return model.model_dump_json(by_alias=True).encode()
+
+
+class PydanticAppBuilder(AppBuilder):
+    """Builds the app with the pydantic codec."""
+
+    def _build_codec(self) -> Codec:
+        return PydanticCodec()
+
+
+class StubGraphQLClient:
+    """GraphQL client returning canned responses."""
+
+    def __init__(self, forms: int, fields: int, options: int) -> None:
+        self._pager = gm.FormPager(
+            entries=[
+                gm.FormPagerEntry(id=f"form{i}", title=f"Form {i}")
+                for i in range(forms)
+            ],
+            total=forms,
+            limit=forms,
+            start=0,
+        )
+        self._form = gm.Form(
+            id="form0",
+            title="Form 0",
+            fields=[
+                gm.FormField(
+                    id=f"field{i}",
+                    idx=i,
+                    title=f"Field {i}",
+                    type="radio",
+                    description=f"Description of field {i}",
+                    required=True,
+                    default_value=None,
+                    options=[
+                        gm.FormFieldOption(
+                            id=f"option{j}", title=f"Option {j}", value=f"value{j}"
+                        )
+                        for j in range(options)
+                    ],
+                )
+                for i in range(fields)
+            ],
+        )
+        self._submission = gm.Submission(id="submission", percentage_complete=0)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        pass
+
+    async def list_forms(self, request=None) -> gm.ListFormsResponse:
+        return gm.ListFormsResponse(pager=self._pager)
+
+    async def get_form(self, request) -> gm.GetFormResponse:
+        return gm.GetFormResponse(form=self._form)
+
+    async def start_submission(self, request) -> gm.StartSubmissionResponse:
+        return gm.StartSubmissionResponse(submission=self._submission)
+
+    async def submit_field(self, request) -> gm.SubmitFieldResponse:
+        return gm.SubmitFieldResponse(submission=self._submission)
+
+    async def finish_submission(self, request) -> gm.FinishSubmissionResponse:
+        return gm.FinishSubmissionResponse(submission=self._submission)
+
+
+async def call(app: Litestar, method: str, path: str, body: bytes = b"") -> int:
+    """Call the app once and return the response status."""
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+    }
+    status = 0
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(
+    app: Litestar, method: str, path: str, body: bytes, requests: int
+) -> float:
+    """Measure throughput of an endpoint in requests per second."""
+
+    status = await call(app, method, path, body)
+    if status >= 400:
+        raise RuntimeError(f"{method} {path} failed with status {status}")
+
+    start = perf_counter()
+    for _ in range(requests):
+        await call(app, method, path, body)
+    return requests / (perf_counter() - start)
+
+
+async def benchmark(args: argparse.Namespace, codec: str) -> list[float]:
+    """Measure throughput of all endpoints with a codec."""
+
+    submission = {
+        "submission": {
+            "metadata": {"device": {"type": "desktop", "name": "benchmark"}},
+            "fields": {
+                f"field{i}": f"value{i % args.options}" for i in range(args.fields)
+            },
+        }
+    }
+    endpoints = [
+        ("list", "GET", "/forms", b""),
+        ("get", "GET", "/forms/form0", b""),
+        ("submit", "POST", "/forms/form0/submit", json.dumps(submission).encode()),
+    ]
+
+    # Disable the form cache, so every request encodes the form again
+    builder: Any = AppBuilder
+
+    if codec == "pydantic":
+        builder, codec = PydanticAppBuilder, "msgspec"
+
+    config = Config.model_validate(
+        {"serialization": {"codec": codec}, "cache": {"ttl": 0}}
+    )
+    app = builder(config).build()
+    app.state.graphql = StubGraphQLClient(args.forms, args.fields, args.options)
+
+    return [
+        await measure(app, method, path, body, args.requests)
+        for _, method, path, body in endpoints
+    ]
+
+
+def run(args: argparse.Namespace, codec: str) -> list[float]:
+    return asyncio.run(benchmark(args, codec))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--codec", action="append", choices=["pydantic", "msgspec", "orjson"]
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--forms", type=int, default=50)
+    parser.add_argument("--fields", type=int, default=20)
+    parser.add_argument("--options", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'codec':<10}{'list':>12}{'get':>12}{'submit':>12}")
+
+    for codec in args.codec or ["pydantic", "msgspec", "orjson"]:
+        # Routers are module-level, so each app is built in a fresh process
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results = executor.submit(run, args, codec).result()
+
+        print(f"{codec:<10}" + "".join(f"{result:>10.0f}/s" for result in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Import time profile of the app.
+
+Runs a fresh interpreter with -X importtime and reports the modules
+with the largest cumulative import time.
+
+Usage:
+    python benchmarks/imports.py --module api.api.app --top 20
+"""
+
+import argparse
+import subprocess
+import sys
+
+
+def profile(module: str) -> list[tuple[int, int, str]]:
+    """Import a module in a fresh interpreter and collect import times."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        self_time, cumulative, name = line.removeprefix("import time:").split("|")
+        times.append((int(cumulative), int(self_time), name.strip()))
+
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", action="append")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for module in args.module or ["api.__main__", "api.api.app"]:
+        times = profile(module)
+        total = next(cumulative for cumulative, _, name in times if name == module)
+
+        print(f"{module}: {total / 1000:.1f} ms")
+        print(f"{'cumulative':>12}{'self':>10}  module")
+
+        for cumulative, self_time, name in sorted(times, reverse=True)[: args.top]:
+            print(f"{cumulative / 1000:>10.1f}ms{self_time / 1000:>8.1f}ms  {name}")
+
+        print()
+
+
+if __name__ == "__main__":
+    main()
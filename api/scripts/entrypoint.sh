@@ -14,6 +14,16 @@ API__GRAPHQL__HOST="${API_GRAPHQL_HOST:-graphql}" \
 	API__GRAPHQL__PORT="${API_GRAPHQL_PORT:-30004}" \
 	API__GRAPHQL__USER="${API_GRAPHQL_USER:-admin}" \
 	API__GRAPHQL__PASSWORD="${API_GRAPHQL_PASSWORD:-password}" \
+	API__REDIS__ENABLED="${API_REDIS_ENABLED:-false}" \
+	API__REDIS__HOST="${API_REDIS_HOST:-redis}" \
+	API__REDIS__PORT="${API_REDIS_PORT:-30002}" \
+	API__DATABASE__ENABLED="${API_DATABASE_ENABLED:-false}" \
+	API__DATABASE__HOST="${API_DATABASE_HOST:-database}" \
+	API__DATABASE__PORT="${API_DATABASE_PORT:-30001}" \
+	API__DATABASE__USER="${API_DATABASE_USER:-user}" \
+	API__DATABASE__PASSWORD="${API_DATABASE_PASSWORD:-password}" \
+	API__DATABASE__NAME="${API_DATABASE_NAME:-database}" \
+	API__DATABASE__SALT="${API_DATABASE_SALT:-secret}" \
 	\
 	su-exec \
 	app \
@@ -2,18 +2,14 @@ from typing import Optional
 
 import typer
 
-from api.api.app import AppBuilder
 from api.cli import CliBuilder
-from api.config.builder import ConfigBuilder
-from api.config.errors import ConfigError
-from api.console import FallbackConsoleBuilder
-from api.server import Server
 
 cli = CliBuilder().build()
 
 
-@cli.command()
+@cli.callback(invoke_without_command=True)
 def main(
+    context: typer.Context,
     config_file: Optional[typer.FileText] = typer.Option(
         None,
         "--config-file",
@@ -30,6 +26,16 @@ def main(
 ) -> None:
     """Main entry point."""
 
+    if context.invoked_subcommand is not None:
+        return
+
+    # Imported here, so the CLI can start (e.g. for --help) without loading the app
+    from api.api.app import AppBuilder
+    from api.config.builder import ConfigBuilder
+    from api.config.errors import ConfigError
+    from api.console import FallbackConsoleBuilder
+    from api.server import Server
+
     console = FallbackConsoleBuilder().build()
 
     try:
@@ -55,5 +61,119 @@ def main(
         raise typer.Exit(3) from e
 
 
+@cli.command()
+def invalidate(
+    form: Optional[str] = typer.Option(
+        None,
+        "--form",
+        "-f",
+        help="ID of the form to invalidate, all forms if not set.",
+    ),
+    url: Optional[str] = typer.Option(
+        None,
+        "--url",
+        "-u",
+        help="Base URL of the running app.",
+    ),
+    config_file: Optional[typer.FileText] = typer.Option(
+        None,
+        "--config-file",
+        "-C",
+        dir_okay=False,
+        help="Configuration file.",
+    ),
+    config_overrides: Optional[list[str]] = typer.Option(
+        None,
+        "--config",
+        "-c",
+        help="Configuration entries.",
+    ),
+) -> None:
+    """Invalidate cached forms on all instances."""
+
+    from api.admin import AdminClient
+    from api.config.builder import ConfigBuilder
+    from api.config.errors import ConfigError
+    from api.console import FallbackConsoleBuilder
+
+    console = FallbackConsoleBuilder().build()
+
+    try:
+        config = ConfigBuilder(config_file, config_overrides).build()
+    except ConfigError as e:
+        console.print("Failed to load config!")
+        console.print_exception()
+        raise typer.Exit(1) from e
+
+    try:
+        AdminClient(config, url).invalidate(form)
+    except Exception as e:
+        console.print("Failed to invalidate cache!")
+        console.print_exception()
+        raise typer.Exit(2) from e
+
+
+@cli.command()
+def snapshot(
+    form: str = typer.Option(
+        ...,
+        "--form",
+        "-f",
+        help="ID of the form to snapshot.",
+    ),
+    rebuild: bool = typer.Option(
+        False,
+        "--rebuild",
+        help="Rebuild the snapshot from scratch.",
+    ),
+    url: Optional[str] = typer.Option(
+        None,
+        "--url",
+        "-u",
+        help="Base URL of the running app.",
+    ),
+    config_file: Optional[typer.FileText] = typer.Option(
+        None,
+        "--config-file",
+        "-C",
+        dir_okay=False,
+        help="Configuration file.",
+    ),
+    config_overrides: Optional[list[str]] = typer.Option(
+        None,
+        "--config",
+        "-c",
+        help="Configuration entries.",
+    ),
+) -> None:
+    """Append new submissions of a form to its columnar results snapshot."""
+
+    from api.admin import AdminClient
+    from api.config.builder import ConfigBuilder
+    from api.config.errors import ConfigError
+    from api.console import FallbackConsoleBuilder
+
+    console = FallbackConsoleBuilder().build()
+
+    try:
+        config = ConfigBuilder(config_file, config_overrides).build()
+    except ConfigError as e:
+        console.print("Failed to load config!")
+        console.print_exception()
+        raise typer.Exit(1) from e
+
+    try:
+        result = AdminClient(config, url).snapshot(form, rebuild)
+    except Exception as e:
+        console.print("Failed to snapshot results!")
+        console.print_exception()
+        raise typer.Exit(2) from e
+
+    console.print(
+        f"Snapshot of {form} has {result['submissions']} submissions "
+        f"({result['appended']} appended)."
+    )
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,43 @@
+import httpx
+
+from api.config.models import Config
+
+
+class AdminClient:
+    """Client for the admin endpoints of a running app.
+
+    Args:
+        config: Config of the app.
+        url: Base URL of the app, derived from the config if not set.
+    """
+
+    def __init__(self, config: Config, url: str | None = None) -> None:
+        self._url = url or f"http://localhost:{config.server.port}"
+        self._token = config.admin.token
+
+    def _build_headers(self) -> dict:
+        """Build authentication headers."""
+
+        return {"Authorization": f"Bearer {self._token}"} if self._token else {}
+
+    def invalidate(self, form: str | None = None) -> None:
+        """Invalidate a cached form or all cached forms on all instances."""
+
+        response = httpx.post(
+            f"{self._url}/admin/cache/invalidate",
+            json={"form": form},
+            headers=self._build_headers(),
+        )
+        response.raise_for_status()
+
+    def snapshot(self, form: str, rebuild: bool = False) -> dict:
+        """Append new submissions of a form to its columnar snapshot."""
+
+        response = httpx.post(
+            f"{self._url}/results/{form}/snapshot",
+            params={"rebuild": rebuild},
+            headers=self._build_headers(),
+            timeout=None,
+        )
+        response.raise_for_status()
+        return response.json()
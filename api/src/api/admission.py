@@ -0,0 +1,68 @@
+import asyncio
+from collections import defaultdict
+
+
+class LagMonitor:
+    """Measures the lag of the event loop.
+
+    Args:
+        interval: Number of seconds between measurements.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._lag = 0.0
+
+    @property
+    def lag(self) -> float:
+        return self._lag
+
+    async def run(self) -> None:
+        """Measure the lag until cancelled."""
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            self._lag = max(loop.time() - start - self._interval, 0.0)
+
+
+class Admission:
+    """Decides whether to admit requests based on in-flight count and loop lag.
+
+    Args:
+        limits: Maximum number of in-flight requests per class.
+        max_lag: Maximum event loop lag in seconds before requests are rejected.
+        monitor: Monitor of the event loop lag.
+    """
+
+    def __init__(
+        self, limits: dict[str, int], max_lag: float, monitor: LagMonitor
+    ) -> None:
+        self._limits = limits
+        self._max_lag = max_lag
+        self._monitor = monitor
+        self._inflight: defaultdict[str, int] = defaultdict(int)
+
+    def inflight(self, kind: str) -> int:
+        """Get number of in-flight requests of a class."""
+
+        return self._inflight[kind]
+
+    def admit(self, kind: str) -> str | None:
+        """Try to admit a request and return the reason of rejection if any."""
+
+        if self._inflight[kind] >= self._limits[kind]:
+            return "inflight"
+
+        if self._monitor.lag > self._max_lag:
+            return "lag"
+
+        self._inflight[kind] += 1
+        return None
+
+    def release(self, kind: str) -> None:
+        """Release an admitted request."""
+
+        self._inflight[kind] -= 1
@@ -1,17 +1,68 @@
-from contextlib import AbstractAsyncContextManager, asynccontextmanager
+import asyncio
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, suppress
 from importlib import metadata
-from typing import AsyncGenerator, Callable
+from time import perf_counter
+from typing import AsyncGenerator, Callable, Coroutine
 
 from litestar import Litestar, Router
 from litestar.contrib.pydantic import PydanticPlugin
+from litestar.middleware.base import DefineMiddleware
 from litestar.openapi import OpenAPIConfig
 from litestar.plugins import PluginProtocol
+from litestar.types import TypeEncodersMap
+from msgspec import Raw
+from pydantic import BaseModel
+from redis.asyncio import Redis
 
+from api.admission import Admission, LagMonitor
+from api.api.middleware.admission import AdmissionMiddleware
+from api.api.middleware.compression import CompressionMiddleware
+from api.api.request import CodecRequest
+from api.api.routes.forms.errors import ServiceError
+from api.api.routes.forms.service import Service
 from api.api.routes.router import router
+from api.cache.forms import FormCache
+from api.cache.invalidation import CacheInvalidator
+from api.cache.known import KnownForms
+from api.cache.negative import NegativeFormCache
+from api.cache.remote import RemoteFormCache
+from api.cache.shared import SharedFormCache
+from api.cache.snapshot import FormCacheSnapshot
+from api.codecs import Codec, MsgspecCodec, OrjsonCodec
+from api.compression import (
+    BrotliCompressor,
+    Compression,
+    Compressor,
+    GzipCompressor,
+    ZstdCompressor,
+)
 from api.config.models import Config
-from api.graphql.client import GraphQLClient
+from api.database.client import DatabaseClient
+from api.database.errors import DatabaseError
+from api.graphql.client import GraphQLClient, GraphQLReplica
+from api.graphql.errors import GraphQLError
 from api.graphql.models import LoginRequest
+from api.graphql.scheduler import Scheduler, SchedulingClass
+from api.graphql.tokens import FileTokenStore, RedisTokenStore, TokenStore
+from api.health import Health
+from api.metrics import Metrics
+from api.results.aggregate import ResultsAggregator
+from api.results.broadcast import ResultsBroadcaster
+from api.results.columnar import ResultsStore
+from api.results.tallies import (
+    MemoryTallyStore,
+    QuantileSketch,
+    RedisTallyStore,
+    Tallies,
+)
 from api.state import State
+from api.submissions.tracker import (
+    MemorySubmissionTracker,
+    RedisSubmissionTracker,
+    SubmissionTracker,
+)
+from api.submissions.votes import VoteBatcher
+from api.workers import WorkerPool
 
 
 class AppBuilder:
@@ -44,42 +95,707 @@ class AppBuilder:
             self._build_pydantic_plugin(),
         ]
 
-    def _build_graphql_client(self) -> GraphQLClient:
+    def _build_codec(self) -> Codec:
+        match self._config.serialization.codec:
+            case "msgspec":
+                return MsgspecCodec()
+            case "orjson":
+                return OrjsonCodec()
+
+    def _build_type_encoders(self, state: State) -> TypeEncodersMap:
+        codec = state.codec
+
+        return {
+            BaseModel: lambda model: Raw(codec.encode(model)),
+        }
+
+    def _build_compressors(self, levels: dict[str, int]) -> list[Compressor]:
+        compressors = {
+            "zstd": ZstdCompressor,
+            "br": BrotliCompressor,
+            "gzip": GzipCompressor,
+        }
+
+        return [
+            compressors[encoding](level=levels[encoding])
+            for encoding in self._config.compression.encodings
+        ]
+
+    def _build_compression(self) -> Compression:
+        return Compression(
+            compressors=self._build_compressors({"zstd": 3, "br": 4, "gzip": 6}),
+            precompressors=self._build_compressors({"zstd": 19, "br": 11, "gzip": 9}),
+            minimum_size=self._config.compression.minimum_size,
+        )
+
+    def _build_middleware(self, state: State) -> list[DefineMiddleware]:
+        middleware = [
+            DefineMiddleware(CompressionMiddleware, compression=state.compression),
+        ]
+
+        if self._config.admission.enabled:
+            middleware.insert(
+                0,
+                DefineMiddleware(
+                    AdmissionMiddleware,
+                    admission=state.admission,
+                    metrics=state.metrics,
+                    retry_after=self._config.admission.retry_after,
+                ),
+            )
+
+        return middleware
+
+    def _build_scheduler(self, metrics: Metrics) -> Scheduler:
+        config = self._config.graphql.scheduler
+        classes = {
+            "submission": SchedulingClass(**config.submission.model_dump()),
+            "start": SchedulingClass(**config.start.model_dump()),
+            "read": SchedulingClass(**config.read.model_dump()),
+            "export": SchedulingClass(**config.export.model_dump()),
+        }
+
+        def _on_wait(kind: str, wait: float) -> None:
+            metrics.scheduler_wait.labels(kind).observe(wait)
+
+        scheduler = Scheduler(
+            classes=classes,
+            concurrency=config.concurrency,
+            on_wait=_on_wait,
+        )
+
+        for kind in classes:
+            metrics.scheduler_queue_depth.labels(kind).set_function(
+                lambda kind=kind: scheduler.depth(kind)
+            )
+
+        return scheduler
+
+    def _build_token_store(self, redis: Redis | None) -> TokenStore | None:
+        config = self._config.graphql.tokens
+
+        match config.backend:
+            case "memory":
+                return None
+            case "file":
+                return FileTokenStore(
+                    path=config.path,
+                    lease=config.lease,
+                    poll=config.poll,
+                )
+            case "redis":
+                if redis is None:
+                    raise ValueError("Redis token store requires Redis to be enabled.")
+
+                return RedisTokenStore(
+                    redis=redis,
+                    prefix=self._config.redis.prefix,
+                    lease=config.lease,
+                    poll=config.poll,
+                )
+
+    def _build_graphql_replicas(
+        self, metrics: Metrics, redis: Redis | None
+    ) -> list[GraphQLReplica]:
+        config = self._config.graphql
+        replicas = config.replicas or [config]
+        store = self._build_token_store(redis)
+        batching = config.batching
+
+        return [
+            GraphQLReplica(
+                url=f"http://{replica.host}:{replica.port}/graphql",
+                login=LoginRequest(
+                    username=config.user,
+                    password=config.password,
+                ),
+                store=store,
+                # With more replicas, failing over beats retrying the same one
+                retry=len(replicas) == 1,
+                ejection=config.ejection,
+                ejection_max=config.ejection_max,
+                readmission=config.readmission,
+                batch_size=batching.size if batching.enabled else 1,
+                batch_window=batching.window,
+                on_batch=metrics.graphql_batch_size.observe,
+            )
+            for replica in replicas
+        ]
+
+    def _build_graphql_client(
+        self, metrics: Metrics, redis: Redis | None
+    ) -> GraphQLClient:
         return GraphQLClient(
-            url=f"http://{self._config.graphql.host}:{self._config.graphql.port}/graphql",
-            login=LoginRequest(
-                username=self._config.graphql.user,
-                password=self._config.graphql.password,
-            ),
+            replicas=self._build_graphql_replicas(metrics, redis),
+            scheduler=self._build_scheduler(metrics),
+        )
+
+    def _build_database_client(self, health: Health) -> DatabaseClient | None:
+        config = self._config.database
+
+        if not config.enabled:
+            return None
+
+        return DatabaseClient(
+            host=config.host,
+            port=config.port,
+            user=config.user,
+            password=config.password,
+            name=config.name,
+            salt=config.salt,
+            min_length=config.min_length,
+            pool_min=config.pool_min,
+            pool_max=config.pool_max,
+            timeout=config.timeout,
+            backoff=config.backoff,
+            on_state=lambda reachable: health.set_ready("database", reachable),
+        )
+
+    def _build_submission_tracker(self, redis: Redis | None) -> SubmissionTracker:
+        config = self._config.submissions
+
+        if redis is not None:
+            return RedisSubmissionTracker(
+                redis=redis,
+                prefix=self._config.redis.prefix,
+                ttl=config.ttl,
+            )
+
+        if self._config.server.workers > 1:
+            raise ValueError(
+                "Resuming submissions with multiple server workers requires Redis."
+            )
+
+        return MemorySubmissionTracker(ttl=config.ttl, capacity=config.capacity)
+
+    def _build_form_cache(self) -> FormCache:
+        return FormCache(
+            ttl=self._config.cache.ttl,
+            capacity=self._config.cache.capacity,
+        )
+
+    def _build_negative_form_cache(self) -> NegativeFormCache:
+        return NegativeFormCache(
+            ttl=self._config.cache.negative_ttl,
+            capacity=self._config.cache.negative_capacity,
         )
 
+    def _build_known_forms(self) -> KnownForms | None:
+        if not self._config.cache.known.enabled:
+            return None
+
+        return KnownForms(error_rate=self._config.cache.known.error_rate)
+
+    def _build_redis(self) -> Redis | None:
+        config = self._config.redis
+
+        if not config.enabled:
+            return None
+
+        return Redis(
+            host=config.host,
+            port=config.port,
+            db=config.db,
+            password=config.password,
+            socket_timeout=config.timeout,
+            socket_connect_timeout=config.timeout,
+        )
+
+    def _build_remote_form_cache(self, redis: Redis | None) -> RemoteFormCache | None:
+        if redis is None:
+            return None
+
+        return RemoteFormCache(
+            redis=redis,
+            ttl=self._config.cache.remote_ttl,
+            prefix=self._config.redis.prefix,
+            backoff=self._config.redis.backoff,
+        )
+
+    def _build_shared_form_cache(self) -> SharedFormCache | None:
+        if not self._config.cache.shared:
+            return None
+
+        return SharedFormCache(path=self._config.cache.shared_path)
+
+    def _build_form_cache_snapshot(self) -> FormCacheSnapshot | None:
+        if not self._config.cache.snapshot.enabled:
+            return None
+
+        return FormCacheSnapshot(path=self._config.cache.snapshot.path)
+
+    def _build_cache_invalidator(
+        self,
+        cache: FormCache,
+        negative: NegativeFormCache,
+        known: KnownForms | None,
+        shared: SharedFormCache | None,
+        remote: RemoteFormCache | None,
+        redis: Redis | None,
+    ) -> CacheInvalidator:
+        return CacheInvalidator(
+            cache=cache,
+            negative=negative,
+            known=known,
+            shared=shared,
+            remote=remote,
+            redis=redis,
+            channel=self._config.redis.channel,
+            backoff=self._config.redis.backoff,
+        )
+
+    def _build_health(self) -> Health:
+        components = ["graphql"]
+
+        if self._config.cache.warmup.enabled:
+            components.append("warmup")
+
+        # Forms are served from the GraphQL service when the database is down
+        optional = ["database"] if self._config.database.enabled else []
+
+        return Health(components, optional)
+
+    def _build_metrics(self) -> Metrics:
+        return Metrics()
+
+    def _build_lag_monitor(self) -> LagMonitor:
+        return LagMonitor(interval=self._config.admission.lag_interval)
+
+    def _build_admission(self, monitor: LagMonitor) -> Admission:
+        return Admission(
+            limits={
+                "read": self._config.admission.read_limit,
+                "submit": self._config.admission.submit_limit,
+            },
+            max_lag=self._config.admission.max_lag,
+            monitor=monitor,
+        )
+
+    def _build_results_store(self) -> ResultsStore:
+        return ResultsStore(path=self._config.results.path)
+
+    def _build_results_aggregator(self) -> ResultsAggregator:
+        return ResultsAggregator(
+            bins=self._config.results.bins,
+            max_bins=self._config.results.max_bins,
+        )
+
+    def _build_tallies(
+        self, redis: Redis | None, aggregator: ResultsAggregator
+    ) -> Tallies | None:
+        config = self._config.results
+
+        match config.tallies:
+            case "off":
+                return None
+            case "memory":
+                if self._config.server.workers > 1:
+                    raise ValueError(
+                        "Memory tallies require a single server worker, use Redis."
+                    )
+
+                store = MemoryTallyStore()
+            case "redis":
+                if redis is None:
+                    raise ValueError("Redis tallies require Redis to be enabled.")
+
+                store = RedisTallyStore(redis=redis, prefix=self._config.redis.prefix)
+
+        return Tallies(
+            store=store,
+            sketch=QuantileSketch(accuracy=config.accuracy),
+            aggregator=aggregator,
+        )
+
+    def _build_results_broadcaster(self, metrics: Metrics) -> ResultsBroadcaster:
+        config = self._config.results
+
+        return ResultsBroadcaster(
+            tick=config.stream_tick,
+            buffer=config.stream_buffer,
+            heartbeat=config.stream_heartbeat,
+            limit=config.stream_limit,
+            metrics=metrics,
+        )
+
+    def _build_vote_batcher(self, metrics: Metrics) -> VoteBatcher | None:
+        config = self._config.submissions.votes
+
+        if not config.enabled:
+            return None
+
+        batcher = VoteBatcher(
+            size=config.batch_size,
+            interval=config.interval,
+            capacity=config.capacity,
+            retries=config.retries,
+            backoff=config.backoff,
+            metrics=metrics,
+        )
+        metrics.votes_queue_depth.set_function(lambda: batcher.depth)
+        return batcher
+
+    def _build_worker_pool(self, metrics: Metrics) -> WorkerPool:
+        config = self._config.workers
+
+        pool = WorkerPool(
+            processes=config.processes,
+            queue=config.queue,
+            timeout=config.timeout,
+            start_method=config.start_method,
+            metrics=metrics,
+        )
+        metrics.worker_waiting.set_function(lambda: pool.waiting)
+        metrics.worker_running.set_function(lambda: pool.running)
+        return pool
+
     def _build_initial_state(self) -> State:
+        metrics = self._build_metrics()
+        health = self._build_health()
+        lag = self._build_lag_monitor()
+        redis = self._build_redis()
+        cache = self._build_form_cache()
+        negative = self._build_negative_form_cache()
+        known = self._build_known_forms()
+        shared = self._build_shared_form_cache()
+        remote = self._build_remote_form_cache(redis)
+        aggregator = self._build_results_aggregator()
+        metrics.loop_lag.set_function(lambda: lag.lag)
+
         return State(
             {
                 "config": self._config,
-                "graphql": self._build_graphql_client(),
+                "graphql": self._build_graphql_client(metrics, redis),
+                "database": self._build_database_client(health),
+                "submissions": self._build_submission_tracker(redis),
+                "cache": cache,
+                "negative": negative,
+                "known": known,
+                "redis": redis,
+                "shared": shared,
+                "snapshot": self._build_form_cache_snapshot(),
+                "remote": remote,
+                "invalidator": self._build_cache_invalidator(
+                    cache, negative, known, shared, remote, redis
+                ),
+                "compression": self._build_compression(),
+                "codec": self._build_codec(),
+                "health": health,
+                "metrics": metrics,
+                "lag": lag,
+                "admission": self._build_admission(lag),
+                "results": self._build_results_store(),
+                "aggregator": aggregator,
+                "tallies": self._build_tallies(redis, aggregator),
+                "broadcaster": self._build_results_broadcaster(metrics),
+                "votes": self._build_vote_batcher(metrics),
+                "workers": self._build_worker_pool(metrics),
             }
         )
 
+    def _build_service(self, state: State) -> Service:
+        return Service(
+            graphql=state.graphql,
+            database=state.database,
+            submissions=state.submissions,
+            cache=state.cache,
+            negative=state.negative,
+            known=state.known,
+            remote=state.remote,
+            shared=state.shared,
+            compression=state.compression,
+            codec=state.codec,
+            tallies=state.tallies,
+            config=state.config.submissions,
+        )
+
+    async def _login(self, state: State) -> None:
+        """Login to the GraphQL API, retrying until it succeeds."""
+
+        while True:
+            try:
+                await state.graphql.login()
+                break
+            except GraphQLError:
+                await asyncio.sleep(self._config.graphql.login_retry)
+
+        state.health.set_ready("graphql")
+
+    async def _warmup(self, app: Litestar) -> None:
+        """Load forms into the cache."""
+
+        state: State = app.state
+        config = self._config.cache.warmup
+
+        if not config.enabled:
+            return
+
+        service = self._build_service(state)
+        start = perf_counter()
+
+        try:
+            loaded, failed = await service.warmup(
+                limit=config.limit,
+                concurrency=config.concurrency,
+                page_size=config.page_size,
+            )
+        except ServiceError:
+            app.logger.warning("Form cache warm-up failed to list forms.")
+        else:
+            duration = perf_counter() - start
+            state.metrics.warmup_duration.set(duration)
+            state.metrics.warmup_forms.set(loaded)
+            state.metrics.warmup_failures.set(failed)
+            app.logger.info(
+                "Form cache warm-up loaded %d forms (%d failed) in %.3f s.",
+                loaded,
+                failed,
+                duration,
+            )
+
+        state.health.set_ready("warmup")
+
+    async def _revalidate(self, app: Litestar) -> None:
+        """Refetch stale cached forms, e.g. restored from a snapshot."""
+
+        state: State = app.state
+        config = self._config.cache.snapshot
+
+        if not config.enabled:
+            return
+
+        service = self._build_service(state)
+        start = perf_counter()
+        refetched, failed = await service.revalidate(concurrency=config.concurrency)
+
+        app.logger.info(
+            "Form cache revalidation refetched %d forms (%d failed) in %.3f s.",
+            refetched,
+            failed,
+            perf_counter() - start,
+        )
+
+    async def _startup(self, app: Litestar) -> None:
+        """Login, warm up and revalidate in the background."""
+
+        await self._login(app.state)
+        await self._warmup(app)
+        await self._revalidate(app)
+
+    async def _connect_database(self, database: DatabaseClient) -> None:
+        """Connect to the database, leaving retries to the first reads."""
+
+        with suppress(DatabaseError):
+            await database.connect()
+
+    @asynccontextmanager
+    async def _background(self, coroutine: Coroutine) -> AsyncGenerator[None, None]:
+        """Run a coroutine in the background, cancelling it on exit."""
+
+        task = asyncio.create_task(coroutine)
+
+        try:
+            yield
+        finally:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    @asynccontextmanager
+    async def _database_lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
+        state: State = app.state
+
+        if state.database is None:
+            yield
+            return
+
+        # The pool is created in the background, so startup doesn't wait for it
+        async with self._background(self._connect_database(state.database)):
+            try:
+                yield
+            finally:
+                await state.database.close()
+
     @asynccontextmanager
     async def _graphql_lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
         state: State = app.state
 
-        async with state.graphql:
+        if not self._config.graphql.background_login:
+            async with state.graphql:
+                state.health.set_ready("graphql")
+                await self._warmup(app)
+
+                async with self._background(self._revalidate(app)):
+                    yield
+            return
+
+        await state.graphql.connect(login=False)
+
+        try:
+            async with self._background(self._startup(app)):
+                yield
+        finally:
+            await state.graphql.close()
+
+    @asynccontextmanager
+    async def _lag_lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
+        state: State = app.state
+
+        if not self._config.admission.enabled:
+            yield
+            return
+
+        async with self._background(state.lag.run()):
+            yield
+
+    @asynccontextmanager
+    async def _cache_lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
+        state: State = app.state
+
+        try:
+            async with self._background(state.invalidator.listen()):
+                yield
+        finally:
+            if state.redis is not None:
+                await state.redis.aclose()
+
+            if state.shared is not None:
+                state.shared.close()
+
+    async def _refresh_known(self, app: Litestar) -> None:
+        """Rebuild the filter of known form ids periodically."""
+
+        state: State = app.state
+        config = self._config.cache.known
+        service = self._build_service(state)
+
+        while True:
+            try:
+                ids = await service.list_ids(None, config.page_size)
+            except ServiceError:
+                app.logger.warning("Failed to list forms for the known forms filter.")
+            else:
+                state.known.replace(ids)
+                state.metrics.known_forms.set(len(ids))
+
+            await asyncio.sleep(config.interval)
+
+    @asynccontextmanager
+    async def _known_lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
+        state: State = app.state
+
+        if state.known is None:
+            yield
+            return
+
+        async with self._background(self._refresh_known(app)):
+            yield
+
+    async def _save_snapshot(self, app: Litestar) -> None:
+        """Save the form cache to the snapshot."""
+
+        state: State = app.state
+
+        # Copy bodies, so they don't change while being saved in another thread
+        entries = [
+            cached.model_copy(update={"bodies": dict(cached.bodies)})
+            for cached in state.cache.entries()
+        ]
+
+        try:
+            await asyncio.to_thread(state.snapshot.save, entries)
+        except OSError:
+            app.logger.warning("Failed to save form cache snapshot.", exc_info=True)
+
+    async def _save_snapshots(self, app: Litestar) -> None:
+        """Save the form cache to the snapshot periodically."""
+
+        while True:
+            await asyncio.sleep(self._config.cache.snapshot.interval)
+            await self._save_snapshot(app)
+
+    @asynccontextmanager
+    async def _snapshot_lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
+        state: State = app.state
+
+        if state.snapshot is None:
             yield
+            return
+
+        entries = await asyncio.to_thread(state.snapshot.load)
+
+        for cached in entries:
+            state.cache.restore(cached)
+
+        app.logger.info("Restored %d forms from form cache snapshot.", len(entries))
+
+        try:
+            async with self._background(self._save_snapshots(app)):
+                yield
+        finally:
+            await self._save_snapshot(app)
+
+    @asynccontextmanager
+    async def _workers_lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
+        state: State = app.state
+        state.workers.start()
+
+        try:
+            yield
+        finally:
+            await state.workers.close()
+
+    @asynccontextmanager
+    async def _broadcast_lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
+        state: State = app.state
+
+        try:
+            yield
+        finally:
+            await state.broadcaster.close()
+
+    @asynccontextmanager
+    async def _votes_lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
+        state: State = app.state
+
+        if state.votes is None:
+            yield
+            return
+
+        service = self._build_service(state)
+
+        try:
+            async with self._background(state.votes.run(service.submit_vote)):
+                yield
+        finally:
+            # Votes were acknowledged, so they are submitted before shutting down
+            await state.votes.drain(service.submit_vote)
 
     def _build_lifespan(
         self,
     ) -> list[Callable[[Litestar], AbstractAsyncContextManager]]:
         return [
+            self._workers_lifespan,
+            self._lag_lifespan,
+            self._cache_lifespan,
+            self._snapshot_lifespan,
+            self._database_lifespan,
             self._graphql_lifespan,
+            self._known_lifespan,
+            self._broadcast_lifespan,
+            self._votes_lifespan,
         ]
 
     def build(self) -> Litestar:
+        state = self._build_initial_state()
+
         return Litestar(
             route_handlers=self._get_route_handlers(),
             openapi_config=self._build_openapi_config(),
             plugins=self._build_plugins(),
-            state=self._build_initial_state(),
+            type_encoders=self._build_type_encoders(state),
+            request_class=CodecRequest,
+            middleware=self._build_middleware(state),
+            state=state,
             lifespan=self._build_lifespan(),
         )
@@ -1,5 +1,8 @@
 from litestar.exceptions import HTTPException
-from litestar.status_codes import HTTP_422_UNPROCESSABLE_ENTITY
+from litestar.status_codes import (
+    HTTP_422_UNPROCESSABLE_ENTITY,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
 
 
 class UnprocessableEntityException(HTTPException):
@@ -7,3 +10,10 @@ class UnprocessableEntityException(HTTPException):
 
     status_code = HTTP_422_UNPROCESSABLE_ENTITY
     detail = "Unprocessable entity"
+
+
+class ServiceUnavailableException(HTTPException):
+    """Service unavailable."""
+
+    status_code = HTTP_503_SERVICE_UNAVAILABLE
+    detail = "Service unavailable"
@@ -0,0 +1,31 @@
+from secrets import compare_digest
+
+from litestar.connection import ASGIConnection
+from litestar.exceptions import NotAuthorizedException
+from litestar.handlers.base import BaseRouteHandler
+
+from api.state import State
+
+
+def admin_guard(connection: ASGIConnection, _: BaseRouteHandler) -> None:
+    """Allow only requests with the admin bearer token."""
+
+    state: State = connection.app.state
+    token = state.config.admin.token
+    scheme, _, credentials = connection.headers.get("Authorization", "").partition(" ")
+
+    if (
+        token is None
+        or scheme.lower() != "bearer"
+        or not compare_digest(credentials.encode(), token.encode())
+    ):
+        raise NotAuthorizedException()
+
+
+def results_guard(connection: ASGIConnection, handler: BaseRouteHandler) -> None:
+    """Allow requests with the admin bearer token, or all if results are public."""
+
+    state: State = connection.app.state
+
+    if not state.config.results.public:
+        admin_guard(connection, handler)
@@ -0,0 +1,58 @@
+from litestar.enums import ScopeType
+from litestar.middleware.base import MiddlewareProtocol
+from litestar.types import ASGIApp, Receive, Scope, Send
+
+from api.admission import Admission
+from api.api.exceptions import ServiceUnavailableException
+from api.metrics import Metrics
+
+
+class AdmissionMiddleware(MiddlewareProtocol):
+    """Rejects requests early when the app is overloaded.
+
+    Only route handlers with an "admission" option are subject to admission,
+    its value is the class of the request, e.g. "read" or "submit".
+
+    Args:
+        app: The next ASGI app to call.
+        admission: Admission to use.
+        metrics: Metrics to update.
+        retry_after: Number of seconds after which rejected clients should retry.
+    """
+
+    def __init__(
+        self, app: ASGIApp, admission: Admission, metrics: Metrics, retry_after: int
+    ) -> None:
+        self.app = app
+        self._admission = admission
+        self._metrics = metrics
+        self._retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != ScopeType.HTTP:
+            await self.app(scope, receive, send)
+            return
+
+        handler = scope["route_handler"]
+        kind = handler.opt.get("admission")
+
+        if kind is None:
+            await self.app(scope, receive, send)
+            return
+
+        reason = self._admission.admit(kind)
+
+        if reason is not None:
+            self._metrics.admission_rejected.labels(kind, reason).inc()
+            raise ServiceUnavailableException(
+                headers={"Retry-After": str(self._retry_after)}
+            )
+
+        inflight = self._metrics.admission_inflight.labels(kind, handler.handler_name)
+        inflight.inc()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            inflight.dec()
+            self._admission.release(kind)
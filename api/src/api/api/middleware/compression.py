@@ -0,0 +1,101 @@
+from litestar.datastructures import Headers, MutableScopeHeaders
+from litestar.enums import ScopeType
+from litestar.middleware.base import MiddlewareProtocol
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.compression import Compression, StreamCompressor
+
+
+class CompressionMiddleware(MiddlewareProtocol):
+    """Compresses responses with the best encoding accepted by the client.
+
+    Responses that already have a content encoding are left untouched,
+    so handlers can serve precompressed bodies.
+
+    Args:
+        app: The next ASGI app to call.
+        compression: Compression to use.
+    """
+
+    def __init__(self, app: ASGIApp, compression: Compression) -> None:
+        self.app = app
+        self._compression = compression
+
+    def _is_compressible(self, headers: MutableScopeHeaders) -> bool:
+        """Check if a response can be compressed."""
+
+        if "content-encoding" in headers:
+            return False
+
+        content_type = headers.get("content-type", "")
+
+        if content_type.startswith("text/event-stream"):
+            return False
+
+        return content_type.startswith("text/") or "json" in content_type
+
+    def _wrap_send(self, send: Send, encoding: str) -> Send:
+        """Wrap send to compress the response body."""
+
+        start: Message | None = None
+        stream: StreamCompressor | None = None
+        compressible = False
+
+        async def _send(message: Message) -> None:
+            nonlocal start, stream, compressible
+
+            if message["type"] == "http.response.start":
+                start = message
+                compressible = self._is_compressible(MutableScopeHeaders(message))
+                return
+
+            if message["type"] != "http.response.body" or not compressible:
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None:
+                headers = MutableScopeHeaders(start)
+
+                if more_body:
+                    stream = self._compression.stream(encoding)
+                    headers["Content-Encoding"] = encoding
+                    headers.extend_header_value("Vary", "Accept-Encoding")
+                    del headers["Content-Length"]
+                elif len(body) >= self._compression.minimum_size:
+                    body = self._compression.compress(encoding, body)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    headers.extend_header_value("Vary", "Accept-Encoding")
+
+                await send(start)
+                start = None
+
+            if stream is not None:
+                body = stream.compress(body)
+                if not more_body:
+                    body += stream.finish()
+
+            await send({**message, "body": body})
+
+        return _send
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != ScopeType.HTTP:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._compression.negotiate(
+            Headers.from_scope(scope).get("accept-encoding")
+        )
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, self._wrap_send(send, encoding))
@@ -0,0 +1,26 @@
+from typing import Any
+
+from litestar import Request
+from litestar.exceptions import SerializationException
+from litestar.types import Empty
+
+from api.codecs import CodecError
+
+
+class CodecRequest(Request):
+    """Request that decodes JSON bodies with the codec of the app."""
+
+    __slots__ = ()
+
+    async def json(self) -> Any:
+        if self._json is Empty:
+            body = await self.body()
+
+            try:
+                self._json = self.app.state.codec.decode(body or b"null")
+            except CodecError as e:
+                raise SerializationException(str(e)) from e
+
+            self.scope["_json"] = self._json
+
+        return self._json
@@ -0,0 +1,17 @@
+from typing import Any
+
+from litestar import Response
+from litestar.serialization import default_serializer
+from litestar.types import Serializer
+
+
+class BufferResponse(Response):
+    """Response that sends buffers of memory-mapped files without copying them."""
+
+    def render(
+        self, content: Any, media_type: str, enc_hook: Serializer = default_serializer
+    ) -> bytes:
+        if isinstance(content, memoryview):
+            return content
+
+        return super().render(content, media_type, enc_hook)
@@ -0,0 +1,50 @@
+from litestar import Controller as BaseController
+from litestar import Response, post
+from litestar.exceptions import NotAuthorizedException, NotFoundException
+from litestar.status_codes import HTTP_200_OK
+
+from api.api.guards import admin_guard
+from api.api.routes.admin.models import (
+    ClearTalliesRequest,
+    ClearTalliesResponse,
+    InvalidateRequest,
+    InvalidateResponse,
+)
+from api.state import State
+
+
+class Controller(BaseController):
+    """Controller for the admin endpoints."""
+
+    guards = [admin_guard]
+
+    @post(
+        "/cache/invalidate",
+        summary="Invalidate cache",
+        description="Invalidate a cached form or all cached forms on all instances",
+        status_code=HTTP_200_OK,
+        raises=[NotAuthorizedException],
+    )
+    async def invalidate(
+        self, state: State, data: InvalidateRequest
+    ) -> Response[InvalidateResponse]:
+        await state.invalidator.invalidate(data.form)
+        content = InvalidateResponse(form=data.form)
+        return Response(content)
+
+    @post(
+        "/tallies/clear",
+        summary="Clear tallies",
+        description="Reset the running tallies of a form, e.g. after its fields changed",
+        status_code=HTTP_200_OK,
+        raises=[NotAuthorizedException, NotFoundException],
+    )
+    async def clear_tallies(
+        self, state: State, data: ClearTalliesRequest
+    ) -> Response[ClearTalliesResponse]:
+        if state.tallies is None:
+            raise NotFoundException(extra={"source": "tallies"})
+
+        await state.tallies.clear(data.form)
+        content = ClearTalliesResponse(form=data.form)
+        return Response(content)
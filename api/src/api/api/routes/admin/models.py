@@ -0,0 +1,43 @@
+from pydantic import Field
+
+from api.models.base import SerializableModel
+
+
+class InvalidateRequest(SerializableModel):
+    """Request model for the POST /admin/cache/invalidate endpoint."""
+
+    form: str | None = Field(
+        None,
+        title="InvalidateRequest.Form",
+        description="ID of the form to invalidate, all forms if not set.",
+    )
+
+
+class InvalidateResponse(SerializableModel):
+    """Response model for the POST /admin/cache/invalidate endpoint."""
+
+    form: str | None = Field(
+        ...,
+        title="InvalidateResponse.Form",
+        description="ID of the invalidated form, all forms if not set.",
+    )
+
+
+class ClearTalliesRequest(SerializableModel):
+    """Request model for the POST /admin/tallies/clear endpoint."""
+
+    form: str = Field(
+        ...,
+        title="ClearTalliesRequest.Form",
+        description="ID of the form whose running tallies are reset.",
+    )
+
+
+class ClearTalliesResponse(SerializableModel):
+    """Response model for the POST /admin/tallies/clear endpoint."""
+
+    form: str = Field(
+        ...,
+        title="ClearTalliesResponse.Form",
+        description="ID of the form whose running tallies were reset.",
+    )
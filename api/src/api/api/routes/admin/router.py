@@ -0,0 +1,10 @@
+from litestar import Router
+
+from api.api.routes.admin.controller import Controller
+
+router = Router(
+    path="/admin",
+    route_handlers=[
+        Controller,
+    ],
+)
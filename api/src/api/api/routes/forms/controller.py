@@ -1,20 +1,48 @@
-from typing import Annotated
+from typing import Annotated, Literal
+
+from pydantic import ValidationError
 
 from litestar import Controller as BaseController
-from litestar import Response, get, post
+from litestar import Request, Response, WebSocket, get, post, websocket
 from litestar.di import Provide
-from litestar.exceptions import NotFoundException
+from litestar.enums import MediaType
+from litestar.exceptions import (
+    NotAuthorizedException,
+    NotFoundException,
+    ValidationException,
+    WebSocketDisconnect,
+)
 from litestar.params import Parameter
+from litestar.response import Stream
+from litestar.status_codes import HTTP_304_NOT_MODIFIED
 
-from api.api.exceptions import UnprocessableEntityException
-from api.api.routes.forms.errors import FieldNotFoundError, FormNotFoundError
+from api.api.exceptions import (
+    ServiceUnavailableException,
+    UnprocessableEntityException,
+)
+from api.api.guards import admin_guard
+from api.api.response import BufferResponse
+from api.api.routes.forms.errors import (
+    FieldNotFoundError,
+    FormNotFoundError,
+    GraphQLError,
+    InvalidVoteError,
+    SubmissionIncompleteError,
+    SubmissionNotFoundError,
+)
 from api.api.routes.forms.models import (
     GetResponse,
     ListResponse,
+    SchemaResponse,
+    SparseGetResponse,
     SubmitRequest,
     SubmitResponse,
+    VoteRequest,
+    VoteResponse,
 )
 from api.api.routes.forms.service import Service
+from api.codecs import CodecError
+from api.export import CsvExporter, Exporter, NdjsonExporter
 from api.state import State
 
 
@@ -24,6 +52,17 @@ class DependenciesBuilder:
     async def _build_service(self, state: State) -> Service:
         return Service(
             graphql=state.graphql,
+            database=state.database,
+            submissions=state.submissions,
+            cache=state.cache,
+            negative=state.negative,
+            known=state.known,
+            remote=state.remote,
+            shared=state.shared,
+            compression=state.compression,
+            codec=state.codec,
+            tallies=state.tallies,
+            config=state.config.submissions,
         )
 
     def build(self) -> dict[str, Provide]:
@@ -40,6 +79,8 @@ class Controller(BaseController):
     @get(
         summary="List all",
         description="List all forms with pagination",
+        raises=[ServiceUnavailableException],
+        opt={"admission": "read"},
     )
     async def list(
         self,
@@ -63,11 +104,188 @@ class Controller(BaseController):
         content = ListResponse(pager=pager)
         return Response(content)
 
+    @get(
+        "/{id:str}/submissions/export",
+        summary="Export submissions",
+        description="Export submissions of a form as CSV or NDJSON",
+        guards=[admin_guard],
+        raises=[
+            NotAuthorizedException,
+            NotFoundException,
+            ServiceUnavailableException,
+        ],
+        opt={"admission": "read"},
+    )
+    async def export(
+        self,
+        id: Annotated[
+            str,
+            Parameter(
+                title="ID",
+                description="The ID of the form",
+            ),
+        ],
+        service: Service,
+        output: Annotated[
+            Literal["csv", "ndjson"],
+            Parameter(
+                query="format",
+                title="Format",
+                description="The format of the export.",
+            ),
+        ] = "csv",
+        cursor: Annotated[
+            int,
+            Parameter(
+                ge=0,
+                title="Cursor",
+                description="The number of submissions to skip, e.g. already exported.",
+            ),
+        ] = 0,
+    ) -> Stream:
+        try:
+            cached = await service.get(id=id)
+        except FormNotFoundError as e:
+            raise NotFoundException(extra={"form": id}) from e
+
+        exporter: Exporter
+        match output:
+            case "csv":
+                exporter = CsvExporter(cached.form)
+            case "ndjson":
+                exporter = NdjsonExporter(cached.form)
+
+        headers = {
+            "Content-Disposition": f'attachment; filename="{id}.{exporter.extension}"'
+        }
+
+        return Stream(
+            service.export(id, exporter, start=cursor),
+            media_type=exporter.media_type,
+            headers=headers,
+        )
+
+    @websocket("/{id:str}/votes")
+    async def votes(
+        self,
+        socket: WebSocket,
+        id: Annotated[
+            str,
+            Parameter(
+                title="ID",
+                description="The ID of the form",
+            ),
+        ],
+        state: State,
+        service: Service,
+    ) -> None:
+        if state.votes is None:
+            await socket.close(code=1008, reason="Votes are disabled.")
+            return
+
+        try:
+            cached = await service.get(id=id)
+        except FormNotFoundError:
+            await socket.close(code=1008, reason=f"Form {id} not found.")
+            return
+        except GraphQLError:
+            await socket.close(code=1013, reason="Service unavailable.")
+            return
+
+        await socket.accept()
+
+        while True:
+            try:
+                data = await socket.receive_data(mode="text")
+            except WebSocketDisconnect:
+                return
+
+            try:
+                request = state.codec.validate(data.encode(), VoteRequest)
+            except (CodecError, ValidationError):
+                state.metrics.votes_received.labels("rejected").inc()
+                response = VoteResponse(status="rejected", reason="Invalid message.")
+                await socket.send_data(state.codec.encode(response))
+                continue
+
+            # Forms are read again for every vote, so invalidations apply
+            try:
+                cached = await service.get(id=id)
+            except FormNotFoundError:
+                await socket.close(code=1008, reason=f"Form {id} not found.")
+                return
+            except GraphQLError:
+                state.metrics.votes_received.labels("busy").inc()
+                response = VoteResponse(
+                    id=request.id, status="busy", reason="Service unavailable."
+                )
+                await socket.send_data(state.codec.encode(response))
+                continue
+
+            try:
+                vote = service.vote(cached.form, request.field, request.value)
+            except InvalidVoteError as e:
+                state.metrics.votes_received.labels("rejected").inc()
+                response = VoteResponse(id=request.id, status="rejected", reason=str(e))
+            else:
+                accepted = state.votes.offer(vote)
+                status = "accepted" if accepted else "busy"
+                state.metrics.votes_received.labels(status).inc()
+                response = VoteResponse(id=request.id, status=status)
+
+            await socket.send_data(state.codec.encode(response))
+
+    @get(
+        "/{id:str}/schema",
+        summary="Get schema",
+        description="Get JSON Schema of the submitted fields of a form",
+        raises=[NotFoundException, ServiceUnavailableException],
+        opt={"admission": "read"},
+    )
+    async def schema(
+        self,
+        id: Annotated[
+            str,
+            Parameter(
+                title="ID",
+                description="The ID of the form",
+            ),
+        ],
+        service: Service,
+        request: Request,
+    ) -> Response[SchemaResponse]:
+        try:
+            cached = await service.get(id=id)
+        except FormNotFoundError as e:
+            raise NotFoundException(extra={"form": id}) from e
+
+        # Schemas change only with forms, so versions of forms make strong ETags
+        etag = f'"{cached.version}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        matches = {
+            match.strip().removeprefix("W/")
+            for match in request.headers.get("If-None-Match", "").split(",")
+        }
+
+        if etag in matches or "*" in matches:
+            return Response(b"", status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+        accept = request.headers.get("Accept-Encoding")
+        content, encoding = await service.render_schema(cached, accept)
+
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+
+        return BufferResponse(
+            content, media_type="application/schema+json", headers=headers
+        )
+
     @get(
         "/{id:str}",
         summary="Get form",
         description="Get form by ID",
-        raises=[NotFoundException],
+        raises=[NotFoundException, ServiceUnavailableException, ValidationException],
+        opt={"admission": "read"},
     )
     async def get(
         self,
@@ -79,20 +297,51 @@ class Controller(BaseController):
             ),
         ],
         service: Service,
-    ) -> Response[GetResponse]:
+        request: Request,
+        fields: Annotated[
+            str | None,
+            Parameter(
+                title="Fields",
+                description="Comma-separated attributes of form fields to include besides their ID and type, e.g. title,options. All if not set.",
+            ),
+        ] = None,
+    ) -> Response[GetResponse | SparseGetResponse]:
+        selection = None
+
+        if fields is not None:
+            selection = frozenset(filter(None, map(str.strip, fields.split(","))))
+            unknown = sorted(selection - Service.FIELD_ATTRIBUTES.keys())
+
+            if unknown:
+                raise ValidationException(extra={"fields": unknown})
+
+        accept = request.headers.get("Accept-Encoding")
+
         try:
-            form = await service.get(id=id)
+            if selection is None:
+                cached = await service.get(id=id)
+                content, encoding = await service.render(cached, accept)
+            else:
+                content, encoding = await service.render_sparse(id, selection, accept)
         except FormNotFoundError as e:
             raise NotFoundException(extra={"form": id}) from e
 
-        content = GetResponse(form=form)
-        return Response(content)
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+
+        return BufferResponse(content, media_type=MediaType.JSON, headers=headers)
 
     @post(
         "/{id:str}/submit",
         summary="Submit form",
         description="Submit a form",
-        raises=[NotFoundException, UnprocessableEntityException],
+        raises=[
+            NotFoundException,
+            UnprocessableEntityException,
+            ServiceUnavailableException,
+        ],
+        opt={"admission": "submit"},
     )
     async def submit(
         self,
@@ -107,11 +356,19 @@ class Controller(BaseController):
         data: SubmitRequest,
     ) -> Response[SubmitResponse]:
         try:
-            confirmation = await service.submit(id=id, submission=data.submission)
+            confirmation = await service.submit(
+                id=id, submission=data.submission, resume=data.resume
+            )
         except FormNotFoundError as e:
             raise NotFoundException(extra={"form": id}) from e
+        except SubmissionNotFoundError as e:
+            raise NotFoundException(extra={"submission": e.submission}) from e
         except FieldNotFoundError as e:
             raise UnprocessableEntityException(extra={"field": e.field}) from e
+        except SubmissionIncompleteError as e:
+            raise ServiceUnavailableException(
+                extra={"submission": e.submission, "token": e.token}
+            ) from e
 
         content = SubmitResponse(confirmation=confirmation)
         return Response(content)
@@ -32,3 +32,45 @@ class FieldNotFoundError(ServiceError):
     @property
     def field(self) -> str:
         return self._field
+
+
+class SubmissionNotFoundError(ServiceError):
+    """Raised when an unfinished submission is not found."""
+
+    def __init__(self, submission: str) -> None:
+        self._submission = submission
+        super().__init__(f"Submission {submission} not found.")
+
+    @property
+    def submission(self) -> str:
+        return self._submission
+
+
+class SubmissionIncompleteError(ServiceError):
+    """Raised when a submission could not be completed, but can be resumed."""
+
+    def __init__(self, submission: str, token: str) -> None:
+        self._submission = submission
+        self._token = token
+        super().__init__(f"Submission {submission} is incomplete.")
+
+    @property
+    def submission(self) -> str:
+        return self._submission
+
+    @property
+    def token(self) -> str:
+        return self._token
+
+
+class TalliesDisabledError(ServiceError):
+    """Raised when results are read from running tallies that are disabled."""
+
+    def __init__(self) -> None:
+        super().__init__("Tallies are disabled.")
+
+
+class InvalidVoteError(ServiceError):
+    """Raised when a vote doesn't match a single radio field of its form."""
+
+    pass
@@ -1,7 +1,15 @@
-from pydantic import Field
+from typing import Any, Literal
+
+from pydantic import Field, RootModel
 
 from api.models.base import SerializableModel
-from api.models.data import Form, FormPager, Submission, SubmissionConfirmation
+from api.models.data import (
+    Form,
+    FormPager,
+    Submission,
+    SubmissionConfirmation,
+    SubmissionResume,
+)
 
 
 class ListResponse(SerializableModel):
@@ -24,6 +32,23 @@ class GetResponse(SerializableModel):
     )
 
 
+class SparseGetResponse(SerializableModel):
+    """Response model for the GET /forms/:id endpoint with selected field attributes."""
+
+    form: dict[str, Any] = Field(
+        ...,
+        title="SparseGetResponse.Form",
+        description="The form with only the selected attributes of its fields.",
+    )
+
+
+class SchemaResponse(RootModel[dict[str, Any]]):
+    """Response model for the GET /forms/:id/schema endpoint.
+
+    A JSON Schema of the fields of a submission of the form.
+    """
+
+
 class SubmitRequest(SerializableModel):
     """Request model for the POST /forms/:id/submit endpoint."""
 
@@ -32,6 +57,11 @@ class SubmitRequest(SerializableModel):
         title="SubmitRequest.Submission",
         description="The submission for the form.",
     )
+    resume: SubmissionResume | None = Field(
+        None,
+        title="SubmitRequest.Resume",
+        description="The unfinished submission to resume.",
+    )
 
 
 class SubmitResponse(SerializableModel):
@@ -42,3 +72,43 @@ class SubmitResponse(SerializableModel):
         title="SubmitResponse.Confirmation",
         description="The confirmation for the submission.",
     )
+
+
+class VoteRequest(SerializableModel):
+    """Message model for votes sent to the /forms/:id/votes WebSocket."""
+
+    id: str | int | None = Field(
+        None,
+        title="VoteRequest.ID",
+        description="Identifier of the vote, echoed in its acknowledgement.",
+    )
+    field: str | None = Field(
+        None,
+        title="VoteRequest.Field",
+        description="ID of the field, can be omitted if the form has one radio field.",
+    )
+    value: str = Field(
+        ...,
+        title="VoteRequest.Value",
+        description="Value of the chosen option.",
+    )
+
+
+class VoteResponse(SerializableModel):
+    """Message model for acknowledgements sent by the /forms/:id/votes WebSocket."""
+
+    id: str | int | None = Field(
+        None,
+        title="VoteResponse.ID",
+        description="Identifier of the vote.",
+    )
+    status: Literal["accepted", "rejected", "busy"] = Field(
+        ...,
+        title="VoteResponse.Status",
+        description="Whether the vote was accepted, invalid or could not be queued.",
+    )
+    reason: str | None = Field(
+        None,
+        title="VoteResponse.Reason",
+        description="Why the vote was not accepted.",
+    )
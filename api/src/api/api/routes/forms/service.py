@@ -1,6 +1,9 @@
+import asyncio
 import json
-from asyncio import TaskGroup
-from typing import Any
+import random
+from collections.abc import AsyncIterator, Sequence
+from time import monotonic
+from typing import Any, Awaitable, Callable, TypeVar
 from uuid import uuid4
 
 from pydantic import ValidationError
@@ -9,18 +12,81 @@ from api.api.routes.forms.errors import (
     FieldNotFoundError,
     FormNotFoundError,
     GraphQLError,
+    InvalidVoteError,
+    ServiceError,
+    SubmissionIncompleteError,
+    SubmissionNotFoundError,
 )
+from api.api.routes.forms.models import (
+    GetResponse,
+    SchemaResponse,
+    SparseGetResponse,
+)
+from api.cache.forms import FormCache
+from api.cache.known import KnownForms
+from api.cache.models import CachedForm
+from api.cache.negative import NegativeFormCache
+from api.cache.remote import RemoteFormCache
+from api.cache.shared import SharedFormCache
+from api.codecs import Codec
+from api.compression import Compression
+from api.config.models import SubmissionsConfig
+from api.database import errors as de
+from api.database.client import DatabaseClient
+from api.export import Exporter
 from api.graphql import errors as ge
 from api.graphql import models as gm
 from api.graphql.client import GraphQLClient
 from api.models import data as dm
+from api.results.tallies import Tallies
+from api.schemas import SubmissionSchemaBuilder
+from api.submissions.models import SubmissionProgress, Vote
+from api.submissions.tracker import SubmissionTracker
+
+T = TypeVar("T")
 
 
 class Service:
     """Service for the forms endpoints."""
 
-    def __init__(self, graphql: GraphQLClient) -> None:
+    # Attributes of form fields that can be selected, by the upstream attributes
+    # they come from, besides the always included ID and type
+    FIELD_ATTRIBUTES = {
+        "title": "title",
+        "description": "description",
+        "required": "required",
+        "default": "defaultValue",
+        "options": "options",
+    }
+
+    def __init__(
+        self,
+        graphql: GraphQLClient,
+        database: DatabaseClient | None,
+        submissions: SubmissionTracker,
+        cache: FormCache,
+        negative: NegativeFormCache,
+        known: KnownForms | None,
+        remote: RemoteFormCache | None,
+        shared: SharedFormCache | None,
+        compression: Compression,
+        codec: Codec,
+        tallies: Tallies | None,
+        config: SubmissionsConfig,
+    ) -> None:
         self._graphql = graphql
+        self._database = database
+        self._submissions = submissions
+        self._cache = cache
+        self._negative = negative
+        self._known = known
+        self._remote = remote
+        self._shared = shared
+        self._compression = compression
+        self._codec = codec
+        self._schemas = SubmissionSchemaBuilder()
+        self._tallies = tallies
+        self._config = config
 
     def _parse_pager(self, pager: gm.FormPager) -> dm.FormPager:
         """Parse pager."""
@@ -160,9 +226,10 @@ class Service:
             title=field.title,
             description=field.description or None,
             required=field.required,
-            min=field.options[0].value,
-            max=field.options[1].value,
-            step=field.options[2].value,
+            # Bounds are stored as options, which may not be selected
+            min=field.options[0].value if field.options else 0,
+            max=field.options[1].value if field.options else 0,
+            step=field.options[2].value if field.options else 0,
             default=self._parse_json_value(field.default_value),
         )
 
@@ -255,19 +322,403 @@ class Service:
             fields=fields,
         )
 
-    async def get(self, id: str) -> dm.Form:
+    def _check_exists(self, id: str) -> None:
+        """Reject forms that are known not to exist without asking upstream."""
+
+        if self._negative.contains(id):
+            raise FormNotFoundError(form=id)
+
+        if self._known is not None and not self._known.might_exist(id):
+            raise FormNotFoundError(form=id)
+
+    async def _read_form(self, request: gm.GetFormRequest) -> gm.GetFormResponse:
+        """Read form from the database, falling back to the GraphQL service."""
+
+        if self._database is not None:
+            try:
+                return await self._database.get_form(request)
+            except de.NotFoundError:
+                raise
+            except de.DatabaseError:
+                pass
+
+        return await self._graphql.get_form(request)
+
+    async def _fetch_form(
+        self, id: str, selection: frozenset[str] | None = None
+    ) -> dm.Form:
+        """Fetch form with selected attributes of its fields, all if not set."""
+
+        request = gm.GetFormRequest(id=id, selection=selection)
+
+        try:
+            response = await self._read_form(request)
+        except (ge.NotFoundError, de.NotFoundError) as e:
+            self._negative.add(id)
+            raise FormNotFoundError(form=id) from e
+        except ge.GraphQLError as e:
+            raise GraphQLError() from e
+
+        return self._parse_form(response.form)
+
+    def _get_shared(self, id: str) -> CachedForm | None:
+        """Get a fresh form from the cache shared by processes on the host."""
+
+        if self._shared is None:
+            return None
+
+        shared = self._shared.get(id)
+
+        if shared is None or not self._cache.is_fresh(shared):
+            return None
+
+        return self._cache.put(shared.form, fetched=shared.fetched)
+
+    def _store(self, form: dm.Form) -> CachedForm:
+        """Store a fetched form in the local caches."""
+
+        cached = self._cache.put(form)
+
+        if self._shared is not None:
+            self._shared.put(cached)
+
+        return cached
+
+    async def get(self, id: str) -> CachedForm:
         """Get form."""
 
-        request = gm.GetFormRequest(id=id)
+        cached = self._cache.get(id) or self._get_shared(id)
+
+        if cached is not None:
+            return cached
+
+        self._check_exists(id)
+
+        form = await self._remote.get(id) if self._remote is not None else None
+
+        if form is None:
+            try:
+                form = await self._fetch_form(id)
+            except GraphQLError:
+                # Serve a stale form, e.g. restored from a snapshot, over an error
+                stale = self._cache.get_stale(id)
+
+                if stale is None:
+                    raise
+
+                return stale
+
+            if self._remote is not None:
+                await self._remote.put(form)
+
+        return self._store(form)
+
+    def _get_body(
+        self, cached: CachedForm, representation: str
+    ) -> bytes | memoryview | None:
+        """Get an encoded body of a form from the caches."""
+
+        if self._shared is not None:
+            body = self._shared.get_body(cached, representation)
+
+            if body is not None:
+                # Shared bodies are served from the mapped file, so a copy kept
+                # before the writer stored it is no longer needed
+                cached.bodies.pop(representation, None)
+                return body
+
+        return cached.bodies.get(representation)
+
+    def _put_body(self, cached: CachedForm, representation: str, body: bytes) -> None:
+        """Put an encoded body of a form into the caches.
+
+        Bodies are kept in process memory only if they can't be shared.
+        """
+
+        if self._shared is None or not self._shared.put_body(
+            cached, representation, body
+        ):
+            cached.bodies[representation] = body
+
+    def _trim(self, form: dm.Form, fields: frozenset[str]) -> dict[str, Any]:
+        """Keep only selected attributes of fields of a form."""
+
+        keep = {"id", "type"} | fields
+
+        if "options" in fields:
+            keep |= {"min", "max", "step"}
+
+        data = form.model_dump(mode="json", by_alias=True)
+        data["fields"] = [
+            {key: value for key, value in field.items() if key in keep}
+            for field in data["fields"]
+        ]
+        return data
+
+    def _encode(self, form: dm.Form, fields: frozenset[str] | None) -> bytes:
+        """Encode response body of a form with selected attributes of its fields."""
+
+        if fields is None:
+            return self._codec.encode(GetResponse(form=form))
+
+        return self._codec.encode(SparseGetResponse(form=self._trim(form, fields)))
+
+    async def _render(
+        self,
+        cached: CachedForm,
+        accept: str | None,
+        shape: str,
+        encode: Callable[[], bytes],
+    ) -> tuple[bytes | memoryview, str | None]:
+        """Render a representation of a form in the best accepted content encoding.
+
+        Bodies are cached per shape, as long as the version of the form.
+        """
+
+        encoding = self._compression.negotiate(accept)
+        body = self._get_body(cached, f"{shape}identity")
+
+        if body is None:
+            body = encode()
+            self._put_body(cached, f"{shape}identity", body)
+
+        if encoding is None or len(body) < self._compression.minimum_size:
+            return body, None
+
+        variant = self._get_body(cached, f"{shape}{encoding}")
+
+        if variant is None:
+            variant = await asyncio.to_thread(
+                self._compression.precompress, encoding, body
+            )
+            self._put_body(cached, f"{shape}{encoding}", variant)
+
+        return variant, encoding
+
+    async def render(
+        self,
+        cached: CachedForm,
+        accept: str | None,
+        fields: frozenset[str] | None = None,
+    ) -> tuple[bytes | memoryview, str | None]:
+        """Render response body of a form in the best accepted content encoding.
+
+        Bodies with selected attributes of fields are cached per selection.
+        """
+
+        shape = "" if fields is None else f"{','.join(sorted(fields))}:"
+        return await self._render(
+            cached, accept, shape, lambda: self._encode(cached.form, fields)
+        )
+
+    async def render_sparse(
+        self, id: str, fields: frozenset[str], accept: str | None
+    ) -> tuple[bytes | memoryview, str | None]:
+        """Render response body of a form with selected attributes of its fields.
+
+        Cached forms are trimmed. Other forms are fetched from the GraphQL service
+        with only the selected attributes and are not cached, since they are
+        incomplete. The database reads forms in full, so they are cached as usual.
+        """
+
+        if self._database is not None:
+            return await self.render(await self.get(id), accept, fields)
+
+        cached = self._cache.get(id) or self._get_shared(id)
+
+        if cached is None and self._remote is not None:
+            self._check_exists(id)
+            form = await self._remote.get(id)
+            cached = self._store(form) if form is not None else None
+
+        if cached is not None:
+            return await self.render(cached, accept, fields)
+
+        self._check_exists(id)
+        selection = frozenset(self.FIELD_ATTRIBUTES[field] for field in fields)
+
+        try:
+            form = await self._fetch_form(id, selection)
+        except GraphQLError:
+            stale = self._cache.get_stale(id)
+
+            if stale is None:
+                raise
+
+            return await self.render(stale, accept, fields)
+
+        body = self._encode(form, fields)
+        encoding = self._compression.negotiate(accept)
+
+        if encoding is None or len(body) < self._compression.minimum_size:
+            return body, None
+
+        body = await asyncio.to_thread(self._compression.precompress, encoding, body)
+        return body, encoding
+
+    async def render_schema(
+        self, cached: CachedForm, accept: str | None
+    ) -> tuple[bytes | memoryview, str | None]:
+        """Render JSON Schema of submitted fields of a form."""
+
+        def _encode() -> bytes:
+            schema = self._schemas.build(cached.form)
+            return self._codec.encode(SchemaResponse(schema))
+
+        return await self._render(cached, accept, "schema:", _encode)
+
+    async def prerender(self, cached: CachedForm) -> None:
+        """Render response bodies of a form in all content encodings."""
+
+        await self.render(cached, None)
+
+        for encoding in self._compression.encodings:
+            await self.render(cached, encoding)
+
+    async def revalidate(self, concurrency: int) -> tuple[int, int]:
+        """Refetch stale cached forms and return numbers of refetched and failed forms.
+
+        Forms with unchanged content keep their encoded bodies.
+        """
+
+        stale = [
+            cached.form.id
+            for cached in self._cache.entries()
+            if not self._cache.is_fresh(cached)
+        ]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _revalidate(id: str) -> None:
+            async with semaphore:
+                try:
+                    form = await self._fetch_form(id)
+                except FormNotFoundError:
+                    self._cache.invalidate(id)
+                    return
+
+            self._store(form)
+
+        results = await asyncio.gather(
+            *(_revalidate(id) for id in stale), return_exceptions=True
+        )
+        failed = sum(isinstance(result, Exception) for result in results)
+
+        return len(stale) - failed, failed
+
+    async def list_ids(self, limit: int | None, page_size: int) -> Sequence[str]:
+        """List ids of the most recent forms, going through all pages."""
+
+        ids = []
+
+        while limit is None or len(ids) < limit:
+            pager = await self.list(limit=page_size, start=len(ids))
+            ids.extend(entry.id for entry in pager.entries)
+
+            if not pager.entries or len(ids) >= pager.total:
+                break
+
+        return ids[:limit]
+
+    async def warmup(
+        self, limit: int | None, concurrency: int, page_size: int
+    ) -> tuple[int, int]:
+        """Load forms into the cache and return numbers of loaded and failed forms."""
+
+        ids = await self.list_ids(limit, page_size)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _warmup(id: str) -> None:
+            async with semaphore:
+                cached = await self.get(id)
+
+            await self.prerender(cached)
+
+        results = await asyncio.gather(
+            *(_warmup(id) for id in ids), return_exceptions=True
+        )
+        failed = sum(isinstance(result, Exception) for result in results)
+
+        return len(ids) - failed, failed
+
+    async def _list_submissions(self, id: str, start: int) -> gm.SubmissionPager:
+        """List a page of submissions of a form."""
+
+        request = gm.ListSubmissionsRequest(
+            form=id, start=start, limit=self._config.export_page_size
+        )
 
         try:
-            response = await self._graphql.get_form(request)
+            response = await self._graphql.list_submissions(request)
         except ge.NotFoundError as e:
             raise FormNotFoundError(form=id) from e
         except ge.GraphQLError as e:
             raise GraphQLError() from e
 
-        return self._parse_form(response.form)
+        return response.pager
+
+    def _parse_submitted_value(self, value: str | None) -> Any:
+        """Parse a submitted value, keeping it as it is if it's not JSON."""
+
+        try:
+            return json.loads(value)
+        except TypeError:
+            return None
+        except json.JSONDecodeError:
+            return value
+
+    def _parse_submission(
+        self, entry: gm.SubmissionPagerEntry
+    ) -> dm.ExportedSubmission:
+        """Parse submission."""
+
+        return dm.ExportedSubmission(
+            id=entry.id,
+            created=entry.created,
+            last_modified=entry.last_modified,
+            complete=entry.percentage_complete,
+            fields={
+                field.field.id: self._parse_submitted_value(field.value)
+                for field in entry.fields
+                if field.field is not None
+            },
+        )
+
+    async def submissions(
+        self, id: str, start: int = 0
+    ) -> AsyncIterator[Sequence[dm.ExportedSubmission]]:
+        """List submissions of a form page by page, starting at an offset.
+
+        The next page is fetched while the current one is being processed.
+        """
+
+        fetch = asyncio.create_task(self._list_submissions(id, start))
+
+        try:
+            while fetch is not None:
+                pager = await fetch
+                start = pager.start + len(pager.entries)
+
+                if pager.entries and start < pager.total:
+                    fetch = asyncio.create_task(self._list_submissions(id, start))
+                else:
+                    fetch = None
+
+                yield [self._parse_submission(entry) for entry in pager.entries]
+        finally:
+            if fetch is not None:
+                fetch.cancel()
+
+    async def export(
+        self, id: str, exporter: Exporter, start: int = 0
+    ) -> AsyncIterator[bytes]:
+        """Export submissions of a form, starting at an offset."""
+
+        yield exporter.header()
+
+        async for submissions in self.submissions(id, start):
+            # Pages are small, so they are encoded in a thread, leaving the
+            # worker pool to snapshot builds and aggregation
+            yield await asyncio.to_thread(exporter.rows, submissions)
 
     def _generate_submission_token(self) -> str:
         """Generate submission token."""
@@ -293,67 +744,185 @@ class Service:
         try:
             response = await self._graphql.start_submission(request)
         except ge.NotFoundError as e:
+            self._negative.add(id)
             raise FormNotFoundError(form=id) from e
         except ge.GraphQLError as e:
             raise GraphQLError() from e
 
         return response.submission
 
+    def _get_retry_delay(self, attempt: int) -> float:
+        """Get delay before a retry with exponential backoff and jitter."""
+
+        delay = min(self._config.backoff * 2**attempt, self._config.backoff_max)
+        return random.uniform(0, delay)
+
+    async def _retry(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Retry a call that failed because of a GraphQL error."""
+
+        for attempt in range(self._config.retries):
+            try:
+                return await func()
+            except GraphQLError:
+                await asyncio.sleep(self._get_retry_delay(attempt))
+
+        return await func()
+
     async def _submit_form_field(
-        self, submission: str, field: str, data: Any, token: str
+        self, progress: SubmissionProgress, field: str, data: Any
     ) -> None:
         """Submit form field."""
 
         request = gm.SubmitFieldRequest(
-            submission=submission,
+            submission=progress.submission,
             field=gm.SubmissionFieldData(
-                token=token,
+                token=progress.token,
                 field=field,
                 data=json.dumps(data),
             ),
         )
 
-        try:
-            await self._graphql.submit_field(request)
-        except ge.NotFoundError as e:
-            raise FieldNotFoundError(field=field) from e
-        except ge.GraphQLError as e:
-            raise GraphQLError() from e
+        async def _submit() -> None:
+            try:
+                await self._graphql.submit_field(request)
+            except ge.NotFoundError as e:
+                raise FieldNotFoundError(field=field) from e
+            except ge.GraphQLError as e:
+                raise GraphQLError() from e
+
+        await self._retry(_submit)
+        await self._submissions.mark(progress, field)
 
     async def _submit_form_fields(
-        self, submission: str, fields: dict[str, Any], token: str
+        self, progress: SubmissionProgress, fields: dict[str, Any]
     ) -> None:
-        """Submit form fields."""
+        """Submit form fields that were not written yet."""
 
-        try:
-            async with TaskGroup() as group:
-                for field, data in fields.items():
-                    coro = self._submit_form_field(submission, field, data, token)
-                    group.create_task(coro)
-        except ExceptionGroup as e:
-            raise e.exceptions[0] from e
+        results = await asyncio.gather(
+            *(
+                self._submit_form_field(progress, field, data)
+                for field, data in fields.items()
+                if field not in progress.fields
+            ),
+            return_exceptions=True,
+        )
+
+        for result in results:
+            if isinstance(result, FieldNotFoundError):
+                raise result
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
 
     async def _finish_submission(self, submission: str) -> None:
         """Finish submission."""
 
         request = gm.FinishSubmissionRequest(submission=submission)
 
-        try:
-            await self._graphql.finish_submission(request)
-        except ge.GraphQLError as e:
-            raise GraphQLError() from e
+        async def _finish() -> None:
+            try:
+                await self._graphql.finish_submission(request)
+            except ge.GraphQLError as e:
+                raise GraphQLError() from e
 
-    async def submit(
-        self, id: str, submission: dm.Submission
-    ) -> dm.SubmissionConfirmation:
-        """Submit form."""
+        await self._retry(_finish)
+
+    async def _get_progress(
+        self, id: str, submission: dm.Submission, resume: dm.SubmissionResume | None
+    ) -> SubmissionProgress:
+        """Get progress of a resumed submission or start a new one."""
+
+        if resume is not None:
+            progress = await self._submissions.get(resume.submission, resume.token)
+
+            if progress is None or progress.form != id:
+                raise SubmissionNotFoundError(submission=resume.submission)
+
+            return progress
+
+        if self._cache.get_stale(id) is None:
+            self._check_exists(id)
 
         token = self._generate_submission_token()
 
         graphql_submission = await self._start_submission(
             id, submission.metadata, token
         )
-        await self._submit_form_fields(graphql_submission.id, submission.fields, token)
-        await self._finish_submission(graphql_submission.id)
 
-        return dm.SubmissionConfirmation(submission=graphql_submission.id)
+        return await self._submissions.start(id, graphql_submission.id, token)
+
+    async def _record(self, id: str, fields: dict[str, Any]) -> None:
+        """Count a confirmed submission in the running tallies."""
+
+        if self._tallies is None:
+            return
+
+        try:
+            cached = await self.get(id)
+        except ServiceError:
+            # The submission is already confirmed, so it is only left uncounted
+            return
+
+        await self._tallies.record(cached.form, fields)
+
+    def vote(self, form: dm.Form, field: str | None, value: str) -> Vote:
+        """Validate a vote for an option of a radio field of a form.
+
+        The field can be omitted if the form has exactly one radio field.
+        """
+
+        fields = [
+            candidate
+            for candidate in form.fields
+            if isinstance(candidate, dm.RadioFormField)
+            and (field is None or candidate.id == field)
+        ]
+
+        if len(fields) != 1:
+            raise InvalidVoteError("Vote must be for a single radio field.")
+
+        if value not in {option.value for option in fields[0].options}:
+            raise InvalidVoteError(f"Option {value} not found.")
+
+        return Vote(form=form.id, field=fields[0].id, value=value, received=monotonic())
+
+    async def submit_vote(self, vote: Vote) -> None:
+        """Submit a vote as a submission with a single field.
+
+        If the submission is left incomplete, the vote remembers it, so a retry
+        continues it instead of starting another one.
+        """
+
+        submission = dm.Submission(
+            metadata=dm.SubmissionMetadata(), fields={vote.field: vote.value}
+        )
+
+        try:
+            await self.submit(vote.form, submission, vote.resume)
+        except SubmissionIncompleteError as e:
+            vote.resume = dm.SubmissionResume(submission=e.submission, token=e.token)
+            raise
+
+    async def submit(
+        self,
+        id: str,
+        submission: dm.Submission,
+        resume: dm.SubmissionResume | None = None,
+    ) -> dm.SubmissionConfirmation:
+        """Submit form."""
+
+        progress = await self._get_progress(id, submission, resume)
+
+        try:
+            await self._submit_form_fields(progress, submission.fields)
+            await self._finish_submission(progress.submission)
+        except GraphQLError as e:
+            raise SubmissionIncompleteError(
+                submission=progress.submission, token=progress.token
+            ) from e
+
+        await self._submissions.finish(progress)
+        await self._record(id, submission.fields)
+
+        return dm.SubmissionConfirmation(submission=progress.submission)
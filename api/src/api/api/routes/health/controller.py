@@ -0,0 +1,30 @@
+from litestar import Controller as BaseController
+from litestar import Response, get
+from litestar.status_codes import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
+
+from api.api.routes.health.models import LiveResponse, ReadyResponse
+from api.state import State
+
+
+class Controller(BaseController):
+    """Controller for the health endpoints."""
+
+    @get(
+        "/live",
+        summary="Liveness",
+        description="Check if the app is live",
+    )
+    async def live(self) -> Response[LiveResponse]:
+        content = LiveResponse(live=True)
+        return Response(content)
+
+    @get(
+        "/ready",
+        summary="Readiness",
+        description="Check if the app is ready to serve traffic",
+    )
+    async def ready(self, state: State) -> Response[ReadyResponse]:
+        health = state.health
+        content = ReadyResponse(ready=health.ready, components=health.components)
+        status = HTTP_200_OK if health.ready else HTTP_503_SERVICE_UNAVAILABLE
+        return Response(content, status_code=status)
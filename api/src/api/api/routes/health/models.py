@@ -0,0 +1,28 @@
+from pydantic import Field
+
+from api.models.base import SerializableModel
+
+
+class LiveResponse(SerializableModel):
+    """Response model for the GET /health/live endpoint."""
+
+    live: bool = Field(
+        ...,
+        title="LiveResponse.Live",
+        description="Whether the app is live.",
+    )
+
+
+class ReadyResponse(SerializableModel):
+    """Response model for the GET /health/ready endpoint."""
+
+    ready: bool = Field(
+        ...,
+        title="ReadyResponse.Ready",
+        description="Whether the app is ready to serve traffic.",
+    )
+    components: dict[str, bool] = Field(
+        ...,
+        title="ReadyResponse.Components",
+        description="Readiness of the components of the app.",
+    )
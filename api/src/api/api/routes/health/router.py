@@ -0,0 +1,10 @@
+from litestar import Router
+
+from api.api.routes.health.controller import Controller
+
+router = Router(
+    path="/health",
+    route_handlers=[
+        Controller,
+    ],
+)
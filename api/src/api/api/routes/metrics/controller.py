@@ -0,0 +1,16 @@
+from litestar import Controller as BaseController
+from litestar import Response, get
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from api.state import State
+
+
+class Controller(BaseController):
+    """Controller for the metrics endpoint."""
+
+    @get(
+        summary="Metrics",
+        description="Get metrics in the Prometheus text format",
+    )
+    async def metrics(self, state: State) -> Response[bytes]:
+        return Response(state.metrics.render(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,10 @@
+from litestar import Router
+
+from api.api.routes.metrics.controller import Controller
+
+router = Router(
+    path="/metrics",
+    route_handlers=[
+        Controller,
+    ],
+)
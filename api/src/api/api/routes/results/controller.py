@@ -0,0 +1,233 @@
+from typing import Annotated, Literal
+
+from litestar import Controller as BaseController
+from litestar import Response, get, post
+from litestar.di import Provide
+from litestar.exceptions import NotAuthorizedException, NotFoundException
+from litestar.params import Parameter
+from litestar.response import Stream
+from litestar.status_codes import HTTP_200_OK
+
+from api.api.exceptions import ServiceUnavailableException
+from api.api.guards import admin_guard, results_guard
+from api.api.routes.forms.errors import (
+    FormNotFoundError,
+    GraphQLError,
+    TalliesDisabledError,
+)
+from api.api.routes.forms.service import Service as FormsService
+from api.api.routes.results.models import ResultsResponse, SnapshotResponse
+from api.api.routes.results.service import Service
+from api.state import State
+from api.workers import WorkerError
+
+
+class DependenciesBuilder:
+    """Builder for the dependencies of the controller."""
+
+    async def _build_service(self, state: State) -> Service:
+        forms = FormsService(
+            graphql=state.graphql,
+            database=state.database,
+            submissions=state.submissions,
+            cache=state.cache,
+            negative=state.negative,
+            known=state.known,
+            remote=state.remote,
+            shared=state.shared,
+            compression=state.compression,
+            codec=state.codec,
+            tallies=state.tallies,
+            config=state.config.submissions,
+        )
+
+        return Service(
+            forms=forms,
+            store=state.results,
+            aggregator=state.aggregator,
+            tallies=state.tallies,
+            workers=state.workers,
+            segment_size=state.config.results.segment_size,
+        )
+
+    def build(self) -> dict[str, Provide]:
+        return {
+            "service": Provide(self._build_service),
+        }
+
+
+class Controller(BaseController):
+    """Controller for the results endpoints."""
+
+    path = "/results"
+    dependencies = DependenciesBuilder().build()
+    guards = [admin_guard]
+
+    @post(
+        "/{id:str}/snapshot",
+        summary="Update snapshot",
+        description="Append new submissions of a form to its columnar snapshot",
+        status_code=HTTP_200_OK,
+        raises=[
+            NotAuthorizedException,
+            NotFoundException,
+            ServiceUnavailableException,
+        ],
+    )
+    async def snapshot(
+        self,
+        id: Annotated[
+            str,
+            Parameter(
+                title="ID",
+                description="The ID of the form",
+            ),
+        ],
+        service: Service,
+        rebuild: Annotated[
+            bool,
+            Parameter(
+                title="Rebuild",
+                description="Whether to rebuild the snapshot from scratch.",
+            ),
+        ] = False,
+    ) -> Response[SnapshotResponse]:
+        try:
+            content = await service.snapshot(id=id, rebuild=rebuild)
+        except FormNotFoundError as e:
+            raise NotFoundException(extra={"form": id}) from e
+        except (GraphQLError, WorkerError) as e:
+            raise ServiceUnavailableException() from e
+
+        return Response(content)
+
+    @get(
+        "/{id:str}/snapshot",
+        summary="Read snapshot",
+        description="Read the columnar snapshot of a form as an Arrow IPC stream",
+        raises=[NotAuthorizedException, NotFoundException],
+    )
+    async def read(
+        self,
+        id: Annotated[
+            str,
+            Parameter(
+                title="ID",
+                description="The ID of the form",
+            ),
+        ],
+        service: Service,
+    ) -> Stream:
+        content = await service.read(id)
+
+        if content is None:
+            raise NotFoundException(extra={"form": id})
+
+        return Stream(content, media_type="application/vnd.apache.arrow.stream")
+
+
+class FormsController(BaseController):
+    """Controller for the results endpoints of forms."""
+
+    path = "/forms"
+    dependencies = DependenciesBuilder().build()
+    guards = [results_guard]
+
+    @get(
+        "/{id:str}/results/stream",
+        summary="Stream results",
+        description="Stream live results of a form as server-sent events",
+        raises=[
+            NotAuthorizedException,
+            NotFoundException,
+            ServiceUnavailableException,
+        ],
+    )
+    async def stream(
+        self,
+        id: Annotated[
+            str,
+            Parameter(
+                title="ID",
+                description="The ID of the form",
+            ),
+        ],
+        state: State,
+        service: Service,
+        source: Annotated[
+            Literal["snapshot", "tallies"],
+            Parameter(
+                title="Source",
+                description="Whether results come from the snapshot or running tallies.",
+            ),
+        ] = "snapshot",
+    ) -> Stream:
+        if state.broadcaster.full:
+            raise ServiceUnavailableException(
+                headers={"Retry-After": str(state.config.admission.retry_after)}
+            )
+
+        try:
+            await service.check(id=id, source=source)
+        except FormNotFoundError as e:
+            raise NotFoundException(extra={"form": id}) from e
+        except TalliesDisabledError as e:
+            raise NotFoundException(extra={"source": source}) from e
+        except GraphQLError as e:
+            raise ServiceUnavailableException() from e
+
+        return Stream(
+            service.stream(
+                id=id,
+                source=source,
+                max_age=state.config.results.refresh,
+                broadcaster=state.broadcaster,
+                codec=state.codec,
+            ),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @get(
+        "/{id:str}/results",
+        summary="Get results",
+        description="Get aggregated results of a form",
+        raises=[
+            NotAuthorizedException,
+            NotFoundException,
+            ServiceUnavailableException,
+        ],
+        opt={"admission": "read"},
+    )
+    async def results(
+        self,
+        id: Annotated[
+            str,
+            Parameter(
+                title="ID",
+                description="The ID of the form",
+            ),
+        ],
+        state: State,
+        service: Service,
+        source: Annotated[
+            Literal["snapshot", "tallies"],
+            Parameter(
+                title="Source",
+                description="Whether results come from the snapshot or running tallies.",
+            ),
+        ] = "snapshot",
+    ) -> Response[ResultsResponse]:
+        try:
+            aggregated = await service.aggregated(
+                id=id, source=source, max_age=state.config.results.refresh
+            )
+        except FormNotFoundError as e:
+            raise NotFoundException(extra={"form": id}) from e
+        except TalliesDisabledError as e:
+            raise NotFoundException(extra={"source": source}) from e
+        except (GraphQLError, WorkerError) as e:
+            raise ServiceUnavailableException() from e
+
+        content = ResultsResponse(results=aggregated)
+        return Response(content)
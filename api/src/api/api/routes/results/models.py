@@ -0,0 +1,44 @@
+from pydantic import Field
+
+from api.models.base import SerializableModel
+from api.models.data import FormResults
+
+
+class ResultsResponse(SerializableModel):
+    """Response model for the GET /forms/:id/results endpoint."""
+
+    results: FormResults = Field(
+        ...,
+        title="ResultsResponse.Results",
+        description="The aggregated results of the form.",
+    )
+
+
+class SnapshotResponse(SerializableModel):
+    """Response model for the POST /results/:id/snapshot endpoint."""
+
+    form: str = Field(
+        ...,
+        title="SnapshotResponse.Form",
+        description="ID of the form.",
+    )
+    version: str = Field(
+        ...,
+        title="SnapshotResponse.Version",
+        description="Version of the form the columns were derived from.",
+    )
+    submissions: int = Field(
+        ...,
+        title="SnapshotResponse.Submissions",
+        description="Number of upstream submissions materialized in the snapshot.",
+    )
+    appended: int = Field(
+        ...,
+        title="SnapshotResponse.Appended",
+        description="Number of submissions appended by this update.",
+    )
+    segments: int = Field(
+        ...,
+        title="SnapshotResponse.Segments",
+        description="Number of segment files of the snapshot.",
+    )
@@ -0,0 +1,11 @@
+from litestar import Router
+
+from api.api.routes.results.controller import Controller, FormsController
+
+router = Router(
+    path="/",
+    route_handlers=[
+        Controller,
+        FormsController,
+    ],
+)
@@ -0,0 +1,212 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+
+import pyarrow as pa
+
+from api.api.routes.forms.errors import ServiceError, TalliesDisabledError
+from api.api.routes.forms.service import Service as FormsService
+from api.api.routes.results.models import ResultsResponse, SnapshotResponse
+from api.codecs import Codec
+from api.models import data as dm
+from api.results.aggregate import ResultsAggregator
+from api.results.broadcast import ResultsBroadcaster
+from api.results.columnar import ResultsStore
+from api.results.jobs import aggregate_snapshot, append_snapshot
+from api.results.tallies import Tallies
+from api.workers import WorkerError, WorkerPool
+
+
+class _ChunkSink:
+    """File-like sink collecting bytes written by an Arrow IPC writer."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        """Take the bytes written since the last call."""
+
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class Service:
+    """Service for the results endpoints."""
+
+    def __init__(
+        self,
+        forms: FormsService,
+        store: ResultsStore,
+        aggregator: ResultsAggregator,
+        tallies: Tallies | None,
+        workers: WorkerPool,
+        segment_size: int,
+    ) -> None:
+        self._forms = forms
+        self._store = store
+        self._aggregator = aggregator
+        self._tallies = tallies
+        self._workers = workers
+        self._segment_size = segment_size
+
+    async def snapshot(
+        self, id: str, rebuild: bool = False, max_age: float | None = None
+    ) -> SnapshotResponse:
+        """Append new submissions of a form to its snapshot.
+
+        The snapshot is rebuilt from scratch if the form changed. With a maximum
+        age, snapshots updated more recently than that are left as they are.
+        """
+
+        cached = await self._forms.get(id)
+
+        async with self._store.lock(id):
+            manifest = await asyncio.to_thread(self._store.manifest, id)
+
+            if (
+                not rebuild
+                and max_age is not None
+                and manifest is not None
+                and manifest.version == cached.version
+                and self._store.age(id) < max_age
+            ):
+                return SnapshotResponse(
+                    form=id,
+                    version=manifest.version,
+                    submissions=manifest.submissions,
+                    appended=0,
+                    segments=len(manifest.segments),
+                )
+
+            if rebuild or manifest is None or manifest.version != cached.version:
+                await asyncio.to_thread(self._store.clear, id)
+                manifest = None
+
+            listed = manifest.submissions if manifest is not None else 0
+            known = await asyncio.to_thread(self._store.ids, id) if manifest else set()
+            pending = []
+            appended = 0
+
+            async for submissions in self._forms.submissions(id, listed):
+                listed += len(submissions)
+                pending.extend(
+                    submission
+                    for submission in submissions
+                    if submission.id not in known
+                )
+
+                if len(pending) >= self._segment_size:
+                    await self._workers.run(
+                        append_snapshot,
+                        self._store,
+                        cached.form,
+                        cached.version,
+                        pending,
+                        listed,
+                    )
+                    appended += len(pending)
+                    pending = []
+
+            manifest = await self._workers.run(
+                append_snapshot,
+                self._store,
+                cached.form,
+                cached.version,
+                pending,
+                listed,
+            )
+            appended += len(pending)
+            self._store.touch(id)
+
+        return SnapshotResponse(
+            form=id,
+            version=manifest.version,
+            submissions=manifest.submissions,
+            appended=appended,
+            segments=len(manifest.segments),
+        )
+
+    async def results(self, id: str, max_age: float) -> dm.FormResults:
+        """Aggregate results of a form from its snapshot, updated if older than allowed."""
+
+        await self.snapshot(id, max_age=max_age)
+        cached = await self._forms.get(id)
+
+        return await self._workers.run(
+            aggregate_snapshot, self._store, self._aggregator, cached.form
+        )
+
+    async def tallied(self, id: str) -> dm.FormResults:
+        """Get results of a form from its running tallies."""
+
+        if self._tallies is None:
+            raise TalliesDisabledError()
+
+        cached = await self._forms.get(id)
+        return await self._tallies.results(cached.form)
+
+    async def check(self, id: str, source: str) -> None:
+        """Check that results of a form can be read from a source."""
+
+        if source == "tallies" and self._tallies is None:
+            raise TalliesDisabledError()
+
+        await self._forms.get(id)
+
+    async def aggregated(self, id: str, source: str, max_age: float) -> dm.FormResults:
+        """Get results of a form from the snapshot or running tallies."""
+
+        if source == "tallies":
+            return await self.tallied(id)
+
+        return await self.results(id, max_age=max_age)
+
+    def stream(
+        self,
+        id: str,
+        source: str,
+        max_age: float,
+        broadcaster: ResultsBroadcaster,
+        codec: Codec,
+    ) -> AsyncIterator[bytes]:
+        """Stream live results of a form as server-sent events."""
+
+        async def _compute() -> bytes | None:
+            try:
+                results = await self.aggregated(id, source, max_age)
+            except (ServiceError, WorkerError):
+                return None
+
+            return codec.encode(ResultsResponse(results=results))
+
+        return broadcaster.subscribe(f"{source}:{id}", _compute)
+
+    def _serialize(self, table: pa.Table) -> Iterator[bytes]:
+        """Serialize a table in the Arrow IPC streaming format, a batch at a time."""
+
+        sink = _ChunkSink()
+
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            for batch in table.to_batches():
+                writer.write_batch(batch)
+                yield sink.take()
+
+        yield sink.take()
+
+    async def read(self, id: str) -> Iterator[bytes] | None:
+        """Read the snapshot of a form as chunks of an Arrow IPC stream."""
+
+        table = await asyncio.to_thread(self._store.read, id)
+
+        if table is None:
+            return None
+
+        return self._serialize(table)
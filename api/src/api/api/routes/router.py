@@ -1,10 +1,18 @@
 from litestar import Router
 
+from api.api.routes.admin.router import router as admin_router
 from api.api.routes.forms.router import router as forms_router
+from api.api.routes.health.router import router as health_router
+from api.api.routes.metrics.router import router as metrics_router
+from api.api.routes.results.router import router as results_router
 
 router = Router(
     path="/",
     route_handlers=[
+        admin_router,
         forms_router,
+        health_router,
+        metrics_router,
+        results_router,
     ],
 )
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from hashlib import blake2b
+from time import time
+
+from api.cache.models import CachedForm
+from api.models import data as dm
+
+
+class FormCache:
+    """In-memory cache of parsed forms.
+
+    Args:
+        ttl: Number of seconds a form is considered fresh for.
+        capacity: Maximum number of cached forms.
+    """
+
+    def __init__(self, ttl: float, capacity: int) -> None:
+        self._ttl = ttl
+        self._capacity = capacity
+        self._forms: OrderedDict[str, CachedForm] = OrderedDict()
+
+    def _get_version(self, form: dm.Form) -> str:
+        """Get version of a form from its content."""
+
+        return blake2b(form.model_dump_json().encode(), digest_size=8).hexdigest()
+
+    def is_fresh(self, cached: CachedForm) -> bool:
+        """Check if a cached form is fresh."""
+
+        return time() - cached.fetched < self._ttl
+
+    def get(self, id: str) -> CachedForm | None:
+        """Get a fresh form from the cache."""
+
+        cached = self._forms.get(id)
+
+        if cached is None or not self.is_fresh(cached):
+            return None
+
+        self._forms.move_to_end(id)
+        return cached
+
+    def get_stale(self, id: str) -> CachedForm | None:
+        """Get a form from the cache, even if it is not fresh anymore."""
+
+        return self._forms.get(id)
+
+    def entries(self) -> list[CachedForm]:
+        """Get all cached forms."""
+
+        return list(self._forms.values())
+
+    def _store(self, cached: CachedForm) -> None:
+        """Store a form and evict the least recently used forms over capacity."""
+
+        self._forms[cached.form.id] = cached
+        self._forms.move_to_end(cached.form.id)
+
+        while len(self._forms) > self._capacity:
+            self._forms.popitem(last=False)
+
+    def restore(self, cached: CachedForm) -> None:
+        """Put a form into the cache as stale, e.g. from a snapshot.
+
+        Restored forms keep their encoded bodies, but are served fresh only
+        after they are revalidated, and stale only if that fails.
+        """
+
+        if self._ttl > 0 and cached.form.id not in self._forms:
+            self._store(cached.model_copy(update={"fetched": 0.0}))
+
+    def put(self, form: dm.Form, fetched: float | None = None) -> CachedForm:
+        """Put a form into the cache, fetched now unless specified otherwise."""
+
+        version = self._get_version(form)
+        previous = self._forms.get(form.id)
+        fetched = time() if fetched is None else fetched
+
+        if previous is not None and previous.version == version:
+            # Keep encoded bodies, so they are computed once per version
+            cached = previous.model_copy(update={"fetched": fetched})
+        else:
+            cached = CachedForm(form=form, version=version, fetched=fetched)
+
+        if self._ttl <= 0:
+            return cached
+
+        self._store(cached)
+        return cached
+
+    def invalidate(self, id: str | None = None) -> None:
+        """Remove a form or all forms from the cache."""
+
+        if id is None:
+            self._forms.clear()
+        else:
+            self._forms.pop(id, None)
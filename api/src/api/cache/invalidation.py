@@ -0,0 +1,119 @@
+import asyncio
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from api.cache.forms import FormCache
+from api.cache.known import KnownForms
+from api.cache.negative import NegativeFormCache
+from api.cache.remote import RemoteFormCache
+from api.cache.shared import SharedFormCache
+
+
+class CacheInvalidator:
+    """Invalidates cached forms on all instances.
+
+    Invalidations are broadcast over Redis pub/sub, so every instance and
+    worker drops the form from its in-process cache. Without Redis, only the
+    local cache is invalidated.
+
+    Args:
+        cache: In-process form cache.
+        negative: In-process cache of forms that were not found.
+        known: Filter of known form ids.
+        shared: Form cache shared by processes on the host.
+        remote: Form cache shared by instances.
+        redis: Redis client.
+        channel: Pub/sub channel for invalidations.
+        backoff: Number of seconds to wait before resubscribing after a failure.
+    """
+
+    ALL = "*"
+
+    def __init__(
+        self,
+        cache: FormCache,
+        negative: NegativeFormCache,
+        known: KnownForms | None,
+        shared: SharedFormCache | None,
+        remote: RemoteFormCache | None,
+        redis: Redis | None,
+        channel: str,
+        backoff: float,
+    ) -> None:
+        self._cache = cache
+        self._negative = negative
+        self._known = known
+        self._shared = shared
+        self._remote = remote
+        self._redis = redis
+        self._channel = channel
+        self._backoff = backoff
+        self._subscribed = False
+
+    def _invalidate_local(self, id: str | None) -> None:
+        """Invalidate a form or all forms in this process and on the host."""
+
+        self._cache.invalidate(id)
+        self._negative.invalidate(id)
+
+        # An invalidated form might have just been created
+        if self._known is not None and id is not None:
+            self._known.add(id)
+
+        if self._shared is not None:
+            self._shared.invalidate(id)
+
+    async def invalidate(self, id: str | None = None) -> None:
+        """Invalidate a form or all forms on all instances."""
+
+        self._invalidate_local(id)
+
+        if self._remote is not None:
+            await self._remote.invalidate(id)
+
+        if self._redis is not None:
+            try:
+                await self._redis.publish(self._channel, id or self.ALL)
+            except RedisError:
+                pass
+
+    def _handle(self, message: bytes) -> None:
+        """Handle a broadcast invalidation."""
+
+        id = message.decode()
+        id = None if id == self.ALL else id
+
+        self._invalidate_local(id)
+
+    async def _listen(self, redis: Redis) -> None:
+        """Listen for broadcast invalidations until the connection fails."""
+
+        async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+            await pubsub.subscribe(self._channel)
+
+            # Anything might have changed while the subscription was lost, but
+            # forms cached before the first one, e.g. restored, are already stale
+            if self._subscribed:
+                self._cache.invalidate()
+
+            self._subscribed = True
+
+            while True:
+                # Wait with an explicit timeout, so the socket timeout doesn't apply
+                message = await pubsub.get_message(timeout=1.0)
+
+                if message is not None and message["type"] == "message":
+                    self._handle(message["data"])
+
+    async def listen(self) -> None:
+        """Listen for broadcast invalidations until cancelled."""
+
+        if self._redis is None:
+            return
+
+        while True:
+            try:
+                await self._listen(self._redis)
+            except (RedisError, OSError):
+                await asyncio.sleep(self._backoff)
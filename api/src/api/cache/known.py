@@ -0,0 +1,85 @@
+import math
+from collections.abc import Iterable
+from hashlib import blake2b
+
+
+class BloomFilter:
+    """Compact set membership filter with false positives, but no false negatives.
+
+    Args:
+        capacity: Expected number of items.
+        error_rate: Expected rate of false positives at full capacity.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(capacity, 1)
+
+        self._size = max(
+            math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2), 8
+        )
+        self._hashes = max(round(self._size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        """Get positions of bits of an item, using double hashing."""
+
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+
+        for i in range(self._hashes):
+            yield (first + i * second) % self._size
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class KnownForms:
+    """Filter of ids of forms known to exist upstream.
+
+    Until the filter is built, every id is considered possibly known.
+
+    Args:
+        error_rate: Expected rate of unknown ids considered possibly known.
+    """
+
+    def __init__(self, error_rate: float) -> None:
+        self._error_rate = error_rate
+        self._filter: BloomFilter | None = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the filter was built."""
+
+        return self._filter is not None
+
+    def replace(self, ids: Iterable[str]) -> None:
+        """Replace known ids."""
+
+        ids = list(ids)
+        filter = BloomFilter(capacity=len(ids), error_rate=self._error_rate)
+
+        for id in ids:
+            filter.add(id)
+
+        self._filter = filter
+
+    def add(self, id: str) -> None:
+        """Add a known id, e.g. of a form created after the filter was built."""
+
+        if self._filter is not None:
+            self._filter.add(id)
+
+    def might_exist(self, id: str) -> bool:
+        """Check if a form might exist upstream."""
+
+        return self._filter is None or id in self._filter
@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+
+from api.models import data as dm
+
+
+class CachedForm(BaseModel):
+    """Form stored in the cache."""
+
+    form: dm.Form = Field(
+        ...,
+        title="Form",
+        description="Parsed form.",
+    )
+    version: str = Field(
+        ...,
+        title="Version",
+        description="Version of the form derived from its content.",
+    )
+    fetched: float = Field(
+        ...,
+        title="Fetched",
+        description="Unix time when the form was fetched.",
+    )
+    bodies: dict[str, bytes] = Field(
+        {},
+        title="Bodies",
+        description="Encoded response bodies of the form, keyed by representation.",
+    )
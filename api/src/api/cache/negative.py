@@ -0,0 +1,50 @@
+from collections import OrderedDict
+from time import monotonic
+
+
+class NegativeFormCache:
+    """In-memory cache of ids of forms that were not found upstream.
+
+    Args:
+        ttl: Number of seconds an id is remembered as not found for.
+        capacity: Maximum number of remembered ids.
+    """
+
+    def __init__(self, ttl: float, capacity: int) -> None:
+        self._ttl = ttl
+        self._capacity = capacity
+        self._ids: OrderedDict[str, float] = OrderedDict()
+
+    def contains(self, id: str) -> bool:
+        """Check if a form was recently not found."""
+
+        expires = self._ids.get(id)
+
+        if expires is None:
+            return False
+
+        if monotonic() >= expires:
+            del self._ids[id]
+            return False
+
+        return True
+
+    def add(self, id: str) -> None:
+        """Remember that a form was not found."""
+
+        if self._ttl <= 0:
+            return
+
+        self._ids[id] = monotonic() + self._ttl
+        self._ids.move_to_end(id)
+
+        while len(self._ids) > self._capacity:
+            self._ids.popitem(last=False)
+
+    def invalidate(self, id: str | None = None) -> None:
+        """Forget a form or all forms."""
+
+        if id is None:
+            self._ids.clear()
+        else:
+            self._ids.pop(id, None)
@@ -0,0 +1,96 @@
+from time import monotonic
+
+import msgspec
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from api.models import data as dm
+
+
+class RemoteFormCache:
+    """Cache of parsed forms in Redis, shared between instances.
+
+    Forms are stored as MessagePack under versioned keys, so changing the
+    encoding never reads entries written by older instances. When Redis fails,
+    it is skipped for a while and the cache behaves as if it was empty.
+
+    Args:
+        redis: Redis client.
+        ttl: Number of seconds a form is kept for.
+        prefix: Prefix of the keys.
+        backoff: Number of seconds Redis is skipped for after a failure.
+    """
+
+    SCHEMA = 1
+
+    def __init__(self, redis: Redis, ttl: float, prefix: str, backoff: float) -> None:
+        self._redis = redis
+        self._ttl = ttl
+        self._prefix = prefix
+        self._backoff = backoff
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder()
+        self._down_until = 0.0
+
+    def _key(self, id: str) -> str:
+        """Get key of a form."""
+
+        return f"{self._prefix}:forms:v{self.SCHEMA}:{id}"
+
+    def _is_down(self) -> bool:
+        """Check if Redis is skipped after a failure."""
+
+        return monotonic() < self._down_until
+
+    def _set_down(self) -> None:
+        """Skip Redis for a while after a failure."""
+
+        self._down_until = monotonic() + self._backoff
+
+    async def get(self, id: str) -> dm.Form | None:
+        """Get a form from the cache."""
+
+        if self._is_down():
+            return None
+
+        try:
+            data = await self._redis.get(self._key(id))
+        except RedisError:
+            self._set_down()
+            return None
+
+        if data is None:
+            return None
+
+        try:
+            return dm.Form.model_validate(self._decoder.decode(data))
+        except (msgspec.DecodeError, ValidationError):
+            return None
+
+    async def put(self, form: dm.Form) -> None:
+        """Put a form into the cache."""
+
+        if self._is_down() or self._ttl <= 0:
+            return
+
+        data = self._encoder.encode(form.model_dump(mode="json"))
+
+        try:
+            await self._redis.set(self._key(form.id), data, px=int(self._ttl * 1000))
+        except RedisError:
+            self._set_down()
+
+    async def invalidate(self, id: str | None = None) -> None:
+        """Remove a form or all forms from the cache."""
+
+        try:
+            if id is not None:
+                await self._redis.delete(self._key(id))
+                return
+
+            pattern = f"{self._prefix}:forms:v{self.SCHEMA}:*"
+            async for key in self._redis.scan_iter(match=pattern):
+                await self._redis.delete(key)
+        except RedisError:
+            self._set_down()
@@ -0,0 +1,176 @@
+import fcntl
+import glob
+import mmap
+import os
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+import msgspec
+from pydantic import ValidationError
+
+from api.cache.models import CachedForm
+from api.models import data as dm
+
+
+class SharedFormCache:
+    """Cache of forms and their encoded bodies shared by processes on one host.
+
+    Entries are files in a directory, ideally on a memory-backed filesystem.
+    Forms are decoded straight from memory-mapped files. Bodies are encoded
+    and compressed once per host and served from memory-mapped files, so all
+    processes share the same pages instead of keeping copies of them. Only one
+    process, elected with a file lock, writes to the cache.
+
+    Args:
+        path: Directory of the cache.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+        self._lock: int | None = None
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder()
+
+    def _form_path(self, id: str) -> Path:
+        """Get path of the index entry of a form."""
+
+        return self._path / "forms" / f"{id}.msgpack"
+
+    def _body_path(self, id: str, version: str, representation: str) -> Path:
+        """Get path of an encoded body of a form."""
+
+        return self._path / "bodies" / f"{id}.{version}.{representation}"
+
+    def _elect(self) -> bool:
+        """Try to become the writer, which holds the lock until it exits."""
+
+        if self._lock is not None:
+            return True
+
+        try:
+            self._path.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self._path / "writer.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            return False
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        self._lock = fd
+        return True
+
+    def close(self) -> None:
+        """Step down as the writer."""
+
+        if self._lock is not None:
+            os.close(self._lock)
+            self._lock = None
+
+    def _map(self, path: Path) -> memoryview | None:
+        """Map a file into memory, read-only.
+
+        Files are replaced rather than modified, so a mapping keeps its content
+        until it is released, even if the file is replaced or removed.
+        """
+
+        try:
+            with open(path, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        return memoryview(mapped)
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Write a file atomically, so readers never see partial data."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with NamedTemporaryFile(dir=path.parent, delete=False) as file:
+            file.write(data)
+
+        os.replace(file.name, path)
+
+    def get(self, id: str) -> CachedForm | None:
+        """Get a form from the cache, without its bodies."""
+
+        try:
+            with open(self._form_path(id), "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    entry = self._decoder.decode(mapped)
+        except (OSError, ValueError, msgspec.DecodeError):
+            return None
+
+        try:
+            return CachedForm(
+                form=dm.Form.model_validate(entry["form"]),
+                version=entry["version"],
+                fetched=entry["fetched"],
+            )
+        except (ValidationError, KeyError, TypeError):
+            return None
+
+    def get_body(self, cached: CachedForm, representation: str) -> memoryview | None:
+        """Get an encoded body of a form from the cache, without copying it."""
+
+        return self._map(
+            self._body_path(cached.form.id, cached.version, representation)
+        )
+
+    def put(self, cached: CachedForm) -> None:
+        """Put a form into the cache if this process is the writer."""
+
+        if not self._elect():
+            return
+
+        path = self._form_path(cached.form.id)
+        previous = self.get(cached.form.id)
+
+        entry = {
+            "form": cached.form.model_dump(mode="json"),
+            "version": cached.version,
+            "fetched": cached.fetched,
+        }
+
+        try:
+            self._write(path, self._encoder.encode(entry))
+        except OSError:
+            return
+
+        if previous is not None and previous.version != cached.version:
+            id, version = glob.escape(cached.form.id), glob.escape(previous.version)
+
+            for body in self._path.glob(f"bodies/{id}.{version}.*"):
+                body.unlink(missing_ok=True)
+
+    def put_body(self, cached: CachedForm, representation: str, body: bytes) -> bool:
+        """Put an encoded body of a form into the cache if this process is the writer.
+
+        Returns whether the body was stored.
+        """
+
+        if not self._elect():
+            return False
+
+        try:
+            self._write(
+                self._body_path(cached.form.id, cached.version, representation), body
+            )
+        except OSError:
+            return False
+
+        return True
+
+    def invalidate(self, id: str | None = None) -> None:
+        """Remove a form or all forms from the cache."""
+
+        pattern = "*" if id is None else glob.escape(id)
+
+        for path in self._path.glob(f"forms/{pattern}.msgpack"):
+            path.unlink(missing_ok=True)
+
+        for path in self._path.glob(f"bodies/{pattern}.*"):
+            path.unlink(missing_ok=True)
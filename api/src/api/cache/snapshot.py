@@ -0,0 +1,81 @@
+import mmap
+import os
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+import msgspec
+from pydantic import ValidationError
+
+from api.cache.models import CachedForm
+from api.models import data as dm
+
+
+class FormCacheSnapshot:
+    """Snapshot of cached forms on disk, surviving restarts.
+
+    The snapshot is a single MessagePack file with the forms, their versions,
+    fetch times and encoded bodies. It is replaced atomically when saved and
+    read through memory mapping when loaded.
+
+    Args:
+        path: Path of the snapshot file.
+    """
+
+    SCHEMA = 1
+
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder()
+
+    def save(self, entries: list[CachedForm]) -> None:
+        """Save cached forms to the snapshot."""
+
+        snapshot = {
+            "schema": self.SCHEMA,
+            "forms": [
+                {
+                    "form": cached.form.model_dump(mode="json"),
+                    "version": cached.version,
+                    "fetched": cached.fetched,
+                    "bodies": cached.bodies,
+                }
+                for cached in entries
+            ],
+        }
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        with NamedTemporaryFile(dir=self._path.parent, delete=False) as file:
+            file.write(self._encoder.encode(snapshot))
+
+        os.replace(file.name, self._path)
+
+    def _parse(self, entry: dict) -> CachedForm | None:
+        """Parse a snapshot entry."""
+
+        try:
+            return CachedForm(
+                form=dm.Form.model_validate(entry["form"]),
+                version=entry["version"],
+                fetched=entry["fetched"],
+                bodies=entry["bodies"],
+            )
+        except (ValidationError, KeyError, TypeError):
+            return None
+
+    def load(self) -> list[CachedForm]:
+        """Load cached forms from the snapshot, if there is a valid one."""
+
+        try:
+            with open(self._path, "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    snapshot = self._decoder.decode(mapped)
+        except (OSError, ValueError, msgspec.DecodeError):
+            return []
+
+        if not isinstance(snapshot, dict) or snapshot.get("schema") != self.SCHEMA:
+            return []
+
+        entries = (self._parse(entry) for entry in snapshot.get("forms", []))
+        return [cached for cached in entries if cached is not None]
@@ -0,0 +1,70 @@
+from abc import ABC, abstractmethod
+from typing import Any, TypeVar
+
+import msgspec
+import orjson
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class CodecError(ValueError):
+    """Raised when data cannot be decoded."""
+
+    pass
+
+
+class Codec(ABC):
+    """Base class for JSON codecs."""
+
+    def _to_builtins(self, model: BaseModel) -> Any:
+        """Convert a model to JSON-compatible builtins using field aliases."""
+
+        return model.model_dump(mode="json", by_alias=True)
+
+    @abstractmethod
+    def encode(self, model: BaseModel) -> bytes:
+        """Encode a model to JSON."""
+
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Decode JSON to builtins."""
+
+        pass
+
+    def validate(self, data: bytes, model: type[M]) -> M:
+        """Decode JSON and validate it as a model."""
+
+        return model.model_validate(self.decode(data))
+
+
+class MsgspecCodec(Codec):
+    """JSON codec using msgspec."""
+
+    def __init__(self) -> None:
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def encode(self, model: BaseModel) -> bytes:
+        return self._encoder.encode(self._to_builtins(model))
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise CodecError(str(e)) from e
+
+
+class OrjsonCodec(Codec):
+    """JSON codec using orjson."""
+
+    def encode(self, model: BaseModel) -> bytes:
+        return orjson.dumps(self._to_builtins(model))
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            raise CodecError(str(e)) from e
@@ -0,0 +1,207 @@
+import gzip
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+
+import brotli
+import zstandard
+
+
+class StreamCompressor(ABC):
+    """Compresses a stream of chunks."""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush the output."""
+
+        pass
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        """Finish the stream."""
+
+        pass
+
+
+class Compressor(ABC):
+    """Base class for compressors.
+
+    Args:
+        level: Compression level.
+    """
+
+    encoding: str
+
+    def __init__(self, level: int) -> None:
+        self._level = level
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress data."""
+
+        pass
+
+    @abstractmethod
+    def stream(self) -> StreamCompressor:
+        """Create a stream compressor."""
+
+        pass
+
+
+class GzipStreamCompressor(StreamCompressor):
+    """Compresses a stream of chunks with gzip."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class GzipCompressor(Compressor):
+    """Compresses data with gzip."""
+
+    encoding = "gzip"
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=self._level, mtime=0)
+
+    def stream(self) -> StreamCompressor:
+        return GzipStreamCompressor(self._level)
+
+
+class BrotliStreamCompressor(StreamCompressor):
+    """Compresses a stream of chunks with brotli."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level, mode=brotli.MODE_TEXT)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class BrotliCompressor(Compressor):
+    """Compresses data with brotli."""
+
+    encoding = "br"
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self._level, mode=brotli.MODE_TEXT)
+
+    def stream(self) -> StreamCompressor:
+        return BrotliStreamCompressor(self._level)
+
+
+class ZstdStreamCompressor(StreamCompressor):
+    """Compresses a stream of chunks with zstd."""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+class ZstdCompressor(Compressor):
+    """Compresses data with zstd."""
+
+    encoding = "zstd"
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self._level).compress(data)
+
+    def stream(self) -> StreamCompressor:
+        return ZstdStreamCompressor(self._level)
+
+
+class Compression:
+    """Negotiates content encodings and compresses data.
+
+    Args:
+        compressors: Compressors for responses, in order of preference.
+        precompressors: Compressors for cached responses.
+        minimum_size: Minimum size in bytes of a response to be compressed.
+    """
+
+    def __init__(
+        self,
+        compressors: Iterable[Compressor],
+        precompressors: Iterable[Compressor],
+        minimum_size: int,
+    ) -> None:
+        self._compressors = {c.encoding: c for c in compressors}
+        self._precompressors = {c.encoding: c for c in precompressors}
+        self._minimum_size = minimum_size
+
+    @property
+    def minimum_size(self) -> int:
+        return self._minimum_size
+
+    @property
+    def encodings(self) -> list[str]:
+        return list(self._compressors)
+
+    def _parse_accept_encoding(self, header: str) -> dict[str, float]:
+        """Parse weights of the encodings in an Accept-Encoding header."""
+
+        weights = {}
+
+        for part in header.split(","):
+            encoding, _, params = part.partition(";")
+            weight = 1.0
+
+            for param in params.split(";"):
+                key, _, value = param.partition("=")
+                if key.strip() == "q":
+                    try:
+                        weight = float(value)
+                    except ValueError:
+                        weight = 0.0
+
+            weights[encoding.strip().lower()] = weight
+
+        return weights
+
+    def negotiate(self, header: str | None) -> str | None:
+        """Choose the best encoding for an Accept-Encoding header."""
+
+        if not header:
+            return None
+
+        weights = self._parse_accept_encoding(header)
+        best, best_weight = None, 0.0
+
+        for encoding in self._compressors:
+            weight = weights.get(encoding, weights.get("*", 0.0))
+            if weight > best_weight:
+                best, best_weight = encoding, weight
+
+        return best
+
+    def compress(self, encoding: str, data: bytes) -> bytes:
+        """Compress data of a response."""
+
+        return self._compressors[encoding].compress(data)
+
+    def precompress(self, encoding: str, data: bytes) -> bytes:
+        """Compress data of a cached response, trading speed for size."""
+
+        return self._precompressors[encoding].compress(data)
+
+    def stream(self, encoding: str) -> StreamCompressor:
+        """Create a stream compressor for a streamed response."""
+
+        return self._compressors[encoding].stream()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 from api.config.base import BaseConfig
@@ -18,6 +20,126 @@ class ServerConfig(BaseModel):
         title="Port",
         description="Port to run the server on.",
     )
+    workers: int = Field(
+        1,
+        gt=0,
+        title="Workers",
+        description="Number of worker processes.",
+    )
+
+
+class SchedulingClassConfig(BaseModel):
+    """Configuration for a class of GraphQL operations."""
+
+    weight: float = Field(
+        1.0,
+        gt=0,
+        title="Weight",
+        description="Share of the slots relative to other classes.",
+    )
+    concurrency: int = Field(
+        32,
+        gt=0,
+        title="Concurrency",
+        description="Maximum number of operations of the class running at the same time.",
+    )
+
+
+class BatchingConfig(BaseModel):
+    """Configuration for batching of concurrent GraphQL operations."""
+
+    enabled: bool = Field(
+        False,
+        title="Enabled",
+        description="Whether to send concurrent operations in batches, which the GraphQL service must support.",
+    )
+    window: float = Field(
+        0.002,
+        gt=0,
+        title="Window",
+        description="Maximum number of seconds a batch is collected for.",
+    )
+    size: int = Field(
+        16,
+        gt=1,
+        title="Size",
+        description="Maximum number of operations in a batch.",
+    )
+
+
+class SchedulerConfig(BaseModel):
+    """Configuration for the GraphQL operation scheduler."""
+
+    concurrency: int = Field(
+        64,
+        gt=0,
+        title="Concurrency",
+        description="Maximum number of operations running at the same time.",
+    )
+    submission: SchedulingClassConfig = Field(
+        SchedulingClassConfig(weight=4.0, concurrency=64),
+        title="Submission",
+        description="Configuration for writing to started submissions.",
+    )
+    start: SchedulingClassConfig = Field(
+        SchedulingClassConfig(weight=2.0, concurrency=32),
+        title="Start",
+        description="Configuration for starting submissions.",
+    )
+    read: SchedulingClassConfig = Field(
+        SchedulingClassConfig(weight=1.0, concurrency=32),
+        title="Read",
+        description="Configuration for reading forms.",
+    )
+    export: SchedulingClassConfig = Field(
+        SchedulingClassConfig(weight=0.5, concurrency=4),
+        title="Export",
+        description="Configuration for reading submissions for exports.",
+    )
+
+
+class GraphQLReplicaConfig(BaseModel):
+    """Configuration for a replica of the GraphQL service."""
+
+    host: str = Field(
+        ...,
+        title="Host",
+        description="Host of the replica.",
+    )
+    port: int = Field(
+        ...,
+        ge=0,
+        le=65535,
+        title="Port",
+        description="Port of the replica.",
+    )
+
+
+class TokenStoreConfig(BaseModel):
+    """Configuration for the store of GraphQL authentication tokens."""
+
+    backend: Literal["memory", "file", "redis"] = Field(
+        "memory",
+        title="Backend",
+        description="Where tokens are kept: in each process, in files shared on the host or in Redis.",
+    )
+    path: str = Field(
+        "/dev/shm/surveys-api/tokens",
+        title="Path",
+        description="Directory of the file store.",
+    )
+    lease: float = Field(
+        10.0,
+        gt=0,
+        title="Lease",
+        description="Maximum number of seconds one process logs in for while others wait.",
+    )
+    poll: float = Field(
+        0.1,
+        gt=0,
+        title="Poll",
+        description="Number of seconds between checks for tokens stored by another process.",
+    )
 
 
 class GraphQLConfig(BaseModel):
@@ -35,6 +157,29 @@ class GraphQLConfig(BaseModel):
         title="Port",
         description="Port of the GraphQL service.",
     )
+    replicas: list[GraphQLReplicaConfig] | None = Field(
+        None,
+        title="Replicas",
+        description="Replicas of the GraphQL service, host and port are used if not set.",
+    )
+    ejection: float = Field(
+        5.0,
+        ge=0,
+        title="Ejection",
+        description="Number of seconds an unreachable replica is ejected for.",
+    )
+    ejection_max: float = Field(
+        60.0,
+        ge=0,
+        title="Ejection Max",
+        description="Maximum number of seconds an unreachable replica is ejected for.",
+    )
+    readmission: float = Field(
+        10.0,
+        ge=0,
+        title="Readmission",
+        description="Number of seconds over which a re-admitted replica regains its full share of traffic.",
+    )
     user: str = Field(
         "admin",
         title="User",
@@ -45,6 +190,568 @@ class GraphQLConfig(BaseModel):
         title="Password",
         description="Password to use for the GraphQL service.",
     )
+    background_login: bool = Field(
+        False,
+        title="Background Login",
+        description="Whether to accept traffic before logging in to the GraphQL service.",
+    )
+    login_retry: float = Field(
+        1.0,
+        gt=0,
+        title="Login Retry",
+        description="Number of seconds between background login attempts.",
+    )
+    scheduler: SchedulerConfig = Field(
+        SchedulerConfig(),
+        title="Scheduler",
+        description="Configuration for the GraphQL operation scheduler.",
+    )
+    tokens: TokenStoreConfig = Field(
+        TokenStoreConfig(),
+        title="Tokens",
+        description="Configuration for the store of authentication tokens.",
+    )
+    batching: BatchingConfig = Field(
+        BatchingConfig(),
+        title="Batching",
+        description="Configuration for batching of concurrent operations.",
+    )
+
+
+class AdminConfig(BaseModel):
+    """Configuration for the admin endpoints."""
+
+    token: str | None = Field(
+        None,
+        title="Token",
+        description="Bearer token for the admin endpoints, which are disabled if not set.",
+    )
+
+
+class RedisConfig(BaseModel):
+    """Configuration for Redis."""
+
+    enabled: bool = Field(
+        False,
+        title="Enabled",
+        description="Whether to share the form cache between instances in Redis.",
+    )
+    host: str = Field(
+        "localhost",
+        title="Host",
+        description="Host of Redis.",
+    )
+    port: int = Field(
+        30002,
+        ge=0,
+        le=65535,
+        title="Port",
+        description="Port of Redis.",
+    )
+    db: int = Field(
+        0,
+        ge=0,
+        title="DB",
+        description="Number of the Redis database.",
+    )
+    password: str | None = Field(
+        None,
+        title="Password",
+        description="Password to use for Redis.",
+    )
+    prefix: str = Field(
+        "surveys:api",
+        title="Prefix",
+        description="Prefix of the keys.",
+    )
+    channel: str = Field(
+        "surveys:api:invalidate",
+        title="Channel",
+        description="Pub/sub channel for cache invalidations.",
+    )
+    timeout: float = Field(
+        0.25,
+        gt=0,
+        title="Timeout",
+        description="Number of seconds to wait for Redis.",
+    )
+    backoff: float = Field(
+        5.0,
+        ge=0,
+        title="Backoff",
+        description="Number of seconds Redis is skipped for after a failure.",
+    )
+
+
+class DatabaseConfig(BaseModel):
+    """Configuration for reading forms directly from the database of the GraphQL service."""
+
+    enabled: bool = Field(
+        False,
+        title="Enabled",
+        description="Whether to read forms from the database instead of the GraphQL service.",
+    )
+    host: str = Field(
+        "localhost",
+        title="Host",
+        description="Host of the database.",
+    )
+    port: int = Field(
+        30001,
+        ge=0,
+        le=65535,
+        title="Port",
+        description="Port of the database.",
+    )
+    user: str = Field(
+        "user",
+        title="User",
+        description="User of the database.",
+    )
+    password: str = Field(
+        "password",
+        title="Password",
+        description="Password to use for the database.",
+    )
+    name: str = Field(
+        "database",
+        title="Name",
+        description="Name of the database.",
+    )
+    salt: str = Field(
+        "secret",
+        title="Salt",
+        description="Salt of the IDs of the GraphQL service, which is its secret key.",
+    )
+    min_length: int = Field(
+        10,
+        ge=0,
+        title="Min Length",
+        description="Minimum length of the IDs of the GraphQL service.",
+    )
+    pool_min: int = Field(
+        1,
+        ge=0,
+        title="Pool Min",
+        description="Minimum number of pooled connections.",
+    )
+    pool_max: int = Field(
+        10,
+        gt=0,
+        title="Pool Max",
+        description="Maximum number of pooled connections.",
+    )
+    timeout: float = Field(
+        5.0,
+        gt=0,
+        title="Timeout",
+        description="Number of seconds to wait for the database.",
+    )
+    backoff: float = Field(
+        5.0,
+        ge=0,
+        title="Backoff",
+        description="Number of seconds to serve forms from the GraphQL service after the database was unreachable.",
+    )
+
+
+class VotesConfig(BaseModel):
+    """Configuration for votes over WebSockets."""
+
+    enabled: bool = Field(
+        False,
+        title="Enabled",
+        description="Whether votes can be sent over WebSockets.",
+    )
+    batch_size: int = Field(
+        100,
+        gt=0,
+        title="Batch Size",
+        description="Maximum number of votes submitted upstream at the same time.",
+    )
+    interval: float = Field(
+        0.05,
+        ge=0,
+        title="Interval",
+        description="Maximum number of seconds a batch of votes is collected for.",
+    )
+    capacity: int = Field(
+        10000,
+        gt=0,
+        title="Capacity",
+        description="Maximum number of acknowledged votes waiting to be submitted.",
+    )
+    retries: int = Field(
+        3,
+        ge=0,
+        title="Retries",
+        description="Maximum number of times a vote that failed upstream is submitted again.",
+    )
+    backoff: float = Field(
+        1.0,
+        ge=0,
+        title="Backoff",
+        description="Number of seconds before the first retry of failed votes, doubled for every further retry.",
+    )
+
+
+class SubmissionsConfig(BaseModel):
+    """Configuration for submissions."""
+
+    retries: int = Field(
+        3,
+        ge=0,
+        title="Retries",
+        description="Number of retries of failed field writes.",
+    )
+    backoff: float = Field(
+        0.1,
+        ge=0,
+        title="Backoff",
+        description="Base delay in seconds between retries of failed field writes.",
+    )
+    backoff_max: float = Field(
+        2.0,
+        ge=0,
+        title="Maximum Backoff",
+        description="Maximum delay in seconds between retries of failed field writes.",
+    )
+    ttl: float = Field(
+        3600.0,
+        gt=0,
+        title="TTL",
+        description="Number of seconds unfinished submissions can be resumed for.",
+    )
+    capacity: int = Field(
+        10000,
+        gt=0,
+        title="Capacity",
+        description="Maximum number of unfinished submissions to keep track of.",
+    )
+    export_page_size: int = Field(
+        100,
+        gt=0,
+        title="Export Page Size",
+        description="Number of submissions fetched per request when exporting.",
+    )
+    votes: VotesConfig = Field(
+        VotesConfig(),
+        title="Votes",
+        description="Configuration for votes over WebSockets.",
+    )
+
+
+class WarmupConfig(BaseModel):
+    """Configuration for the form cache warm-up."""
+
+    enabled: bool = Field(
+        False,
+        title="Enabled",
+        description="Whether to load forms into the cache at startup.",
+    )
+    limit: int | None = Field(
+        None,
+        gt=0,
+        title="Limit",
+        description="Maximum number of most recent forms to load, all if not set.",
+    )
+    concurrency: int = Field(
+        8,
+        gt=0,
+        title="Concurrency",
+        description="Maximum number of forms loaded at the same time.",
+    )
+    page_size: int = Field(
+        50,
+        gt=0,
+        title="Page Size",
+        description="Number of forms listed per request.",
+    )
+
+
+class SnapshotConfig(BaseModel):
+    """Configuration for the form cache snapshot."""
+
+    enabled: bool = Field(
+        False,
+        title="Enabled",
+        description="Whether to save the form cache to disk and restore it at startup.",
+    )
+    path: str = Field(
+        "/var/tmp/surveys-api/forms.snapshot",
+        title="Path",
+        description="Path of the snapshot file.",
+    )
+    interval: float = Field(
+        60.0,
+        gt=0,
+        title="Interval",
+        description="Number of seconds between periodic snapshots.",
+    )
+    concurrency: int = Field(
+        8,
+        gt=0,
+        title="Concurrency",
+        description="Maximum number of restored forms revalidated at the same time.",
+    )
+
+
+class KnownFormsConfig(BaseModel):
+    """Configuration for the filter of known form ids."""
+
+    enabled: bool = Field(
+        False,
+        title="Enabled",
+        description="Whether to reject ids of forms not listed upstream.",
+    )
+    interval: float = Field(
+        60.0,
+        gt=0,
+        title="Interval",
+        description="Number of seconds between refreshes of the filter.",
+    )
+    error_rate: float = Field(
+        0.01,
+        gt=0,
+        lt=1,
+        title="Error Rate",
+        description="Expected rate of unknown ids passing the filter.",
+    )
+    page_size: int = Field(
+        50,
+        gt=0,
+        title="Page Size",
+        description="Number of forms listed per request.",
+    )
+
+
+class CacheConfig(BaseModel):
+    """Configuration for the form cache."""
+
+    ttl: float = Field(
+        30.0,
+        ge=0,
+        title="TTL",
+        description="Number of seconds a cached form is considered fresh for.",
+    )
+    capacity: int = Field(
+        1000,
+        gt=0,
+        title="Capacity",
+        description="Maximum number of cached forms.",
+    )
+    shared: bool = Field(
+        False,
+        title="Shared",
+        description="Whether to share cached forms between processes on the host.",
+    )
+    shared_path: str = Field(
+        "/dev/shm/surveys-api",
+        title="Shared Path",
+        description="Directory of the cache shared between processes on the host.",
+    )
+    remote_ttl: float = Field(
+        300.0,
+        ge=0,
+        title="Remote TTL",
+        description="Number of seconds a form is kept in the shared Redis cache.",
+    )
+    negative_ttl: float = Field(
+        10.0,
+        ge=0,
+        title="Negative TTL",
+        description="Number of seconds a form that was not found is remembered for.",
+    )
+    negative_capacity: int = Field(
+        10000,
+        gt=0,
+        title="Negative Capacity",
+        description="Maximum number of remembered forms that were not found.",
+    )
+    known: KnownFormsConfig = Field(
+        KnownFormsConfig(),
+        title="Known",
+        description="Configuration for the filter of known form ids.",
+    )
+    warmup: WarmupConfig = Field(
+        WarmupConfig(),
+        title="Warmup",
+        description="Configuration for the form cache warm-up.",
+    )
+    snapshot: SnapshotConfig = Field(
+        SnapshotConfig(),
+        title="Snapshot",
+        description="Configuration for the form cache snapshot.",
+    )
+
+
+class CompressionConfig(BaseModel):
+    """Configuration for response compression."""
+
+    encodings: list[Literal["zstd", "br", "gzip"]] = Field(
+        ["zstd", "br", "gzip"],
+        title="Encodings",
+        description="Encodings to use, in order of preference.",
+    )
+    minimum_size: int = Field(
+        512,
+        ge=0,
+        title="Minimum Size",
+        description="Minimum size in bytes of a response to be compressed.",
+    )
+
+
+class SerializationConfig(BaseModel):
+    """Configuration for serialization."""
+
+    codec: Literal["msgspec", "orjson"] = Field(
+        "msgspec",
+        title="Codec",
+        description="JSON codec to use for request and response bodies.",
+    )
+
+
+class AdmissionConfig(BaseModel):
+    """Configuration for admission control."""
+
+    enabled: bool = Field(
+        True,
+        title="Enabled",
+        description="Whether to reject requests early when the app is overloaded.",
+    )
+    read_limit: int = Field(
+        512,
+        gt=0,
+        title="Read Limit",
+        description="Maximum number of in-flight read requests.",
+    )
+    submit_limit: int = Field(
+        128,
+        gt=0,
+        title="Submit Limit",
+        description="Maximum number of in-flight submit requests.",
+    )
+    max_lag: float = Field(
+        0.25,
+        gt=0,
+        title="Max Lag",
+        description="Maximum event loop lag in seconds before requests are rejected.",
+    )
+    lag_interval: float = Field(
+        0.05,
+        gt=0,
+        title="Lag Interval",
+        description="Number of seconds between event loop lag measurements.",
+    )
+    retry_after: int = Field(
+        1,
+        ge=0,
+        title="Retry After",
+        description="Number of seconds after which rejected clients should retry.",
+    )
+
+
+class ResultsConfig(BaseModel):
+    """Configuration for columnar results snapshots."""
+
+    path: str = Field(
+        "/var/lib/surveys-api/results",
+        title="Path",
+        description="Directory of the snapshots.",
+    )
+    segment_size: int = Field(
+        10000,
+        gt=0,
+        title="Segment Size",
+        description="Maximum number of submissions written to one segment file.",
+    )
+    public: bool = Field(
+        False,
+        title="Public",
+        description="Whether aggregated results can be read without the admin token.",
+    )
+    refresh: float = Field(
+        5.0,
+        ge=0,
+        title="Refresh",
+        description="Number of seconds aggregated results can lag behind new submissions.",
+    )
+    bins: int = Field(
+        10,
+        gt=0,
+        title="Bins",
+        description="Number of histogram bins of number fields.",
+    )
+    max_bins: int = Field(
+        100,
+        gt=0,
+        title="Max Bins",
+        description="Maximum number of histogram bins of slider fields.",
+    )
+    tallies: Literal["off", "memory", "redis"] = Field(
+        "off",
+        title="Tallies",
+        description="Where running tallies updated on every submission are kept: nowhere, in the only server process or in Redis.",
+    )
+    accuracy: float = Field(
+        0.01,
+        gt=0,
+        lt=1,
+        title="Accuracy",
+        description="Maximum relative error of quantiles estimated from tallies.",
+    )
+    stream_tick: float = Field(
+        1.0,
+        gt=0,
+        title="Stream Tick",
+        description="Number of seconds between computations of streamed live results.",
+    )
+    stream_buffer: int = Field(
+        4,
+        gt=0,
+        title="Stream Buffer",
+        description="Maximum number of events buffered for a slow subscriber.",
+    )
+    stream_heartbeat: float = Field(
+        15.0,
+        gt=0,
+        title="Stream Heartbeat",
+        description="Number of seconds between heartbeats of idle live results streams.",
+    )
+    stream_limit: int = Field(
+        1000,
+        gt=0,
+        title="Stream Limit",
+        description="Maximum number of subscribers of live results per process.",
+    )
+
+
+class WorkersConfig(BaseModel):
+    """Configuration for the pool of workers running CPU-bound jobs."""
+
+    processes: int = Field(
+        0,
+        ge=0,
+        title="Processes",
+        description="Number of worker processes, 0 to run jobs in threads of each process.",
+    )
+    queue: int = Field(
+        16,
+        ge=0,
+        title="Queue",
+        description="Maximum number of jobs waiting for a worker process.",
+    )
+    timeout: float = Field(
+        60.0,
+        gt=0,
+        title="Timeout",
+        description="Maximum number of seconds a job can take.",
+    )
+    start_method: Literal["spawn", "forkserver"] = Field(
+        "spawn",
+        title="Start Method",
+        description="How worker processes are started.",
+    )
 
 
 class Config(BaseConfig):
@@ -60,3 +767,53 @@ class Config(BaseConfig):
         title="GraphQL",
         description="Configuration for the GraphQL service.",
     )
+    admin: AdminConfig = Field(
+        AdminConfig(),
+        title="Admin",
+        description="Configuration for the admin endpoints.",
+    )
+    redis: RedisConfig = Field(
+        RedisConfig(),
+        title="Redis",
+        description="Configuration for Redis.",
+    )
+    database: DatabaseConfig = Field(
+        DatabaseConfig(),
+        title="Database",
+        description="Configuration for reading forms from the database.",
+    )
+    submissions: SubmissionsConfig = Field(
+        SubmissionsConfig(),
+        title="Submissions",
+        description="Configuration for submissions.",
+    )
+    cache: CacheConfig = Field(
+        CacheConfig(),
+        title="Cache",
+        description="Configuration for the form cache.",
+    )
+    compression: CompressionConfig = Field(
+        CompressionConfig(),
+        title="Compression",
+        description="Configuration for response compression.",
+    )
+    serialization: SerializationConfig = Field(
+        SerializationConfig(),
+        title="Serialization",
+        description="Configuration for serialization.",
+    )
+    admission: AdmissionConfig = Field(
+        AdmissionConfig(),
+        title="Admission",
+        description="Configuration for admission control.",
+    )
+    results: ResultsConfig = Field(
+        ResultsConfig(),
+        title="Results",
+        description="Configuration for columnar results snapshots.",
+    )
+    workers: WorkersConfig = Field(
+        WorkersConfig(),
+        title="Workers",
+        description="Configuration for the pool of workers running CPU-bound jobs.",
+    )
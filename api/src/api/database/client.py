@@ -0,0 +1,220 @@
+import asyncio
+import json
+from time import monotonic
+from typing import Callable, Self
+
+import asyncpg
+from hashids import Hashids
+
+from api.database.errors import ConnectError, DatabaseError, NotFoundError
+from api.graphql.models import GetFormRequest, GetFormResponse
+
+
+class DatabaseClient:
+    """Reads forms directly from the database of the GraphQL service.
+
+    Forms are read with a single query that aggregates their fields and
+    options, which is prepared once per pooled connection. Rows are mapped to
+    the same models the GraphQL service returns, with IDs encoded the same way.
+
+    The pool is created on first use, so an unreachable database doesn't
+    block startup. After the database was unreachable, calls fail fast until
+    the backoff passes.
+
+    Args:
+        host: Host of the database.
+        port: Port of the database.
+        user: User of the database.
+        password: Password of the user.
+        name: Name of the database.
+        salt: Salt of the IDs of the GraphQL service.
+        min_length: Minimum length of the IDs of the GraphQL service.
+        pool_min: Minimum number of pooled connections.
+        pool_max: Maximum number of pooled connections.
+        timeout: Number of seconds to wait for the database.
+        backoff: Number of seconds to fail fast after the database was unreachable.
+        on_state: Called with whether the database is reachable when it changes.
+    """
+
+    FORM_QUERY = """
+        SELECT
+          form.title,
+          COALESCE(
+            json_agg(
+              json_build_object(
+                'id', field.id,
+                'idx', field.idx,
+                'type', field.type,
+                'title', field.title,
+                'description', field.description,
+                'required', field.required,
+                'defaultValue', field."defaultValue",
+                'options', (
+                  SELECT COALESCE(
+                    json_agg(
+                      json_build_object(
+                        'id', opt.id,
+                        'title', opt.title,
+                        'value', opt.value
+                      )
+                      ORDER BY opt.id
+                    ),
+                    '[]'
+                  )
+                  FROM form_field_option AS opt
+                  WHERE opt."fieldId" = field.id
+                )
+              )
+              ORDER BY field.idx, field.id
+            ) FILTER (WHERE field.id IS NOT NULL),
+            '[]'
+          ) AS fields
+        FROM form
+        LEFT JOIN form_field AS field ON field."formId" = form.id
+        WHERE form.id = $1
+        GROUP BY form.id
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        name: str,
+        salt: str,
+        min_length: int,
+        pool_min: int,
+        pool_max: int,
+        timeout: float,
+        backoff: float,
+        on_state: Callable[[bool], None] | None = None,
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._user = user
+        self._password = password
+        self._name = name
+        self._hashids = Hashids(salt=salt, min_length=min_length)
+        self._pool_min = pool_min
+        self._pool_max = pool_max
+        self._timeout = timeout
+        self._backoff = backoff
+        self._on_state = on_state
+        self._pool: asyncpg.Pool | None = None
+        self._lock = asyncio.Lock()
+        self._reachable: bool | None = None
+        self._failed: float | None = None
+
+    def _set_reachable(self, reachable: bool) -> None:
+        """Record whether the database is reachable."""
+
+        self._failed = None if reachable else monotonic()
+
+        if reachable == self._reachable:
+            return
+
+        self._reachable = reachable
+
+        if self._on_state is not None:
+            self._on_state(reachable)
+
+    def _check_backoff(self) -> None:
+        """Fail fast if the database was unreachable recently."""
+
+        if self._failed is not None and monotonic() - self._failed < self._backoff:
+            raise ConnectError("Database was unreachable recently.")
+
+    async def connect(self) -> None:
+        """Create the pool of connections if it doesn't exist yet."""
+
+        async with self._lock:
+            if self._pool is not None:
+                return
+
+            self._check_backoff()
+
+            try:
+                self._pool = await asyncpg.create_pool(
+                    host=self._host,
+                    port=self._port,
+                    user=self._user,
+                    password=self._password,
+                    database=self._name,
+                    min_size=self._pool_min,
+                    max_size=self._pool_max,
+                    timeout=self._timeout,
+                    command_timeout=self._timeout,
+                )
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+                self._set_reachable(False)
+                raise ConnectError(str(e)) from e
+
+            self._set_reachable(True)
+
+    async def close(self) -> None:
+        """Close the pool of connections."""
+
+        pool, self._pool = self._pool, None
+
+        if pool is not None:
+            await pool.close()
+
+    async def __aenter__(self) -> Self:
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    def _encode_id(self, id: int) -> str:
+        """Encode a row ID as an ID of the GraphQL service."""
+
+        return self._hashids.encode(id)
+
+    def _decode_id(self, id: str) -> int:
+        """Decode an ID of the GraphQL service to a row ID."""
+
+        ids = self._hashids.decode(id)
+
+        if len(ids) != 1:
+            raise NotFoundError("invalid id passed")
+
+        return ids[0]
+
+    def _parse_form_row(self, id: str, row: asyncpg.Record) -> GetFormResponse:
+        """Parse a row of a form into the model of the GraphQL service."""
+
+        fields = json.loads(row["fields"])
+
+        for field in fields:
+            field["id"] = self._encode_id(field["id"])
+
+            for option in field["options"]:
+                option["id"] = self._encode_id(option["id"])
+
+        return GetFormResponse.model_validate(
+            {"form": {"id": id, "title": row["title"], "fields": fields}}
+        )
+
+    async def get_form(self, request: GetFormRequest) -> GetFormResponse:
+        """Get a form with all attributes of its fields."""
+
+        id = self._decode_id(request.id)
+        await self.connect()
+        self._check_backoff()
+
+        try:
+            row = await self._pool.fetchrow(self.FORM_QUERY, id)
+        except asyncpg.PostgresError as e:
+            raise DatabaseError(str(e)) from e
+        except (OSError, asyncio.TimeoutError, asyncpg.InterfaceError) as e:
+            self._set_reachable(False)
+            raise ConnectError(str(e)) from e
+
+        self._set_reachable(True)
+
+        if row is None:
+            raise NotFoundError("invalid id passed")
+
+        return self._parse_form_row(request.id, row)
@@ -0,0 +1,24 @@
+class DatabaseError(Exception):
+    """Base class for database exceptions."""
+
+    def __init__(self, message: str | None = None) -> None:
+        self._message = message
+
+        args = (message,) if message else ()
+        super().__init__(*args)
+
+    @property
+    def message(self) -> str | None:
+        return self._message
+
+
+class ConnectError(DatabaseError):
+    """Raised when the database can't be reached."""
+
+    pass
+
+
+class NotFoundError(DatabaseError):
+    """Raised when the requested resource was not found in the database."""
+
+    pass
@@ -0,0 +1,130 @@
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Any
+
+import msgspec
+
+from api.models import data as dm
+
+
+class Exporter(ABC):
+    """Base class for formats of exported submissions.
+
+    Submitted values are flattened into columns, one per field of the form,
+    in the order of the form.
+
+    Args:
+        form: Form whose submissions are exported.
+    """
+
+    media_type: str
+    extension: str
+
+    def __init__(self, form: dm.Form) -> None:
+        self._form = form
+
+    @abstractmethod
+    def header(self) -> bytes:
+        """Encode the beginning of the export."""
+
+        pass
+
+    @abstractmethod
+    def rows(self, submissions: Sequence[dm.ExportedSubmission]) -> bytes:
+        """Encode submissions."""
+
+        pass
+
+
+class CsvExporter(Exporter):
+    """Exports submissions as CSV with a header row of field titles."""
+
+    media_type = "text/csv"
+    extension = "csv"
+
+    # Spreadsheets evaluate cells starting with these as formulas
+    FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+    def _write(self, rows: list[list[str]]) -> bytes:
+        """Write rows as CSV."""
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    def _escape(self, text: str) -> str:
+        """Keep spreadsheets from evaluating text as a formula."""
+
+        if text.startswith(self.FORMULA_PREFIXES):
+            return f"'{text}"
+
+        return text
+
+    def _format(self, value: Any) -> str:
+        """Format a submitted value as a cell."""
+
+        if value is None:
+            return ""
+
+        if isinstance(value, list):
+            return "; ".join(self._format(item) for item in value)
+
+        if not isinstance(value, str):
+            return json.dumps(value)
+
+        return self._escape(value)
+
+    def header(self) -> bytes:
+        return self._write(
+            [
+                ["Submission", "Created", "Last Modified", "Complete"]
+                + [self._escape(field.title) for field in self._form.fields]
+            ]
+        )
+
+    def rows(self, submissions: Sequence[dm.ExportedSubmission]) -> bytes:
+        return self._write(
+            [
+                [
+                    submission.id,
+                    submission.created,
+                    submission.last_modified or "",
+                    str(submission.complete),
+                ]
+                + [
+                    self._format(submission.fields.get(field.id))
+                    for field in self._form.fields
+                ]
+                for submission in submissions
+            ]
+        )
+
+
+class NdjsonExporter(Exporter):
+    """Exports submissions as newline delimited JSON objects."""
+
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def __init__(self, form: dm.Form) -> None:
+        super().__init__(form)
+        self._encoder = msgspec.json.Encoder()
+
+    def header(self) -> bytes:
+        return b""
+
+    def rows(self, submissions: Sequence[dm.ExportedSubmission]) -> bytes:
+        lines = []
+
+        for submission in submissions:
+            data = submission.model_dump(mode="json", by_alias=True)
+            data["fields"] = {
+                field.id: submission.fields.get(field.id) for field in self._form.fields
+            }
+            lines.append(self._encoder.encode(data))
+            lines.append(b"\n")
+
+        return b"".join(lines)
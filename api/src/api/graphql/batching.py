@@ -0,0 +1,195 @@
+import asyncio
+from typing import Any, Callable
+
+import httpx
+from gql.transport.exceptions import TransportClosed, TransportProtocolError
+from gql.transport.httpx import HTTPXAsyncTransport
+from graphql import DocumentNode, ExecutionResult
+
+
+class _Batch:
+    """Operations waiting to be sent together."""
+
+    def __init__(self, headers: dict[str, str] | None) -> None:
+        self.headers = headers
+        self.payloads: list[dict[str, Any]] = []
+        self.futures: list[asyncio.Future[ExecutionResult]] = []
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class BatchingHTTPXTransport(HTTPXAsyncTransport):
+    """HTTPX transport sending concurrent operations in batches.
+
+    Operations with the same headers, issued within a short window, are sent
+    in one request as a JSON array, and each result is routed back to its
+    caller. A batch is sent when the window ends or it is full. Batches of a
+    single operation are sent as plain requests.
+
+    Args:
+        url: URL of the GraphQL API.
+        window: Maximum number of seconds a batch is collected for.
+        size: Maximum number of operations in a batch.
+        on_batch: Called with the size of every sent batch.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        window: float,
+        size: int,
+        on_batch: Callable[[int], None] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(url=url, **kwargs)
+        self._window = window
+        self._size = size
+        self._on_batch = on_batch
+        self._batches: dict[tuple, _Batch] = {}
+        self._sending: set[asyncio.Task] = set()
+
+    async def execute(
+        self,
+        document: DocumentNode,
+        variable_values: dict[str, Any] | None = None,
+        operation_name: str | None = None,
+        extra_args: dict[str, Any] | None = None,
+        upload_files: bool = False,
+    ) -> ExecutionResult:
+        if not self.client:
+            raise TransportClosed("Transport is not connected")
+
+        post_args = self._prepare_request(
+            document, variable_values, operation_name, extra_args, upload_files
+        )
+        payload = post_args.pop("json", None)
+        headers = post_args.pop("headers", None)
+
+        if payload is None or post_args:
+            # Uploads and other request options can't be batched
+            return await super().execute(
+                document, variable_values, operation_name, extra_args, upload_files
+            )
+
+        key = tuple(sorted((headers or {}).items()))
+        batch = self._batches.get(key)
+
+        if batch is None:
+            batch = self._batches[key] = _Batch(headers)
+            loop = asyncio.get_running_loop()
+            batch.timer = loop.call_later(self._window, self._flush, key)
+
+        future = asyncio.get_running_loop().create_future()
+        batch.payloads.append(payload)
+        batch.futures.append(future)
+
+        if len(batch.payloads) >= self._size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: tuple) -> None:
+        """Start sending a batch."""
+
+        batch = self._batches.pop(key, None)
+
+        if batch is None:
+            return
+
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        task = asyncio.create_task(self._send(batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    def _prepare_results(
+        self, response: httpx.Response, count: int
+    ) -> list[ExecutionResult | Exception]:
+        """Split the answer to a batch into results of its operations."""
+
+        self.response_headers = response.headers
+
+        try:
+            results = response.json()
+        except ValueError:
+            self._raise_response_error(response, "Not a JSON answer")
+
+        if not isinstance(results, list) or len(results) != count:
+            self._raise_response_error(response, "Answer does not match the batch")
+
+        prepared: list[ExecutionResult | Exception] = []
+
+        for result in results:
+            if not isinstance(result, dict) or not {"data", "errors"} & result.keys():
+                prepared.append(
+                    TransportProtocolError(
+                        'Server did not return a GraphQL result: No "data" or "errors" keys in answer'
+                    )
+                )
+                continue
+
+            prepared.append(
+                ExecutionResult(
+                    errors=result.get("errors"),
+                    data=result.get("data"),
+                    extensions=result.get("extensions"),
+                )
+            )
+
+        return prepared
+
+    async def _post(self, batch: _Batch) -> list[ExecutionResult | Exception]:
+        """Send a batch and get results of its operations."""
+
+        if len(batch.payloads) == 1:
+            response = await self.client.post(
+                self.url, json=batch.payloads[0], headers=batch.headers
+            )
+            return [self._prepare_result(response)]
+
+        response = await self.client.post(
+            self.url, json=batch.payloads, headers=batch.headers
+        )
+        return self._prepare_results(response, len(batch.payloads))
+
+    async def _send(self, batch: _Batch) -> None:
+        """Send a batch and route results back to the callers."""
+
+        # Callers that gave up before the batch was sent are left out
+        pending = [
+            (payload, future)
+            for payload, future in zip(batch.payloads, batch.futures)
+            if not future.done()
+        ]
+
+        if not pending:
+            return
+
+        batch.payloads = [payload for payload, _ in pending]
+        batch.futures = [future for _, future in pending]
+
+        if self._on_batch is not None:
+            self._on_batch(len(pending))
+
+        try:
+            results = await self._post(batch)
+        except Exception as e:
+            results = [e] * len(batch.futures)
+
+        for future, result in zip(batch.futures, results):
+            if future.done():
+                continue
+
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Send waiting batches and close the connection."""
+
+        for key in list(self._batches):
+            self._flush(key)
+
+        await asyncio.gather(*self._sending, return_exceptions=True)
+        await super().close()
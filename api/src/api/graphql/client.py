@@ -1,14 +1,21 @@
+import asyncio
+import random
+from hashlib import blake2b
+from time import monotonic
 from typing import Awaitable, Callable, Self, TypeVar
 
+import httpx
 from fifolock import FifoLock
 from gql import Client, gql
 from gql.transport.exceptions import TransportError, TransportQueryError
 from gql.transport.httpx import HTTPXAsyncTransport
 from graphql import DocumentNode
 
+from api.graphql.batching import BatchingHTTPXTransport
 from api.graphql.errors import (
     ConnectError,
     ForbiddenError,
+    GraphQLError,
     InternalServerError,
     NotFoundError,
     UnkownError,
@@ -20,6 +27,8 @@ from api.graphql.models import (
     GetFormResponse,
     ListFormsRequest,
     ListFormsResponse,
+    ListSubmissionsRequest,
+    ListSubmissionsResponse,
     LoginRequest,
     LoginResponse,
     StartSubmissionRequest,
@@ -28,24 +37,60 @@ from api.graphql.models import (
     SubmitFieldResponse,
     Tokens,
 )
+from api.graphql.scheduler import Scheduler
+from api.graphql.tokens import TokenStore
 from api.locks import Read, Write
 
 T = TypeVar("T")
 
 
 class GraphQLRawClient:
-    """GraphQL raw client."""
-
-    def __init__(self, url: str) -> None:
-        self._client = Client(
-            transport=HTTPXAsyncTransport(url=url),
+    """GraphQL raw client.
+
+    Args:
+        url: URL of the GraphQL API.
+        retry: Whether to retry calls that failed because of transport errors.
+        batch_size: Maximum number of concurrent operations sent in one request.
+        batch_window: Maximum number of seconds a batch is collected for.
+        on_batch: Called with the size of every sent batch.
+    """
+
+    # Selections of optional attributes of form fields, by their names
+    FORM_FIELD_ATTRIBUTES = {
+        "title": "title",
+        "description": "description",
+        "required": "required",
+        "defaultValue": "defaultValue",
+        "options": "options { id title value }",
+    }
+
+    def __init__(
+        self,
+        url: str,
+        retry: bool = True,
+        batch_size: int = 1,
+        batch_window: float = 0.0,
+        on_batch: Callable[[int], None] | None = None,
+    ) -> None:
+        transport = (
+            BatchingHTTPXTransport(
+                url=url, window=batch_window, size=batch_size, on_batch=on_batch
+            )
+            if batch_size > 1
+            else HTTPXAsyncTransport(url=url)
         )
+        self._client = Client(transport=transport)
+        self._retry = retry
+        # Parsed form queries, by selection, so each shape is parsed once
+        self._form_queries: dict[frozenset[str] | None, DocumentNode] = {}
 
     async def connect(self) -> None:
         """Connect to the GraphQL API."""
 
         try:
-            await self._client.connect_async(reconnecting=True)
+            await self._client.connect_async(
+                reconnecting=True, retry_execute=self._retry
+            )
         except TransportError as e:
             raise ConnectError() from e
 
@@ -105,7 +150,7 @@ class GraphQLRawClient:
                 raise InternalServerError(message) from e
 
             raise UnkownError(message) from e
-        except TransportError as e:
+        except (TransportError, httpx.TransportError) as e:
             raise ConnectError() from e
 
     def _get_login_query(self) -> DocumentNode:
@@ -191,10 +236,22 @@ class GraphQLRawClient:
         response = await self._execute(query, variables, headers)
         return self._parse_list_forms_response(response)
 
-    def _get_form_query(self) -> DocumentNode:
-        """Get the form query."""
+    def _get_form_query(self, selection: frozenset[str] | None) -> DocumentNode:
+        """Get the form query selecting some attributes of fields, all if not set."""
 
-        return gql(
+        query = self._form_queries.get(selection)
+
+        if query is not None:
+            return query
+
+        attributes = self.FORM_FIELD_ATTRIBUTES
+
+        if selection is not None:
+            attributes = {
+                name: text for name, text in attributes.items() if name in selection
+            }
+
+        query = gql(
             """
             query getFormById($id: ID!) {
               form: getFormById(id: $id) {
@@ -203,21 +260,16 @@ class GraphQLRawClient:
                 fields {
                   id
                   idx
-                  title
                   type
-                  description
-                  required
-                  defaultValue
-                  options {
-                    id
-                    title
-                    value
-                  }
+                  %s
                 }
               }
             }
             """
+            % "\n".join(attributes.values())
         )
+        self._form_queries[selection] = query
+        return query
 
     def _build_form_variables(self, request: GetFormRequest) -> dict:
         """Build the form variables."""
@@ -234,7 +286,7 @@ class GraphQLRawClient:
     ) -> GetFormResponse:
         """Get a form."""
 
-        query = self._get_form_query()
+        query = self._get_form_query(request.selection)
         variables = self._build_form_variables(request)
         headers = self._build_authentication_headers(tokens)
         response = await self._execute(query, variables, headers)
@@ -353,30 +405,275 @@ class GraphQLRawClient:
         response = await self._execute(query, variables, headers)
         return self._parse_finish_submission_response(response)
 
+    def _get_list_submissions_query(self) -> DocumentNode:
+        """Get the list submissions query."""
 
-class GraphQLClient:
-    """GraphQL client with autologin."""
+        return gql(
+            """
+            query listSubmissions($form: ID!, $start: Int, $limit: Int) {
+              pager: listSubmissions(form: $form, start: $start, limit: $limit) {
+                entries {
+                  id
+                  created
+                  lastModified
+                  percentageComplete
+                  fields {
+                    id
+                    value
+                    field {
+                      id
+                    }
+                  }
+                }
+                total
+                limit
+                start
+              }
+            }
+            """
+        )
+
+    def _build_list_submissions_variables(
+        self, request: ListSubmissionsRequest
+    ) -> dict:
+        """Build the list submissions variables."""
+
+        variables = request.model_dump(mode="json")
+
+        if request.start is None:
+            variables.pop("start")
+
+        if request.limit is None:
+            variables.pop("limit")
+
+        return variables
+
+    def _parse_list_submissions_response(
+        self, response: dict
+    ) -> ListSubmissionsResponse:
+        """Parse the list submissions response."""
 
-    def __init__(self, url: str, login: LoginRequest) -> None:
-        self._client = GraphQLRawClient(url=url)
+        return ListSubmissionsResponse.model_validate(response)
+
+    async def list_submissions(
+        self, request: ListSubmissionsRequest, tokens: Tokens
+    ) -> ListSubmissionsResponse:
+        """List submissions of a form."""
+
+        query = self._get_list_submissions_query()
+        variables = self._build_list_submissions_variables(request)
+        headers = self._build_authentication_headers(tokens)
+        response = await self._execute(query, variables, headers)
+        return self._parse_list_submissions_response(response)
+
+
+class GraphQLReplica:
+    """Replica of the GraphQL API with its own connection and tokens.
+
+    Replicas that fail to connect are ejected for a while, with the ejection
+    time doubling on consecutive failures, and then gradually re-admitted.
+    With a token store, tokens are shared with other processes, so only one
+    of them logs in at a time.
+
+    Args:
+        url: URL of the replica.
+        login: Login request.
+        store: Store of tokens shared between processes.
+        retry: Whether to retry calls that failed because of transport errors.
+        ejection: Number of seconds a replica is ejected for after a failure.
+        ejection_max: Maximum number of seconds a replica is ejected for.
+        readmission: Number of seconds over which a replica regains its full weight.
+        batch_size: Maximum number of concurrent operations sent in one request.
+        batch_window: Maximum number of seconds a batch is collected for.
+        on_batch: Called with the size of every sent batch.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        login: LoginRequest,
+        store: TokenStore | None,
+        retry: bool,
+        ejection: float,
+        ejection_max: float,
+        readmission: float,
+        batch_size: int = 1,
+        batch_window: float = 0.0,
+        on_batch: Callable[[int], None] | None = None,
+    ) -> None:
+        self._client = GraphQLRawClient(
+            url=url,
+            retry=retry,
+            batch_size=batch_size,
+            batch_window=batch_window,
+            on_batch=on_batch,
+        )
         self._login_request = login
+        self._store = store
+        self._store_key = blake2b(
+            f"{url}:{login.username}".encode(), digest_size=8
+        ).hexdigest()
+        self._ejection = ejection
+        self._ejection_max = ejection_max
+        self._readmission = readmission
         self._tokens = None
         self._lock = FifoLock()
+        self._failures = 0
+        self._ejected_until = 0.0
+        self.outstanding = 0
+
+    @property
+    def logged_in(self) -> bool:
+        return self._tokens is not None
 
     async def connect(self) -> None:
-        """Connect to the GraphQL API."""
+        """Connect to the replica."""
 
         async with self._lock(Write):
             await self._client.connect()
-            await self._login()
 
     async def close(self) -> None:
-        """Close the connection to the GraphQL API."""
+        """Close the connection to the replica."""
 
         async with self._lock(Write):
             self._tokens = None
             await self._client.close()
 
+    async def _fetch_tokens(self) -> Tokens:
+        """Login to the replica and return new tokens."""
+
+        response = await self._client.login(self._login_request)
+        return response.tokens
+
+    async def _login(self) -> None:
+        """Login to the replica or reuse tokens from another process."""
+
+        if self._store is None:
+            self._tokens = await self._fetch_tokens()
+            return
+
+        self._tokens = await self._store.fetch(
+            self._store_key, self._tokens, self._fetch_tokens
+        )
+
+    async def login(self) -> None:
+        """Login to the replica."""
+
+        async with self._lock(Write):
+            await self._login()
+
+    async def _get_tokens(self) -> Tokens:
+        """Get authentication tokens, logging in if necessary."""
+
+        if self._tokens is None:
+            async with self._lock(Write):
+                if self._tokens is None:
+                    await self._login()
+
+        return self._tokens
+
+    def is_ejected(self, now: float) -> bool:
+        """Check if the replica is ejected."""
+
+        return now < self._ejected_until
+
+    def weight(self, now: float) -> float:
+        """Get weight of the replica, growing after re-admission."""
+
+        if self._failures == 0 or self._readmission <= 0:
+            return 1.0
+
+        elapsed = now - self._ejected_until
+        return min(max(elapsed / self._readmission, 0.1), 1.0)
+
+    def eject(self, now: float) -> None:
+        """Eject the replica after a failure."""
+
+        if self.is_ejected(now):
+            # Failures of operations started before the ejection don't count
+            return
+
+        delay = min(self._ejection * 2**self._failures, self._ejection_max)
+        self._failures += 1
+        self._ejected_until = now + delay
+
+    def recover(self, now: float) -> None:
+        """Reset failures once the replica regained its full weight."""
+
+        if self._failures and self.weight(now) >= 1.0:
+            self._failures = 0
+
+    async def execute(
+        self, func: Callable[[GraphQLRawClient, Tokens], Awaitable[T]]
+    ) -> T:
+        """Execute a GraphQL API call and login if necessary."""
+
+        async def _execute() -> T:
+            tokens = await self._get_tokens()
+
+            async with self._lock(Read):
+                return await func(self._client, tokens)
+
+        try:
+            return await _execute()
+        except ForbiddenError:
+            async with self._lock(Write):
+                await self._login()
+
+            return await _execute()
+
+
+class GraphQLClient:
+    """GraphQL client with autologin, balancing operations across replicas.
+
+    Operations are scheduled by class: "read" for forms, "start" for starting
+    submissions, "submission" for writing to started submissions and "export"
+    for reading submissions.
+    Each operation goes to the available replica with the least outstanding
+    operations relative to its weight.
+    """
+
+    def __init__(self, replicas: list[GraphQLReplica], scheduler: Scheduler) -> None:
+        self._replicas = replicas
+        self._scheduler = scheduler
+
+    async def _gather(self, func: Callable[[GraphQLReplica], Awaitable[None]]) -> None:
+        """Run a call on all replicas and eject the unreachable ones.
+
+        Raises the first error only if the call failed on all replicas.
+        """
+
+        results = await asyncio.gather(
+            *(func(replica) for replica in self._replicas), return_exceptions=True
+        )
+        now = monotonic()
+
+        for replica, result in zip(self._replicas, results):
+            if isinstance(result, ConnectError):
+                replica.eject(now)
+
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(
+                result, GraphQLError
+            ):
+                raise result
+
+        if all(isinstance(result, GraphQLError) for result in results):
+            raise results[0]
+
+    async def connect(self, login: bool = True) -> None:
+        """Connect to the GraphQL API and optionally login."""
+
+        await self._gather(lambda replica: replica.connect())
+
+        if login:
+            await self.login()
+
+    async def close(self) -> None:
+        """Close the connection to the GraphQL API."""
+
+        await asyncio.gather(*(replica.close() for replica in self._replicas))
+
     async def __aenter__(self) -> Self:
         await self.connect()
         return self
@@ -384,78 +681,130 @@ class GraphQLClient:
     async def __aexit__(self, *_) -> None:
         await self.close()
 
-    async def _login(self) -> None:
-        """Login to the GraphQL API."""
+    async def login(self) -> None:
+        """Login to all replicas that are not logged in yet."""
 
-        response = await self._client.login(self._login_request)
-        self._tokens = response.tokens
+        async def _login(replica: GraphQLReplica) -> None:
+            if not replica.logged_in:
+                await replica.login()
+
+        await self._gather(_login)
+
+    def _choose(self) -> GraphQLReplica:
+        """Choose the replica with the least outstanding operations."""
+
+        now = monotonic()
+        available = [r for r in self._replicas if not r.is_ejected(now)]
+
+        if not available:
+            # Fail open, so operations keep probing the replicas
+            available = self._replicas
 
-    async def _try_execute(self, func: Callable[..., Awaitable[T]], **kwargs) -> T:
-        """Try to execute a GraphQL API call and login if necessary."""
+        return min(
+            available,
+            key=lambda r: ((r.outstanding + 1) / r.weight(now), random.random()),
+        )
+
+    async def _execute_on_replica(
+        self, func: Callable[[GraphQLRawClient, Tokens], Awaitable[T]]
+    ) -> T:
+        """Execute a GraphQL API call on a chosen replica."""
+
+        replica = self._choose()
+        replica.outstanding += 1
 
         try:
-            return await func(**kwargs)
-        except ForbiddenError:
-            async with self._lock(Write):
-                await self._login()
+            result = await replica.execute(func)
+        except ConnectError:
+            replica.eject(monotonic())
+            raise
+        finally:
+            replica.outstanding -= 1
+
+        replica.recover(monotonic())
+        return result
+
+    async def _execute(
+        self,
+        kind: str,
+        func: Callable[[GraphQLRawClient, Tokens], Awaitable[T]],
+        failover: bool = False,
+    ) -> T:
+        """Execute a GraphQL API call in a scheduled slot.
+
+        Calls that are safe to repeat can fail over to another replica once.
+        """
+
+        async with self._scheduler.slot(kind):
+            if not failover or len(self._replicas) == 1:
+                return await self._execute_on_replica(func)
 
-            return await func(**kwargs)
+            try:
+                return await self._execute_on_replica(func)
+            except ConnectError:
+                return await self._execute_on_replica(func)
 
     async def list_forms(
         self, request: ListFormsRequest | None = None
     ) -> ListFormsResponse:
         """List forms."""
 
-        async def _list_forms() -> ListFormsResponse:
-            async with self._lock(Read):
-                return await self._client.list_forms(
-                    request=request, tokens=self._tokens
-                )
-
-        return await self._try_execute(_list_forms)
+        return await self._execute(
+            "read",
+            lambda client, tokens: client.list_forms(request=request, tokens=tokens),
+            failover=True,
+        )
 
     async def get_form(self, request: GetFormRequest) -> GetFormResponse:
         """Get a form."""
 
-        async def _get_form() -> GetFormResponse:
-            async with self._lock(Read):
-                return await self._client.get_form(request=request, tokens=self._tokens)
+        return await self._execute(
+            "read",
+            lambda client, tokens: client.get_form(request=request, tokens=tokens),
+            failover=True,
+        )
 
-        return await self._try_execute(_get_form)
+    async def list_submissions(
+        self, request: ListSubmissionsRequest
+    ) -> ListSubmissionsResponse:
+        """List submissions of a form."""
+
+        return await self._execute(
+            "export",
+            lambda client, tokens: client.list_submissions(
+                request=request, tokens=tokens
+            ),
+            failover=True,
+        )
 
     async def start_submission(
         self, request: StartSubmissionRequest
     ) -> StartSubmissionResponse:
         """Start a submission."""
 
-        async def _start_submission() -> StartSubmissionResponse:
-            async with self._lock(Read):
-                return await self._client.start_submission(
-                    request=request, tokens=self._tokens
-                )
-
-        return await self._try_execute(_start_submission)
+        return await self._execute(
+            "start",
+            lambda client, tokens: client.start_submission(
+                request=request, tokens=tokens
+            ),
+        )
 
     async def submit_field(self, request: SubmitFieldRequest) -> SubmitFieldResponse:
         """Submit a field."""
 
-        async def _submit_field() -> SubmitFieldResponse:
-            async with self._lock(Read):
-                return await self._client.submit_field(
-                    request=request, tokens=self._tokens
-                )
-
-        return await self._try_execute(_submit_field)
+        return await self._execute(
+            "submission",
+            lambda client, tokens: client.submit_field(request=request, tokens=tokens),
+        )
 
     async def finish_submission(
         self, request: FinishSubmissionRequest
     ) -> FinishSubmissionResponse:
         """Finish a submission."""
 
-        async def _finish_submission() -> FinishSubmissionResponse:
-            async with self._lock(Read):
-                return await self._client.finish_submission(
-                    request=request, tokens=self._tokens
-                )
-
-        return await self._try_execute(_finish_submission)
+        return await self._execute(
+            "submission",
+            lambda client, tokens: client.finish_submission(
+                request=request, tokens=tokens
+            ),
+        )
@@ -125,6 +125,12 @@ class GetFormRequest(BaseModel):
         title="Form ID",
         description="ID of the form.",
     )
+    selection: frozenset[str] | None = Field(
+        None,
+        exclude=True,
+        title="Selection",
+        description="Attributes of the fields to fetch besides their ID, index and type, all if not set.",
+    )
 
 
 class FormFieldOption(BaseModel):
@@ -148,7 +154,10 @@ class FormFieldOption(BaseModel):
 
 
 class FormField(BaseModel):
-    """Form field."""
+    """Form field.
+
+    Attributes other than the ID, index and type can be left out of the selection.
+    """
 
     id: str = Field(
         ...,
@@ -161,7 +170,7 @@ class FormField(BaseModel):
         description="Index of the field.",
     )
     title: str = Field(
-        ...,
+        "",
         title="Field Title",
         description="Title of the field.",
     )
@@ -171,22 +180,22 @@ class FormField(BaseModel):
         description="Type of the field.",
     )
     description: str = Field(
-        ...,
+        "",
         title="Field Description",
         description="Description of the field.",
     )
     required: bool = Field(
-        ...,
+        False,
         title="Field Required",
         description="Whether the field is required.",
     )
     default_value: str | None = Field(
-        ...,
+        None,
         title="Field Default Value",
         description="Default value of the field.",
     )
     options: list[FormFieldOption] = Field(
-        ...,
+        [],
         title="Field Options",
         description="Options of the field.",
     )
@@ -355,3 +364,118 @@ class FinishSubmissionResponse(BaseModel):
         title="Submission",
         description="Submission.",
     )
+
+
+class ListSubmissionsRequest(BaseModel):
+    """List submissions request."""
+
+    form: str = Field(
+        ...,
+        title="Form ID",
+        description="ID of the form.",
+    )
+    limit: int | None = Field(
+        None,
+        title="Submission Pager Query Limit",
+        description="Number of submissions per page.",
+    )
+    start: int | None = Field(
+        None,
+        title="Submission Pager Query Start",
+        description="Offset of the first submission in the page.",
+    )
+
+
+class SubmissionFieldReference(BaseModel):
+    """Reference to the form field of a submitted value."""
+
+    id: str = Field(
+        ...,
+        title="Form Field ID",
+        description="ID of the form field.",
+    )
+
+
+class SubmissionField(BaseModel):
+    """Submitted value of a form field."""
+
+    id: str = Field(
+        ...,
+        title="Submission Field ID",
+        description="ID of the submitted value.",
+    )
+    value: str | None = Field(
+        None,
+        title="Submission Field Value",
+        description="JSON encoded submitted value.",
+    )
+    field: SubmissionFieldReference | None = Field(
+        None,
+        title="Submission Field Form Field",
+        description="Form field of the submitted value.",
+    )
+
+
+class SubmissionPagerEntry(BaseModel):
+    """Submission pager entry."""
+
+    id: str = Field(
+        ...,
+        title="Submission ID",
+        description="ID of the submission.",
+    )
+    created: str = Field(
+        ...,
+        title="Submission Created",
+        description="Time the submission was created.",
+    )
+    last_modified: str | None = Field(
+        None,
+        title="Submission Last Modified",
+        description="Time the submission was last modified.",
+    )
+    percentage_complete: float = Field(
+        ...,
+        title="Submission Percentage Complete",
+        description="Percentage of the submission that is complete.",
+    )
+    fields: list[SubmissionField] = Field(
+        ...,
+        title="Submission Fields",
+        description="Submitted values.",
+    )
+
+
+class SubmissionPager(BaseModel):
+    """Submission pager."""
+
+    entries: list[SubmissionPagerEntry] = Field(
+        ...,
+        title="Submission Pager Entries",
+        description="Entries of the submission pager.",
+    )
+    total: int = Field(
+        ...,
+        title="Submission Pager Total",
+        description="Total number of submissions.",
+    )
+    limit: int = Field(
+        ...,
+        title="Submission Pager Limit",
+        description="Number of submissions per page.",
+    )
+    start: int = Field(
+        ...,
+        title="Submission Pager Start",
+        description="Offset of the first submission in the page.",
+    )
+
+
+class ListSubmissionsResponse(BaseModel):
+    """List submissions response."""
+
+    pager: SubmissionPager = Field(
+        ...,
+        title="Submission Pager",
+        description="Submission pager.",
+    )
@@ -0,0 +1,137 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import Callable, NamedTuple
+
+from pydantic import BaseModel, Field
+
+
+class SchedulingClass(BaseModel):
+    """Class of scheduled operations."""
+
+    weight: float = Field(
+        ...,
+        title="SchedulingClass.Weight",
+        description="Share of the slots relative to other classes.",
+    )
+    concurrency: int = Field(
+        ...,
+        title="SchedulingClass.Concurrency",
+        description="Maximum number of operations of the class running at the same time.",
+    )
+
+
+class _Entry(NamedTuple):
+    tag: float
+    future: asyncio.Future
+    enqueued: float
+
+
+class Scheduler:
+    """Schedules operations with weighted fair queuing across classes.
+
+    Every waiting operation gets a virtual finish tag that grows slower for
+    classes with higher weights, and the operation with the lowest tag is
+    started first, as long as its class and the scheduler have free slots.
+
+    Args:
+        classes: Scheduling classes by name.
+        concurrency: Maximum number of operations running at the same time.
+        on_wait: Called with the class and the wait time of every started operation.
+    """
+
+    def __init__(
+        self,
+        classes: dict[str, SchedulingClass],
+        concurrency: int,
+        on_wait: Callable[[str, float], None] | None = None,
+    ) -> None:
+        self._classes = classes
+        self._concurrency = concurrency
+        self._on_wait = on_wait
+        self._queues: dict[str, deque[_Entry]] = {kind: deque() for kind in classes}
+        self._finish = {kind: 0.0 for kind in classes}
+        self._inflight = {kind: 0 for kind in classes}
+        self._running = 0
+        self._virtual = 0.0
+
+    def depth(self, kind: str) -> int:
+        """Get number of operations of a class waiting to start."""
+
+        return sum(not entry.future.done() for entry in self._queues[kind])
+
+    def _head(self, kind: str) -> _Entry | None:
+        """Get the first operation of a class still waiting to start."""
+
+        queue = self._queues[kind]
+
+        while queue and queue[0].future.done():
+            queue.popleft()
+
+        return queue[0] if queue else None
+
+    def _dispatch(self) -> None:
+        """Start waiting operations while there are free slots."""
+
+        while self._running < self._concurrency:
+            best = None
+
+            for kind, scheduling in self._classes.items():
+                if self._inflight[kind] >= scheduling.concurrency:
+                    continue
+
+                entry = self._head(kind)
+
+                if entry is not None and (best is None or entry.tag < best[1].tag):
+                    best = (kind, entry)
+
+            if best is None:
+                return
+
+            kind, entry = best
+            self._queues[kind].popleft()
+            self._virtual = entry.tag
+            self._inflight[kind] += 1
+            self._running += 1
+            entry.future.set_result(None)
+
+            if self._on_wait is not None:
+                self._on_wait(kind, monotonic() - entry.enqueued)
+
+    def _release(self, kind: str) -> None:
+        """Free the slot of a finished operation."""
+
+        self._inflight[kind] -= 1
+        self._running -= 1
+        self._dispatch()
+
+    async def _acquire(self, kind: str) -> None:
+        """Wait until an operation of a class can start."""
+
+        tag = max(self._virtual, self._finish[kind]) + 1 / self._classes[kind].weight
+        self._finish[kind] = tag
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues[kind].append(_Entry(tag=tag, future=future, enqueued=monotonic()))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot might have been granted just before cancellation
+            if future.done() and not future.cancelled():
+                self._release(kind)
+            raise
+
+    @asynccontextmanager
+    async def slot(self, kind: str) -> AsyncIterator[None]:
+        """Run an operation of a class in a scheduled slot."""
+
+        await self._acquire(kind)
+
+        try:
+            yield
+        finally:
+            self._release(kind)
@@ -0,0 +1,226 @@
+import asyncio
+import fcntl
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import monotonic
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from api.graphql.models import Tokens
+
+
+class TokenStore(ABC):
+    """Base class for stores of authentication tokens shared between processes.
+
+    Only the process holding the lease of a key logs in, others wait for the
+    tokens it stores. Leases expire, so a stuck or dead holder doesn't block
+    the others forever.
+
+    Args:
+        lease: Number of seconds a lease is held for at most.
+        poll: Number of seconds between checks for tokens stored by the holder.
+    """
+
+    def __init__(self, lease: float, poll: float) -> None:
+        self._lease = lease
+        self._poll = poll
+
+    @abstractmethod
+    async def _read(self, key: str) -> Tokens | None:
+        """Read stored tokens."""
+
+        pass
+
+    @abstractmethod
+    async def _write(self, key: str, tokens: Tokens) -> None:
+        """Store tokens."""
+
+        pass
+
+    @abstractmethod
+    async def _acquire(self, key: str) -> str | None:
+        """Try to acquire the lease and return its handle."""
+
+        pass
+
+    @abstractmethod
+    async def _release(self, key: str, handle: str) -> None:
+        """Release the lease."""
+
+        pass
+
+    async def fetch(
+        self,
+        key: str,
+        stale: Tokens | None,
+        login: Callable[[], Awaitable[Tokens]],
+    ) -> Tokens:
+        """Get tokens other than the stale ones, logging in only if no one else does."""
+
+        deadline = monotonic() + self._lease
+
+        while True:
+            tokens = await self._read(key)
+
+            if tokens is not None and tokens != stale:
+                return tokens
+
+            handle = await self._acquire(key)
+
+            if handle is not None:
+                try:
+                    # Someone might have stored tokens before the lease was acquired
+                    tokens = await self._read(key)
+
+                    if tokens is not None and tokens != stale:
+                        return tokens
+
+                    tokens = await login()
+                    await self._write(key, tokens)
+                    return tokens
+                finally:
+                    await self._release(key, handle)
+
+            if monotonic() >= deadline:
+                return await login()
+
+            await asyncio.sleep(self._poll)
+
+
+class FileTokenStore(TokenStore):
+    """Store of tokens in files, shared by processes on one host.
+
+    Leases are file locks, which are released when their holder exits.
+
+    Args:
+        path: Directory of the store.
+        lease: Number of seconds a lease is held for at most.
+        poll: Number of seconds between checks for tokens stored by the holder.
+    """
+
+    def __init__(self, path: str, lease: float, poll: float) -> None:
+        super().__init__(lease, poll)
+        self._path = Path(path)
+        self._locks: dict[str, int] = {}
+
+    async def _read(self, key: str) -> Tokens | None:
+        try:
+            return Tokens.model_validate_json((self._path / f"{key}.json").read_bytes())
+        except (OSError, ValidationError):
+            return None
+
+    async def _write(self, key: str, tokens: Tokens) -> None:
+        try:
+            self._path.mkdir(parents=True, exist_ok=True)
+
+            with NamedTemporaryFile(dir=self._path, delete=False) as file:
+                file.write(tokens.model_dump_json().encode())
+
+            os.replace(file.name, self._path / f"{key}.json")
+        except OSError:
+            pass
+
+    async def _acquire(self, key: str) -> str | None:
+        if key in self._locks:
+            return None
+
+        try:
+            self._path.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self._path / f"{key}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            # Without a usable store, every process is on its own
+            return key
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+
+        self._locks[key] = fd
+        return key
+
+    async def _release(self, key: str, handle: str) -> None:
+        fd = self._locks.pop(key, None)
+
+        if fd is not None:
+            os.close(fd)
+
+
+class RedisTokenStore(TokenStore):
+    """Store of tokens in Redis, shared by instances.
+
+    When Redis fails, every process logs in on its own.
+
+    Args:
+        redis: Redis client.
+        prefix: Prefix of the keys.
+        lease: Number of seconds a lease is held for at most.
+        poll: Number of seconds between checks for tokens stored by the holder.
+    """
+
+    # Delete the lease only if it is still held by the caller
+    RELEASE = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return redis.call("del", KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, redis: Redis, prefix: str, lease: float, poll: float) -> None:
+        super().__init__(lease, poll)
+        self._redis = redis
+        self._prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:tokens:{key}"
+
+    def _lease_key(self, key: str) -> str:
+        return f"{self._prefix}:tokens:{key}:lease"
+
+    async def _read(self, key: str) -> Tokens | None:
+        try:
+            data = await self._redis.get(self._key(key))
+        except RedisError:
+            return None
+
+        if data is None:
+            return None
+
+        try:
+            return Tokens.model_validate_json(data)
+        except ValidationError:
+            return None
+
+    async def _write(self, key: str, tokens: Tokens) -> None:
+        try:
+            await self._redis.set(self._key(key), tokens.model_dump_json())
+        except RedisError:
+            pass
+
+    async def _acquire(self, key: str) -> str | None:
+        handle = uuid4().hex
+
+        try:
+            acquired = await self._redis.set(
+                self._lease_key(key),
+                handle,
+                nx=True,
+                px=int(self._lease * 1000),
+            )
+        except RedisError:
+            return handle
+
+        return handle if acquired else None
+
+    async def _release(self, key: str, handle: str) -> None:
+        try:
+            await self._redis.eval(self.RELEASE, 1, self._lease_key(key), handle)
+        except RedisError:
+            pass
@@ -0,0 +1,30 @@
+from collections.abc import Iterable
+
+
+class Health:
+    """Keeps track of the readiness of the components of the app.
+
+    Args:
+        components: Names of the components that need to be ready.
+        optional: Names of the components that are reported, but not needed.
+    """
+
+    def __init__(self, components: Iterable[str], optional: Iterable[str] = ()) -> None:
+        self._components = {component: False for component in components}
+        self._optional = {component: False for component in optional}
+
+    @property
+    def ready(self) -> bool:
+        return all(self._components.values())
+
+    @property
+    def components(self) -> dict[str, bool]:
+        return self._components | self._optional
+
+    def set_ready(self, component: str, ready: bool = True) -> None:
+        """Set readiness of a component."""
+
+        if component in self._optional:
+            self._optional[component] = ready
+        else:
+            self._components[component] = ready
@@ -0,0 +1,158 @@
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+
+class Metrics:
+    """Prometheus metrics of the app.
+
+    Every app has its own registry, so multiple apps can live in one process.
+    """
+
+    def __init__(self) -> None:
+        self.registry = CollectorRegistry()
+
+        self.warmup_duration = Gauge(
+            "api_warmup_duration_seconds",
+            "Duration of the form cache warm-up.",
+            registry=self.registry,
+        )
+        self.warmup_forms = Gauge(
+            "api_warmup_forms",
+            "Number of forms loaded into the cache during the warm-up.",
+            registry=self.registry,
+        )
+        self.warmup_failures = Gauge(
+            "api_warmup_failures",
+            "Number of forms that failed to load during the warm-up.",
+            registry=self.registry,
+        )
+
+        self.known_forms = Gauge(
+            "api_known_forms",
+            "Number of form ids in the filter of known forms.",
+            registry=self.registry,
+        )
+
+        self.admission_inflight = Gauge(
+            "api_admission_inflight_requests",
+            "Number of in-flight requests subject to admission.",
+            ["class", "route"],
+            registry=self.registry,
+        )
+        self.admission_rejected = Counter(
+            "api_admission_rejected_requests",
+            "Number of requests rejected by admission.",
+            ["class", "reason"],
+            registry=self.registry,
+        )
+        self.loop_lag = Gauge(
+            "api_event_loop_lag_seconds",
+            "Last measured lag of the event loop.",
+            registry=self.registry,
+        )
+
+        self.scheduler_queue_depth = Gauge(
+            "api_graphql_queue_depth",
+            "Number of GraphQL operations waiting to start.",
+            ["class"],
+            registry=self.registry,
+        )
+        self.scheduler_wait = Histogram(
+            "api_graphql_queue_wait_seconds",
+            "Time GraphQL operations waited to start.",
+            ["class"],
+            buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+            registry=self.registry,
+        )
+        self.graphql_batch_size = Histogram(
+            "api_graphql_batch_size",
+            "Number of GraphQL operations sent in one request.",
+            buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+            registry=self.registry,
+        )
+
+        self.stream_subscribers = Gauge(
+            "api_results_stream_subscribers",
+            "Number of clients subscribed to live results.",
+            registry=self.registry,
+        )
+        self.stream_computations = Counter(
+            "api_results_stream_computations",
+            "Number of times live results were computed for subscribers.",
+            registry=self.registry,
+        )
+        self.stream_dropped = Counter(
+            "api_results_stream_dropped_events",
+            "Number of live results events dropped for slow subscribers.",
+            registry=self.registry,
+        )
+
+        self.votes_received = Counter(
+            "api_votes_received",
+            "Number of votes received over WebSockets.",
+            ["result"],
+            registry=self.registry,
+        )
+        self.votes_submitted = Counter(
+            "api_votes_submitted",
+            "Number of votes submitted upstream.",
+            ["result"],
+            registry=self.registry,
+        )
+        self.votes_queue_depth = Gauge(
+            "api_votes_queue_depth",
+            "Number of acknowledged votes waiting to be submitted.",
+            registry=self.registry,
+        )
+        self.votes_batch_size = Histogram(
+            "api_votes_batch_size",
+            "Number of votes submitted in one batch.",
+            buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+            registry=self.registry,
+        )
+        self.votes_flush_duration = Histogram(
+            "api_votes_flush_duration_seconds",
+            "Time it took to submit a batch of votes.",
+            buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+            registry=self.registry,
+        )
+        self.votes_latency = Histogram(
+            "api_votes_latency_seconds",
+            "Time from receiving a vote to submitting it.",
+            buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+            registry=self.registry,
+        )
+
+        self.worker_waiting = Gauge(
+            "api_worker_waiting_jobs",
+            "Number of CPU-bound jobs waiting for a worker.",
+            registry=self.registry,
+        )
+        self.worker_running = Gauge(
+            "api_worker_running_jobs",
+            "Number of running CPU-bound jobs.",
+            registry=self.registry,
+        )
+        self.worker_jobs = Counter(
+            "api_worker_jobs",
+            "Number of CPU-bound jobs by result.",
+            ["job", "result"],
+            registry=self.registry,
+        )
+        self.worker_duration = Histogram(
+            "api_worker_job_duration_seconds",
+            "Time CPU-bound jobs took to run.",
+            ["job"],
+            buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+            registry=self.registry,
+        )
+
+    def render(self) -> bytes:
+        """Render metrics in the Prometheus text format."""
+
+        return generate_latest(self.registry)
@@ -618,6 +618,21 @@ class Submission(SerializableModel):
             raise ValueError("fields must be a valid JSON") from e  # noqa: TRY003
 
 
+class SubmissionResume(SerializableModel):
+    """Data needed to resume an unfinished submission."""
+
+    submission: str = Field(
+        ...,
+        title="SubmissionResume.Submission",
+        description="ID of the unfinished submission.",
+    )
+    token: str = Field(
+        ...,
+        title="SubmissionResume.Token",
+        description="Token of the unfinished submission.",
+    )
+
+
 class SubmissionConfirmation(SerializableModel):
     """Submission confirmation data."""
 
@@ -626,3 +641,273 @@ class SubmissionConfirmation(SerializableModel):
         title="SubmissionConfirmation.ID",
         description="ID of the submission.",
     )
+
+
+class ExportedSubmission(SerializableModel):
+    """Exported submission data."""
+
+    id: str = Field(
+        ...,
+        title="ExportedSubmission.ID",
+        description="ID of the submission.",
+    )
+    created: str = Field(
+        ...,
+        title="ExportedSubmission.Created",
+        description="Time the submission was created.",
+    )
+    last_modified: str | None = Field(
+        None,
+        title="ExportedSubmission.LastModified",
+        description="Time the submission was last modified.",
+    )
+    complete: float = Field(
+        ...,
+        title="ExportedSubmission.Complete",
+        description="Percentage of the submission that is complete.",
+    )
+    fields: dict[str, Any] = Field(
+        ...,
+        title="ExportedSubmission.Fields",
+        description="Submitted values by form field ID.",
+    )
+
+
+class OptionCount(SerializableModel):
+    """Number of answers with an option."""
+
+    value: str = Field(
+        ...,
+        title="OptionCount.Value",
+        description="Value of the option.",
+    )
+    title: str | None = Field(
+        ...,
+        title="OptionCount.Title",
+        description="Title of the option.",
+    )
+    count: int = Field(
+        ...,
+        title="OptionCount.Count",
+        description="Number of answers with the option.",
+    )
+
+
+class HistogramBin(SerializableModel):
+    """Bin of a histogram."""
+
+    start: float = Field(
+        ...,
+        title="HistogramBin.Start",
+        description="Inclusive lower bound of the bin.",
+    )
+    end: float = Field(
+        ...,
+        title="HistogramBin.End",
+        description="Upper bound of the bin, inclusive only for the last bin.",
+    )
+    count: int = Field(
+        ...,
+        title="HistogramBin.Count",
+        description="Number of answers in the bin.",
+    )
+
+
+class DateCount(SerializableModel):
+    """Number of answers with a date."""
+
+    day: date = Field(
+        ...,
+        title="DateCount.Day",
+        description="Answered date.",
+    )
+    count: int = Field(
+        ...,
+        title="DateCount.Count",
+        description="Number of answers with the date.",
+    )
+
+
+class OptionsFieldResults(SerializableModel):
+    """Results of a field with options."""
+
+    type: Literal["options"] = Field(
+        "options",
+        title="OptionsFieldResults.Type",
+        description="Type of the results.",
+    )
+    id: str = Field(
+        ...,
+        title="OptionsFieldResults.ID",
+        description="ID of the field.",
+    )
+    answered: int = Field(
+        ...,
+        title="OptionsFieldResults.Answered",
+        description="Number of submissions that answered the field.",
+    )
+    options: list[OptionCount] = Field(
+        ...,
+        title="OptionsFieldResults.Options",
+        description="Number of answers per option, in the order of the field.",
+    )
+
+
+class YesNoFieldResults(SerializableModel):
+    """Results of a yes/no field."""
+
+    type: Literal["yes-no"] = Field(
+        "yes-no",
+        title="YesNoFieldResults.Type",
+        description="Type of the results.",
+    )
+    id: str = Field(
+        ...,
+        title="YesNoFieldResults.ID",
+        description="ID of the field.",
+    )
+    answered: int = Field(
+        ...,
+        title="YesNoFieldResults.Answered",
+        description="Number of submissions that answered the field.",
+    )
+    yes: int = Field(
+        ...,
+        title="YesNoFieldResults.Yes",
+        description="Number of yes answers.",
+    )
+    no: int = Field(
+        ...,
+        title="YesNoFieldResults.No",
+        description="Number of no answers.",
+    )
+    ratio: float | None = Field(
+        ...,
+        title="YesNoFieldResults.Ratio",
+        description="Share of yes answers among all answers.",
+    )
+
+
+class NumericFieldResults(SerializableModel):
+    """Results of a numeric field."""
+
+    type: Literal["numeric"] = Field(
+        "numeric",
+        title="NumericFieldResults.Type",
+        description="Type of the results.",
+    )
+    id: str = Field(
+        ...,
+        title="NumericFieldResults.ID",
+        description="ID of the field.",
+    )
+    answered: int = Field(
+        ...,
+        title="NumericFieldResults.Answered",
+        description="Number of submissions that answered the field.",
+    )
+    mean: float | None = Field(
+        ...,
+        title="NumericFieldResults.Mean",
+        description="Mean of the answers.",
+    )
+    stddev: float | None = Field(
+        None,
+        title="NumericFieldResults.StdDev",
+        description="Population standard deviation of the answers.",
+    )
+    min: float | None = Field(
+        None,
+        title="NumericFieldResults.Min",
+        description="Smallest answer.",
+    )
+    max: float | None = Field(
+        None,
+        title="NumericFieldResults.Max",
+        description="Largest answer.",
+    )
+    quantiles: dict[str, float] = Field(
+        ...,
+        title="NumericFieldResults.Quantiles",
+        description="Quantiles of the answers by percentile, e.g. 50 for the median.",
+    )
+    histogram: list[HistogramBin] = Field(
+        ...,
+        title="NumericFieldResults.Histogram",
+        description="Histogram of the answers.",
+    )
+
+
+class DateFieldResults(SerializableModel):
+    """Results of a date field."""
+
+    type: Literal["date"] = Field(
+        "date",
+        title="DateFieldResults.Type",
+        description="Type of the results.",
+    )
+    id: str = Field(
+        ...,
+        title="DateFieldResults.ID",
+        description="ID of the field.",
+    )
+    answered: int = Field(
+        ...,
+        title="DateFieldResults.Answered",
+        description="Number of submissions that answered the field.",
+    )
+    histogram: list[DateCount] = Field(
+        ...,
+        title="DateFieldResults.Histogram",
+        description="Number of answers per date, in order.",
+    )
+
+
+class TextFieldResults(SerializableModel):
+    """Results of a free text field."""
+
+    type: Literal["text"] = Field(
+        "text",
+        title="TextFieldResults.Type",
+        description="Type of the results.",
+    )
+    id: str = Field(
+        ...,
+        title="TextFieldResults.ID",
+        description="ID of the field.",
+    )
+    answered: int = Field(
+        ...,
+        title="TextFieldResults.Answered",
+        description="Number of submissions that answered the field.",
+    )
+
+
+FieldResults = Annotated[
+    OptionsFieldResults
+    | YesNoFieldResults
+    | NumericFieldResults
+    | DateFieldResults
+    | TextFieldResults,
+    Field(discriminator="type"),
+]
+
+
+class FormResults(SerializableModel):
+    """Aggregated results of a form."""
+
+    id: str = Field(
+        ...,
+        title="FormResults.ID",
+        description="ID of the form.",
+    )
+    submissions: int = Field(
+        ...,
+        title="FormResults.Submissions",
+        description="Number of aggregated submissions.",
+    )
+    fields: list[FieldResults] = Field(
+        ...,
+        title="FormResults.Fields",
+        description="Results per field, in the order of the form.",
+    )
@@ -0,0 +1,195 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from api.models import data as dm
+
+
+class ResultsAggregator:
+    """Aggregates columnar results of forms with vectorized operations.
+
+    Columns are never iterated per submission: counting, flattening and
+    histograms run in Arrow compute kernels or NumPy.
+
+    Args:
+        bins: Number of histogram bins of number fields.
+        max_bins: Maximum number of histogram bins, e.g. of fine-grained sliders.
+    """
+
+    PERCENTILES = (10, 25, 50, 75, 90)
+
+    def __init__(self, bins: int, max_bins: int) -> None:
+        self._bins = bins
+        self._max_bins = max_bins
+
+    def _answered(self, column: pa.ChunkedArray) -> int:
+        """Count submissions that answered a field."""
+
+        return len(column) - column.null_count
+
+    def _value_counts(self, values: pa.ChunkedArray | pa.Array) -> dict:
+        """Count occurrences of distinct values."""
+
+        counts = pc.value_counts(values)
+
+        return dict(
+            zip(
+                counts.field("values").to_pylist(),
+                counts.field("counts").to_pylist(),
+            )
+        )
+
+    def _options(
+        self,
+        field: dm.CheckboxFormField | dm.DropdownFormField | dm.RadioFormField,
+        column: pa.ChunkedArray,
+    ) -> dm.OptionsFieldResults:
+        """Aggregate a field with options."""
+
+        if isinstance(field, dm.CheckboxFormField):
+            answered = pc.sum(pc.greater(pc.list_value_length(column), 0)).as_py()
+            values = pc.list_flatten(column)
+        else:
+            answered = self._answered(column)
+            values = column
+
+        counts = self._value_counts(values)
+
+        return dm.OptionsFieldResults(
+            id=field.id,
+            answered=answered or 0,
+            options=[
+                dm.OptionCount(
+                    value=option.value,
+                    title=option.title,
+                    count=counts.get(option.value, 0),
+                )
+                for option in field.options
+            ],
+        )
+
+    def _yesno(
+        self, field: dm.YesNoFormField, column: pa.ChunkedArray
+    ) -> dm.YesNoFieldResults:
+        """Aggregate a yes/no field."""
+
+        answered = self._answered(column)
+        yes = pc.sum(pc.cast(column, pa.int64())).as_py() or 0
+
+        return dm.YesNoFieldResults(
+            id=field.id,
+            answered=answered,
+            yes=yes,
+            no=answered - yes,
+            ratio=yes / answered if answered else None,
+        )
+
+    def edges(self, field: dm.NumberFormField | dm.SliderFormField) -> np.ndarray | int:
+        """Get edges of histogram bins of a numeric field."""
+
+        if not isinstance(field, dm.SliderFormField) or field.step <= 0:
+            return self._bins
+
+        # One bin per slider position, centered on it
+        positions = np.arange(field.min, field.max + field.step / 2, field.step)
+
+        if not 0 < len(positions) <= self._max_bins:
+            return self._bins
+
+        return np.append(positions - field.step / 2, positions[-1] + field.step / 2)
+
+    def _numeric(
+        self,
+        field: dm.NumberFormField | dm.SliderFormField,
+        column: pa.ChunkedArray,
+    ) -> dm.NumericFieldResults:
+        """Aggregate a numeric field."""
+
+        values = column.drop_null().to_numpy()
+        # Snapshots written before non-finite values were dropped may have them
+        values = values[np.isfinite(values)]
+
+        if len(values) == 0:
+            return dm.NumericFieldResults(
+                id=field.id,
+                answered=0,
+                mean=None,
+                quantiles={},
+                histogram=[],
+            )
+
+        counts, edges = np.histogram(values, bins=self.edges(field))
+        quantiles = np.percentile(values, self.PERCENTILES)
+
+        return dm.NumericFieldResults(
+            id=field.id,
+            answered=len(values),
+            mean=float(np.mean(values)),
+            stddev=float(np.std(values)),
+            min=float(np.min(values)),
+            max=float(np.max(values)),
+            quantiles={
+                str(percentile): float(quantile)
+                for percentile, quantile in zip(self.PERCENTILES, quantiles)
+            },
+            histogram=[
+                dm.HistogramBin(start=start, end=end, count=count)
+                for start, end, count in zip(
+                    edges[:-1].tolist(), edges[1:].tolist(), counts.tolist()
+                )
+            ],
+        )
+
+    def _date(
+        self, field: dm.DateFormField, column: pa.ChunkedArray
+    ) -> dm.DateFieldResults:
+        """Aggregate a date field."""
+
+        counts = pc.value_counts(column.drop_null())
+        days = counts.field("values")
+        order = pc.sort_indices(days)
+
+        return dm.DateFieldResults(
+            id=field.id,
+            answered=self._answered(column),
+            histogram=[
+                dm.DateCount(day=day, count=count)
+                for day, count in zip(
+                    pc.take(days, order).to_pylist(),
+                    pc.take(counts.field("counts"), order).to_pylist(),
+                )
+            ],
+        )
+
+    def _text(
+        self, field: dm.FormField, column: pa.ChunkedArray
+    ) -> dm.TextFieldResults:
+        """Aggregate a free text field."""
+
+        return dm.TextFieldResults(id=field.id, answered=self._answered(column))
+
+    def _field(self, field: dm.FormField, column: pa.ChunkedArray) -> dm.FieldResults:
+        """Aggregate a field."""
+
+        match field:
+            case dm.CheckboxFormField() | dm.DropdownFormField() | dm.RadioFormField():
+                return self._options(field, column)
+            case dm.YesNoFormField():
+                return self._yesno(field, column)
+            case dm.NumberFormField() | dm.SliderFormField():
+                return self._numeric(field, column)
+            case dm.DateFormField():
+                return self._date(field, column)
+            case _:
+                return self._text(field, column)
+
+    def aggregate(self, form: dm.Form, table: pa.Table) -> dm.FormResults:
+        """Aggregate results of a form from a table with a column per field."""
+
+        return dm.FormResults(
+            id=form.id,
+            submissions=table.num_rows,
+            fields=[
+                self._field(field, table.column(field.id)) for field in form.fields
+            ],
+        )
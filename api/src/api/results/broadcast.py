@@ -0,0 +1,158 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from time import monotonic
+from typing import Awaitable, Callable
+
+from api.metrics import Metrics
+
+
+class _Channel:
+    """Subscribers of the live results of one form."""
+
+    def __init__(self) -> None:
+        self.subscribers: set[asyncio.Queue[bytes]] = set()
+        self.task: asyncio.Task | None = None
+        self.last: bytes | None = None
+
+
+class ResultsBroadcaster:
+    """Fans out live results of forms to subscribers of server-sent events.
+
+    Results of a form are computed and encoded once per tick, no matter how
+    many clients are subscribed, and only while anyone is. Events are sent only
+    when results change, with heartbeat comments in between to keep idle
+    connections open.
+
+    Every subscriber has a small buffer. When a slow subscriber's buffer is
+    full, its oldest event is dropped, since only the latest results matter.
+
+    Args:
+        tick: Number of seconds between computations of results.
+        buffer: Maximum number of events buffered for a subscriber.
+        heartbeat: Number of seconds between heartbeats of idle streams.
+        limit: Maximum number of subscribers.
+        metrics: Metrics to update.
+    """
+
+    HEARTBEAT = b": heartbeat\n\n"
+
+    def __init__(
+        self,
+        tick: float,
+        buffer: int,
+        heartbeat: float,
+        limit: int,
+        metrics: Metrics,
+    ) -> None:
+        self._tick = tick
+        self._buffer = buffer
+        self._heartbeat = heartbeat
+        self._limit = limit
+        self._metrics = metrics
+        self._channels: dict[str, _Channel] = {}
+        self._subscribers = 0
+
+    @property
+    def full(self) -> bool:
+        """Whether the maximum number of subscribers is reached."""
+
+        return self._subscribers >= self._limit
+
+    def _event(self, data: bytes) -> bytes:
+        """Encode JSON data as an event."""
+
+        return b"event: results\ndata: " + data + b"\n\n"
+
+    def _publish(self, channel: _Channel, event: bytes) -> None:
+        """Send an event to all subscribers of a channel."""
+
+        for queue in channel.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self._metrics.stream_dropped.inc()
+
+            queue.put_nowait(event)
+
+    async def _run(
+        self,
+        key: str,
+        channel: _Channel,
+        compute: Callable[[], Awaitable[bytes | None]],
+    ) -> None:
+        """Compute and publish results while a channel has subscribers."""
+
+        sent = monotonic()
+
+        try:
+            while channel.subscribers:
+                started = monotonic()
+
+                try:
+                    data = await compute()
+                except Exception:
+                    # A failed tick must not end the streams of all subscribers
+                    data = None
+
+                self._metrics.stream_computations.inc()
+
+                if data is not None and data != channel.last:
+                    channel.last = data
+                    self._publish(channel, self._event(data))
+                    sent = monotonic()
+                elif monotonic() - sent >= self._heartbeat:
+                    self._publish(channel, self.HEARTBEAT)
+                    sent = monotonic()
+
+                await asyncio.sleep(max(self._tick - (monotonic() - started), 0))
+        finally:
+            channel.task = None
+
+            if not channel.subscribers and self._channels.get(key) is channel:
+                del self._channels[key]
+
+    async def subscribe(
+        self, key: str, compute: Callable[[], Awaitable[bytes | None]]
+    ) -> AsyncIterator[bytes]:
+        """Stream events of a channel.
+
+        The compute function returns encoded results, or None if they can't be
+        computed at the moment. Only the function of the subscriber that starts
+        computing results of the channel is used.
+        """
+
+        queue: asyncio.Queue[bytes] = asyncio.Queue(self._buffer)
+        channel = self._channels.setdefault(key, _Channel())
+        channel.subscribers.add(queue)
+        self._subscribers += 1
+        self._metrics.stream_subscribers.inc()
+
+        if channel.last is not None:
+            queue.put_nowait(self._event(channel.last))
+
+        if channel.task is None:
+            channel.task = asyncio.create_task(self._run(key, channel, compute))
+
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            channel.subscribers.discard(queue)
+            self._subscribers -= 1
+            self._metrics.stream_subscribers.dec()
+
+    async def close(self) -> None:
+        """Stop computing results of all channels."""
+
+        tasks = [
+            channel.task
+            for channel in self._channels.values()
+            if channel.task is not None
+        ]
+
+        for task in tasks:
+            task.cancel()
+
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
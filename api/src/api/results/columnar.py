@@ -0,0 +1,264 @@
+import asyncio
+import fcntl
+import os
+import shutil
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import monotonic
+from typing import Any
+from uuid import uuid4
+
+import pyarrow as pa
+from pydantic import ValidationError
+
+from api.models import data as dm
+from api.results.models import ResultsManifest
+from api.results.values import ValueConverter
+
+
+class ResultsStore:
+    """Columnar snapshots of submissions of forms, stored as Arrow IPC files.
+
+    Every form has a directory with a manifest and segment files. Appending
+    writes a new segment with only the new submissions, so existing files are
+    never rewritten. Segments are read through memory mapping, so scans don't
+    copy the data.
+
+    Columns are typed by the class of the form field they come from.
+
+    Manifests are updated under a file lock per form, so processes on the
+    same host never lose each other's segments.
+
+    Args:
+        path: Directory of the store.
+    """
+
+    MANIFEST = "manifest.json"
+    LOCKS = ".locks"
+
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+        self._converter = ValueConverter()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._updated: dict[str, float] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Locks and update times belong to the event loop of the main process
+        return {"_path": self._path}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(str(state["_path"]))
+
+    def lock(self, id: str) -> asyncio.Lock:
+        """Get the lock serializing updates of a form in this process."""
+
+        return self._locks.setdefault(id, asyncio.Lock())
+
+    def age(self, id: str) -> float:
+        """Get number of seconds since this process last updated a form."""
+
+        return monotonic() - self._updated.get(id, float("-inf"))
+
+    def touch(self, id: str) -> None:
+        """Record that this process updated a form."""
+
+        self._updated[id] = monotonic()
+
+    def _form_path(self, id: str) -> Path:
+        """Get directory of a form."""
+
+        if id in {"", ".", ".."} or "/" in id or "\\" in id:
+            raise ValueError(f"Invalid form ID: {id!r}.")
+
+        return self._path / id
+
+    @contextmanager
+    def _locked(self, id: str) -> Iterator[None]:
+        """Hold the lock of a form shared by all processes on the host.
+
+        Lock files are kept outside of form directories, so clearing a
+        snapshot never removes a lock that is held.
+        """
+
+        path = self._path / self.LOCKS / self._form_path(id).name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _column_type(self, field: dm.FormField) -> pa.DataType:
+        """Get type of the column of a form field."""
+
+        match field:
+            case dm.CheckboxFormField():
+                return pa.list_(pa.string())
+            case dm.DateFormField():
+                return pa.date32()
+            case dm.NumberFormField() | dm.SliderFormField():
+                return pa.float64()
+            case dm.YesNoFormField():
+                return pa.bool_()
+            case _:
+                return pa.string()
+
+    def schema(self, form: dm.Form) -> pa.Schema:
+        """Get schema of the snapshot of a form."""
+
+        return pa.schema(
+            [
+                pa.field("submission", pa.string(), nullable=False),
+                pa.field("created", pa.timestamp("ms", tz="UTC")),
+                pa.field("last_modified", pa.timestamp("ms", tz="UTC")),
+                pa.field("complete", pa.float64()),
+            ]
+            + [
+                pa.field(
+                    field.id,
+                    self._column_type(field),
+                    metadata={"title": field.title, "type": field.type},
+                )
+                for field in form.fields
+            ]
+        )
+
+    def _parse_time(self, value: str | None) -> datetime | None:
+        """Parse a timestamp."""
+
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _build_table(
+        self, form: dm.Form, submissions: Sequence[dm.ExportedSubmission]
+    ) -> pa.Table:
+        """Build a table of submissions."""
+
+        columns = {
+            "submission": [submission.id for submission in submissions],
+            "created": [
+                self._parse_time(submission.created) for submission in submissions
+            ],
+            "last_modified": [
+                self._parse_time(submission.last_modified) for submission in submissions
+            ],
+            "complete": [submission.complete for submission in submissions],
+        }
+
+        for field in form.fields:
+            columns[field.id] = [
+                self._converter.convert(field, submission.fields.get(field.id))
+                for submission in submissions
+            ]
+
+        return pa.Table.from_pydict(columns, schema=self.schema(form))
+
+    def _write_atomically(self, path: Path, write: Any) -> None:
+        """Write a file atomically, so readers never see partial data."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with NamedTemporaryFile(dir=path.parent, delete=False) as file:
+            write(file)
+
+        os.replace(file.name, path)
+
+    def manifest(self, id: str) -> ResultsManifest | None:
+        """Get the manifest of the snapshot of a form."""
+
+        try:
+            data = (self._form_path(id) / self.MANIFEST).read_bytes()
+            return ResultsManifest.model_validate_json(data)
+        except (OSError, ValueError, ValidationError):
+            return None
+
+    def clear(self, id: str) -> None:
+        """Remove the snapshot of a form."""
+
+        with self._locked(id):
+            shutil.rmtree(self._form_path(id), ignore_errors=True)
+
+        self._updated.pop(id, None)
+
+    def append(
+        self,
+        form: dm.Form,
+        version: str,
+        submissions: Sequence[dm.ExportedSubmission],
+        listed: int,
+    ) -> ResultsManifest:
+        """Append submissions to the snapshot of a form as a new segment.
+
+        The number of listed upstream submissions is recorded, even if some
+        of them were skipped, so the next append starts after them.
+        """
+
+        with self._locked(form.id):
+            manifest = self.manifest(form.id) or ResultsManifest(version=version)
+
+            if manifest.segments:
+                # Another process may have appended the same submissions
+                known = self.ids(form.id)
+                submissions = [s for s in submissions if s.id not in known]
+
+            if submissions:
+                table = self._build_table(form, submissions)
+                segment = f"{uuid4().hex}.arrow"
+
+                def _write(file: Any) -> None:
+                    with pa.ipc.new_file(file, table.schema) as writer:
+                        writer.write_table(table)
+
+                self._write_atomically(self._form_path(form.id) / segment, _write)
+                manifest.segments.append(segment)
+
+            manifest.submissions = max(manifest.submissions, listed)
+
+            self._write_atomically(
+                self._form_path(form.id) / self.MANIFEST,
+                lambda file: file.write(manifest.model_dump_json().encode()),
+            )
+
+        return manifest
+
+    def read(self, id: str, columns: list[str] | None = None) -> pa.Table | None:
+        """Read the snapshot of a form through memory mapping.
+
+        Returns None if there is no snapshot or it has no submissions.
+        """
+
+        manifest = self.manifest(id)
+
+        if manifest is None:
+            return None
+
+        tables = []
+
+        for segment in manifest.segments:
+            # Tables keep the mapped region alive after the file is closed
+            with pa.memory_map(str(self._form_path(id) / segment)) as source:
+                table = pa.ipc.open_file(source).read_all()
+
+            tables.append(table if columns is None else table.select(columns))
+
+        if not tables:
+            return None
+
+        return pa.concat_tables(tables)
+
+    def ids(self, id: str) -> set[str]:
+        """Get ids of submissions in the snapshot of a form."""
+
+        table = self.read(id, ["submission"])
+
+        if table is None:
+            return set()
+
+        return set(table.column("submission").to_pylist())
@@ -0,0 +1,36 @@
+from collections.abc import Sequence
+
+from api.models import data as dm
+from api.results.aggregate import ResultsAggregator
+from api.results.columnar import ResultsStore
+from api.results.models import ResultsManifest
+
+
+def append_snapshot(
+    store: ResultsStore,
+    form: dm.Form,
+    version: str,
+    submissions: Sequence[dm.ExportedSubmission],
+    listed: int,
+) -> ResultsManifest:
+    """Append submissions to the snapshot of a form."""
+
+    return store.append(form, version, submissions, listed)
+
+
+def aggregate_snapshot(
+    store: ResultsStore, aggregator: ResultsAggregator, form: dm.Form
+) -> dm.FormResults:
+    """Aggregate results of a form from its snapshot.
+
+    The snapshot is memory-mapped by the worker itself, so its columns are
+    never copied between processes.
+    """
+
+    schema = store.schema(form)
+    table = store.read(form.id)
+
+    if table is None or not table.schema.equals(schema):
+        table = schema.empty_table()
+
+    return aggregator.aggregate(form, table)
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+
+
+class ResultsManifest(BaseModel):
+    """Manifest of a columnar results snapshot of a form."""
+
+    version: str = Field(
+        ...,
+        title="Version",
+        description="Version of the form the columns were derived from.",
+    )
+    submissions: int = Field(
+        0,
+        title="Submissions",
+        description="Number of upstream submissions already materialized.",
+    )
+    segments: list[str] = Field(
+        [],
+        title="Segments",
+        description="Names of the segment files, in order.",
+    )
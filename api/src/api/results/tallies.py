@@ -0,0 +1,416 @@
+import math
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from datetime import date
+from typing import Any, NamedTuple
+
+import numpy as np
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from api.models import data as dm
+from api.results.aggregate import ResultsAggregator
+from api.results.values import ValueConverter
+
+
+class Tally(NamedTuple):
+    """Running counters of the submissions of a form.
+
+    Counters are keyed by field and kind, e.g. "field:option:value", so both
+    increments and totals are flat maps that can be applied atomically.
+    """
+
+    counts: Mapping[str, float]
+    minimums: Mapping[str, float]
+    maximums: Mapping[str, float]
+
+
+class QuantileSketch:
+    """Streaming quantile sketch with logarithmic buckets.
+
+    Every value is counted in a bucket whose bounds differ by a constant
+    factor, so quantiles have a bounded relative error. Buckets are plain
+    counters, so sketches can be updated with atomic increments and merged
+    by adding them.
+
+    Args:
+        accuracy: Maximum relative error of quantiles.
+    """
+
+    def __init__(self, accuracy: float) -> None:
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+    def bucket(self, value: float) -> str:
+        """Get key of the bucket of a value."""
+
+        if value == 0:
+            return "z"
+
+        index = math.ceil(math.log(abs(value)) / self._log_gamma)
+        return f"{'p' if value > 0 else 'n'}{index}"
+
+    def value(self, bucket: str) -> float:
+        """Get value representing a bucket."""
+
+        if bucket == "z":
+            return 0.0
+
+        value = 2 * self._gamma ** int(bucket[1:]) / (self._gamma + 1)
+        return value if bucket[0] == "p" else -value
+
+    def values(self, buckets: Mapping[str, float]) -> tuple[np.ndarray, np.ndarray]:
+        """Get values representing buckets and their counts, sorted by value."""
+
+        values = np.array([self.value(bucket) for bucket in buckets], dtype=float)
+        counts = np.array(list(buckets.values()), dtype=float)
+        order = np.argsort(values)
+
+        return values[order], counts[order]
+
+    def quantiles(
+        self, buckets: Mapping[str, float], percentiles: Iterable[float]
+    ) -> list[float]:
+        """Estimate quantiles of the counted values."""
+
+        values, counts = self.values(buckets)
+
+        if counts.sum() <= 0:
+            return []
+
+        ranks = np.array(list(percentiles), dtype=float) / 100 * (counts.sum() - 1)
+        indices = np.searchsorted(np.cumsum(counts), ranks, side="right")
+
+        return values[np.minimum(indices, len(values) - 1)].tolist()
+
+
+class TallyStore(ABC):
+    """Base class for stores of running tallies of forms."""
+
+    @abstractmethod
+    async def add(self, id: str, tally: Tally) -> None:
+        """Add increments to the tally of a form."""
+
+        pass
+
+    @abstractmethod
+    async def get(self, id: str) -> Tally:
+        """Get the tally of a form."""
+
+        pass
+
+    @abstractmethod
+    async def clear(self, id: str) -> None:
+        """Remove the tally of a form."""
+
+        pass
+
+
+class MemoryTallyStore(TallyStore):
+    """Store of tallies in memory, counting submissions of this process only."""
+
+    def __init__(self) -> None:
+        self._counts: dict[str, Counter[str]] = {}
+        self._minimums: dict[str, dict[str, float]] = {}
+        self._maximums: dict[str, dict[str, float]] = {}
+
+    async def add(self, id: str, tally: Tally) -> None:
+        self._counts.setdefault(id, Counter()).update(tally.counts)
+
+        minimums = self._minimums.setdefault(id, {})
+        maximums = self._maximums.setdefault(id, {})
+
+        for key, value in tally.minimums.items():
+            minimums[key] = min(minimums.get(key, value), value)
+
+        for key, value in tally.maximums.items():
+            maximums[key] = max(maximums.get(key, value), value)
+
+    async def get(self, id: str) -> Tally:
+        return Tally(
+            counts=dict(self._counts.get(id, {})),
+            minimums=dict(self._minimums.get(id, {})),
+            maximums=dict(self._maximums.get(id, {})),
+        )
+
+    async def clear(self, id: str) -> None:
+        self._counts.pop(id, None)
+        self._minimums.pop(id, None)
+        self._maximums.pop(id, None)
+
+
+class RedisTallyStore(TallyStore):
+    """Store of tallies in Redis, shared by instances.
+
+    Counters are a hash updated with atomic increments. Extremes are sorted
+    sets updated only if the new value is lower or greater, so concurrent
+    submissions never overwrite each other. When Redis is unreachable,
+    increments are lost and tallies are empty. Commands rejected by Redis
+    raise errors.
+
+    Args:
+        redis: Redis client.
+        prefix: Prefix of the keys.
+    """
+
+    def __init__(self, redis: Redis, prefix: str) -> None:
+        self._redis = redis
+        self._prefix = prefix
+
+    def _key(self, id: str, kind: str) -> str:
+        return f"{self._prefix}:tallies:{id}:{kind}"
+
+    async def add(self, id: str, tally: Tally) -> None:
+        async with self._redis.pipeline(transaction=True) as pipeline:
+            # Counters are always incremented as floats, since an integer
+            # increment fails once a counter holds a fractional value
+            for key, value in tally.counts.items():
+                pipeline.hincrbyfloat(self._key(id, "counts"), key, value)
+
+            if tally.minimums:
+                pipeline.zadd(self._key(id, "minimums"), dict(tally.minimums), lt=True)
+
+            if tally.maximums:
+                pipeline.zadd(self._key(id, "maximums"), dict(tally.maximums), gt=True)
+
+            try:
+                await pipeline.execute()
+            except ResponseError:
+                # Rejected commands are bugs, not outages, so they are not hidden
+                raise
+            except RedisError:
+                pass
+
+    async def get(self, id: str) -> Tally:
+        async with self._redis.pipeline(transaction=True) as pipeline:
+            pipeline.hgetall(self._key(id, "counts"))
+            pipeline.zrange(self._key(id, "minimums"), 0, -1, withscores=True)
+            pipeline.zrange(self._key(id, "maximums"), 0, -1, withscores=True)
+
+            try:
+                counts, minimums, maximums = await pipeline.execute()
+            except ResponseError:
+                raise
+            except RedisError:
+                return Tally(counts={}, minimums={}, maximums={})
+
+        return Tally(
+            counts={key.decode(): float(value) for key, value in counts.items()},
+            minimums={key.decode(): value for key, value in minimums},
+            maximums={key.decode(): value for key, value in maximums},
+        )
+
+    async def clear(self, id: str) -> None:
+        try:
+            await self._redis.delete(
+                *(self._key(id, kind) for kind in ("counts", "minimums", "maximums"))
+            )
+        except ResponseError:
+            raise
+        except RedisError:
+            pass
+
+
+class Tallies:
+    """Running tallies of the results of forms, updated on every submission.
+
+    Reading results only touches the counters of each field, so it takes
+    the same time regardless of the number of submissions. Tallies only count
+    submissions made through this API since they were enabled.
+
+    Args:
+        store: Store of the tallies.
+        sketch: Quantile sketch of numeric fields.
+        aggregator: Aggregator whose histogram bins and percentiles are used.
+    """
+
+    def __init__(
+        self, store: TallyStore, sketch: QuantileSketch, aggregator: ResultsAggregator
+    ) -> None:
+        self._store = store
+        self._sketch = sketch
+        self._aggregator = aggregator
+        self._converter = ValueConverter()
+
+    def _increments(self, form: dm.Form, fields: Mapping[str, Any]) -> Tally:
+        """Get increments of the tally of a form for one submission."""
+
+        counts: Counter[str] = Counter({"submissions": 1})
+        minimums: dict[str, float] = {}
+        maximums: dict[str, float] = {}
+
+        for field in form.fields:
+            value = self._converter.convert(field, fields.get(field.id))
+
+            if value is None or value == []:
+                continue
+
+            counts[f"{field.id}:answered"] += 1
+
+            match field:
+                case dm.CheckboxFormField():
+                    for option in set(value):
+                        counts[f"{field.id}:option:{option}"] += 1
+                case dm.DropdownFormField() | dm.RadioFormField():
+                    counts[f"{field.id}:option:{value}"] += 1
+                case dm.YesNoFormField():
+                    counts[f"{field.id}:yes"] += int(value)
+                case dm.NumberFormField() | dm.SliderFormField():
+                    counts[f"{field.id}:sum"] += value
+                    counts[f"{field.id}:squares"] += value * value
+                    counts[f"{field.id}:bucket:{self._sketch.bucket(value)}"] += 1
+                    minimums[field.id] = value
+                    maximums[field.id] = value
+                case dm.DateFormField():
+                    counts[f"{field.id}:day:{value.isoformat()}"] += 1
+
+        return Tally(counts=counts, minimums=minimums, maximums=maximums)
+
+    async def record(self, form: dm.Form, fields: Mapping[str, Any]) -> None:
+        """Count a confirmed submission of a form."""
+
+        await self._store.add(form.id, self._increments(form, fields))
+
+    async def clear(self, id: str) -> None:
+        """Reset the tally of a form."""
+
+        await self._store.clear(id)
+
+    def _group(self, counts: Mapping[str, float]) -> dict[str, dict[str, dict]]:
+        """Group counters by field and kind."""
+
+        groups: dict[str, dict[str, dict]] = {}
+
+        for key, value in counts.items():
+            field, _, rest = key.partition(":")
+            kind, _, name = rest.partition(":")
+            groups.setdefault(field, {}).setdefault(kind, {})[name] = value
+
+        return groups
+
+    def _numeric(
+        self,
+        field: dm.NumberFormField | dm.SliderFormField,
+        counters: dict[str, dict],
+        minimum: float | None,
+        maximum: float | None,
+    ) -> dm.NumericFieldResults:
+        """Summarize a numeric field."""
+
+        answered = int(counters.get("answered", {}).get("", 0))
+        buckets = counters.get("bucket", {})
+
+        if answered <= 0 or not buckets or minimum is None or maximum is None:
+            return dm.NumericFieldResults(
+                id=field.id,
+                answered=0,
+                mean=None,
+                quantiles={},
+                histogram=[],
+            )
+
+        total = counters.get("sum", {}).get("", 0.0)
+        squares = counters.get("squares", {}).get("", 0.0)
+        mean = total / answered
+        percentiles = self._aggregator.PERCENTILES
+        quantiles = self._sketch.quantiles(buckets, percentiles)
+
+        # Representative values are clipped, so they fall into the bins
+        values, weights = self._sketch.values(buckets)
+        values = np.clip(values, minimum, maximum)
+        counts, edges = np.histogram(
+            values,
+            bins=self._aggregator.edges(field),
+            range=(minimum, maximum),
+            weights=weights,
+        )
+
+        return dm.NumericFieldResults(
+            id=field.id,
+            answered=answered,
+            mean=mean,
+            stddev=math.sqrt(max(squares / answered - mean * mean, 0.0)),
+            min=minimum,
+            max=maximum,
+            quantiles={
+                str(percentile): min(max(quantile, minimum), maximum)
+                for percentile, quantile in zip(percentiles, quantiles)
+            },
+            histogram=[
+                dm.HistogramBin(start=start, end=end, count=round(count))
+                for start, end, count in zip(
+                    edges[:-1].tolist(), edges[1:].tolist(), counts.tolist()
+                )
+            ],
+        )
+
+    def _field(
+        self, field: dm.FormField, counters: dict[str, dict], tally: Tally
+    ) -> dm.FieldResults:
+        """Summarize a field."""
+
+        answered = int(counters.get("answered", {}).get("", 0))
+
+        match field:
+            case dm.CheckboxFormField() | dm.DropdownFormField() | dm.RadioFormField():
+                options = counters.get("option", {})
+                return dm.OptionsFieldResults(
+                    id=field.id,
+                    answered=answered,
+                    options=[
+                        dm.OptionCount(
+                            value=option.value,
+                            title=option.title,
+                            count=int(options.get(option.value, 0)),
+                        )
+                        for option in field.options
+                    ],
+                )
+            case dm.YesNoFormField():
+                yes = int(counters.get("yes", {}).get("", 0))
+                return dm.YesNoFieldResults(
+                    id=field.id,
+                    answered=answered,
+                    yes=yes,
+                    no=answered - yes,
+                    ratio=yes / answered if answered else None,
+                )
+            case dm.NumberFormField() | dm.SliderFormField():
+                return self._numeric(
+                    field,
+                    counters,
+                    tally.minimums.get(field.id),
+                    tally.maximums.get(field.id),
+                )
+            case dm.DateFormField():
+                days = counters.get("day", {})
+                return dm.DateFieldResults(
+                    id=field.id,
+                    answered=answered,
+                    histogram=[
+                        dm.DateCount(day=date.fromisoformat(day), count=int(days[day]))
+                        for day in sorted(days)
+                    ],
+                )
+            case _:
+                return dm.TextFieldResults(id=field.id, answered=answered)
+
+    def _summarize(self, form: dm.Form, tally: Tally) -> dm.FormResults:
+        """Summarize the tally of a form."""
+
+        groups = self._group(tally.counts)
+
+        return dm.FormResults(
+            id=form.id,
+            submissions=int(groups.get("submissions", {}).get("", {}).get("", 0)),
+            fields=[
+                self._field(field, groups.get(field.id, {}), tally)
+                for field in form.fields
+            ],
+        )
+
+    async def results(self, form: dm.Form) -> dm.FormResults:
+        """Get results of a form from its tally."""
+
+        return self._summarize(form, await self._store.get(form.id))
@@ -0,0 +1,48 @@
+import math
+from datetime import date
+from typing import Any
+
+from api.models import data as dm
+
+
+class ValueConverter:
+    """Converts submitted values to the types of their form fields.
+
+    Values that don't fit the type of their field are treated as unanswered.
+    """
+
+    def convert(self, field: dm.FormField, value: Any) -> Any:
+        """Convert a submitted value to the type of its field."""
+
+        if value is None:
+            return None
+
+        match field:
+            case dm.CheckboxFormField():
+                values = value if isinstance(value, list) else [value]
+                return [str(value) for value in values]
+            case dm.DateFormField():
+                try:
+                    return date.fromisoformat(str(value)[:10])
+                except ValueError:
+                    return None
+            case dm.NumberFormField() | dm.SliderFormField():
+                if isinstance(value, bool):
+                    return None
+
+                try:
+                    number = float(value)
+                except (TypeError, ValueError):
+                    return None
+
+                # NaN and infinities can't be aggregated
+                return number if math.isfinite(number) else None
+            case dm.YesNoFormField():
+                if isinstance(value, bool):
+                    return value
+
+                return {"yes": True, "true": True, "no": False, "false": False}.get(
+                    str(value).lower()
+                )
+            case _:
+                return value if isinstance(value, str) else str(value)
@@ -0,0 +1,83 @@
+from typing import Any
+
+from api.models import data as dm
+
+
+class SubmissionSchemaBuilder:
+    """Builds JSON Schemas of submitted fields of forms.
+
+    Schemas describe the fields object of a submission, so clients can
+    validate answers before submitting them. Unanswered optional fields can be
+    left out or set to null.
+    """
+
+    DIALECT = "https://json-schema.org/draft/2020-12/schema"
+
+    def _options(self, values: list[str], required: bool) -> list[Any]:
+        """Get allowed values of an options field."""
+
+        return values if required else [*values, None]
+
+    def _type(self, type: str, required: bool) -> str | list[str]:
+        """Get allowed JSON types of a field."""
+
+        return type if required else [type, "null"]
+
+    def _field(self, field: dm.FormField) -> dict[str, Any]:
+        """Build schema of a form field."""
+
+        required = field.required
+
+        match field:
+            case dm.CheckboxFormField():
+                schema = {
+                    "type": self._type("array", required),
+                    "items": {"enum": [option.value for option in field.options]},
+                    "uniqueItems": True,
+                }
+            case dm.DropdownFormField() | dm.RadioFormField():
+                schema = {
+                    "enum": self._options(
+                        [option.value for option in field.options], required
+                    )
+                }
+            case dm.DateFormField():
+                schema = {"type": self._type("string", required), "format": "date"}
+            case dm.EmailFormField():
+                schema = {"type": self._type("string", required), "format": "email"}
+            case dm.UrlFormField():
+                schema = {"type": self._type("string", required), "format": "uri"}
+            case dm.NumberFormField():
+                schema = {"type": self._type("number", required)}
+            case dm.SliderFormField():
+                schema = {
+                    "type": self._type("number", required),
+                    "minimum": field.min,
+                    "maximum": field.max,
+                }
+            case dm.YesNoFormField():
+                schema = {"type": self._type("boolean", required)}
+            case _:
+                schema = {"type": self._type("string", required)}
+
+        schema["title"] = field.title
+
+        if field.description:
+            schema["description"] = field.description
+
+        if field.default is not None:
+            schema["default"] = field.default
+
+        return schema
+
+    def build(self, form: dm.Form) -> dict[str, Any]:
+        """Build schema of submitted fields of a form."""
+
+        return {
+            "$schema": self.DIALECT,
+            "title": form.title,
+            "type": "object",
+            "properties": {field.id: self._field(field) for field in form.fields},
+            "required": [field.id for field in form.fields if field.required],
+            "additionalProperties": False,
+        }
@@ -1,8 +1,21 @@
+import os
+
 import uvicorn
 from litestar import Litestar
 
 from api.config.models import Config
 
+WORKER_CONFIG_ENV = "API_WORKER_CONFIG"
+
+
+def build_worker_app() -> Litestar:
+    """Build the app in a worker process from the config passed by the server."""
+
+    from api.api.app import AppBuilder
+
+    config = Config.model_validate_json(os.environ[WORKER_CONFIG_ENV])
+    return AppBuilder(config).build()
+
 
 class Server:
     """Server for the application.
@@ -21,8 +34,21 @@ class Server:
 
         config = self._config.server
 
+        if config.workers == 1:
+            uvicorn.run(
+                self._app,
+                host=config.host,
+                port=config.port,
+            )
+            return
+
+        # Workers are separate processes, so they build their own apps
+        os.environ[WORKER_CONFIG_ENV] = self._config.model_dump_json()
+
         uvicorn.run(
-            self._app,
+            "api.server:build_worker_app",
+            factory=True,
             host=config.host,
             port=config.port,
+            workers=config.workers,
         )
@@ -1,7 +1,28 @@
 from litestar.datastructures import State as LitestarState
+from redis.asyncio import Redis
 
+from api.admission import Admission, LagMonitor
+from api.cache.forms import FormCache
+from api.cache.invalidation import CacheInvalidator
+from api.cache.known import KnownForms
+from api.cache.negative import NegativeFormCache
+from api.cache.remote import RemoteFormCache
+from api.cache.shared import SharedFormCache
+from api.cache.snapshot import FormCacheSnapshot
+from api.codecs import Codec
+from api.compression import Compression
 from api.config.models import Config
+from api.database.client import DatabaseClient
 from api.graphql.client import GraphQLClient
+from api.health import Health
+from api.metrics import Metrics
+from api.results.aggregate import ResultsAggregator
+from api.results.broadcast import ResultsBroadcaster
+from api.results.columnar import ResultsStore
+from api.results.tallies import Tallies
+from api.submissions.tracker import SubmissionTracker
+from api.submissions.votes import VoteBatcher
+from api.workers import WorkerPool
 
 
 class State(LitestarState):
@@ -13,3 +34,25 @@ class State(LitestarState):
 
     config: Config
     graphql: GraphQLClient
+    database: DatabaseClient | None
+    submissions: SubmissionTracker
+    cache: FormCache
+    negative: NegativeFormCache
+    known: KnownForms | None
+    redis: Redis | None
+    remote: RemoteFormCache | None
+    shared: SharedFormCache | None
+    snapshot: FormCacheSnapshot | None
+    invalidator: CacheInvalidator
+    compression: Compression
+    codec: Codec
+    health: Health
+    metrics: Metrics
+    lag: LagMonitor
+    admission: Admission
+    results: ResultsStore
+    aggregator: ResultsAggregator
+    tallies: Tallies | None
+    broadcaster: ResultsBroadcaster
+    votes: VoteBatcher | None
+    workers: WorkerPool
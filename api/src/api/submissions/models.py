@@ -0,0 +1,63 @@
+from pydantic import BaseModel, Field
+
+from api.models import data as dm
+
+
+class SubmissionProgress(BaseModel):
+    """Progress of an upstream submission."""
+
+    form: str = Field(
+        ...,
+        title="Form",
+        description="ID of the form.",
+    )
+    submission: str = Field(
+        ...,
+        title="Submission",
+        description="ID of the upstream submission.",
+    )
+    token: str = Field(
+        ...,
+        title="Token",
+        description="Token of the upstream submission.",
+    )
+    fields: set[str] = Field(
+        set(),
+        title="Fields",
+        description="IDs of the fields that were already written.",
+    )
+    updated: float = Field(
+        ...,
+        title="Updated",
+        description="Monotonic time of the last update.",
+    )
+
+
+class Vote(BaseModel):
+    """Vote for an option of a single form field, waiting to be submitted."""
+
+    form: str = Field(
+        ...,
+        title="Form",
+        description="ID of the form.",
+    )
+    field: str = Field(
+        ...,
+        title="Field",
+        description="ID of the field.",
+    )
+    value: str = Field(
+        ...,
+        title="Value",
+        description="Value of the chosen option.",
+    )
+    received: float = Field(
+        ...,
+        title="Received",
+        description="Monotonic time the vote was received.",
+    )
+    resume: dm.SubmissionResume | None = Field(
+        None,
+        title="Resume",
+        description="Upstream submission of a failed attempt, continued when retried.",
+    )
@@ -0,0 +1,210 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from time import monotonic
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from api.submissions.models import SubmissionProgress
+
+
+class SubmissionTracker(ABC):
+    """Base class for trackers of written fields of unfinished upstream submissions.
+
+    Args:
+        ttl: Number of seconds after which idle progress is forgotten.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+
+    @abstractmethod
+    async def start(self, form: str, submission: str, token: str) -> SubmissionProgress:
+        """Start tracking a submission."""
+
+        pass
+
+    @abstractmethod
+    async def get(self, submission: str, token: str) -> SubmissionProgress | None:
+        """Get progress of a submission."""
+
+        pass
+
+    @abstractmethod
+    async def mark(self, progress: SubmissionProgress, field: str) -> None:
+        """Mark a field of a submission as written."""
+
+        pass
+
+    @abstractmethod
+    async def finish(self, progress: SubmissionProgress) -> None:
+        """Stop tracking a submission."""
+
+        pass
+
+
+class MemorySubmissionTracker(SubmissionTracker):
+    """Tracker of submissions in memory, local to a process.
+
+    Args:
+        ttl: Number of seconds after which idle progress is forgotten.
+        capacity: Maximum number of tracked submissions.
+    """
+
+    def __init__(self, ttl: float, capacity: int) -> None:
+        super().__init__(ttl)
+        self._capacity = capacity
+        self._progress: OrderedDict[tuple[str, str], SubmissionProgress] = OrderedDict()
+
+    def _is_expired(self, progress: SubmissionProgress, now: float) -> bool:
+        """Check if progress is expired."""
+
+        return now - progress.updated > self._ttl
+
+    def _prune(self, now: float) -> None:
+        """Remove expired and excess progress."""
+
+        while self._progress:
+            key, progress = next(iter(self._progress.items()))
+
+            if len(self._progress) <= self._capacity and not self._is_expired(
+                progress, now
+            ):
+                break
+
+            del self._progress[key]
+
+    async def start(self, form: str, submission: str, token: str) -> SubmissionProgress:
+        now = monotonic()
+        progress = SubmissionProgress(
+            form=form,
+            submission=submission,
+            token=token,
+            updated=now,
+        )
+
+        self._progress[(submission, token)] = progress
+        self._prune(now)
+        return progress
+
+    async def get(self, submission: str, token: str) -> SubmissionProgress | None:
+        progress = self._progress.get((submission, token))
+
+        if progress is None:
+            return None
+
+        if self._is_expired(progress, monotonic()):
+            del self._progress[(submission, token)]
+            return None
+
+        return progress
+
+    async def mark(self, progress: SubmissionProgress, field: str) -> None:
+        progress.fields.add(field)
+        progress.updated = monotonic()
+
+        key = (progress.submission, progress.token)
+        if key in self._progress:
+            self._progress.move_to_end(key)
+
+    async def finish(self, progress: SubmissionProgress) -> None:
+        self._progress.pop((progress.submission, progress.token), None)
+
+
+class RedisSubmissionTracker(SubmissionTracker):
+    """Tracker of submissions in Redis, shared by instances.
+
+    The form of a submission is stored under one key and its written fields
+    in a set, so concurrent writes of fields never overwrite each other. Both
+    expire when idle. When Redis is unreachable, progress is lost and
+    submissions can't be resumed. Commands rejected by Redis raise errors.
+
+    Args:
+        redis: Redis client.
+        prefix: Prefix of the keys.
+        ttl: Number of seconds after which idle progress is forgotten.
+    """
+
+    def __init__(self, redis: Redis, prefix: str, ttl: float) -> None:
+        super().__init__(ttl)
+        self._redis = redis
+        self._prefix = prefix
+
+    def _key(self, submission: str, token: str, kind: str) -> str:
+        return f"{self._prefix}:submissions:{submission}:{token}:{kind}"
+
+    async def start(self, form: str, submission: str, token: str) -> SubmissionProgress:
+        progress = SubmissionProgress(
+            form=form,
+            submission=submission,
+            token=token,
+            updated=monotonic(),
+        )
+
+        key = self._key(submission, token, "form")
+
+        try:
+            await self._redis.set(key, form, px=int(self._ttl * 1000))
+        except ResponseError:
+            raise
+        except RedisError:
+            pass
+
+        return progress
+
+    async def get(self, submission: str, token: str) -> SubmissionProgress | None:
+        async with self._redis.pipeline(transaction=True) as pipeline:
+            pipeline.get(self._key(submission, token, "form"))
+            pipeline.smembers(self._key(submission, token, "fields"))
+
+            try:
+                form, fields = await pipeline.execute()
+            except ResponseError:
+                raise
+            except RedisError:
+                return None
+
+        if form is None:
+            return None
+
+        return SubmissionProgress(
+            form=form.decode(),
+            submission=submission,
+            token=token,
+            fields={field.decode() for field in fields},
+            updated=monotonic(),
+        )
+
+    async def mark(self, progress: SubmissionProgress, field: str) -> None:
+        progress.fields.add(field)
+        progress.updated = monotonic()
+
+        ttl = int(self._ttl * 1000)
+        key = self._key(progress.submission, progress.token, "fields")
+
+        async with self._redis.pipeline(transaction=True) as pipeline:
+            pipeline.sadd(key, field)
+            pipeline.pexpire(key, ttl)
+            pipeline.pexpire(
+                self._key(progress.submission, progress.token, "form"), ttl
+            )
+
+            try:
+                await pipeline.execute()
+            except ResponseError:
+                raise
+            except RedisError:
+                pass
+
+    async def finish(self, progress: SubmissionProgress) -> None:
+        try:
+            await self._redis.delete(
+                *(
+                    self._key(progress.submission, progress.token, kind)
+                    for kind in ("form", "fields")
+                )
+            )
+        except ResponseError:
+            raise
+        except RedisError:
+            pass
@@ -0,0 +1,161 @@
+import asyncio
+from contextlib import suppress
+from time import monotonic
+from typing import Awaitable, Callable
+
+from api.metrics import Metrics
+from api.submissions.models import Vote
+
+
+class VoteBatcher:
+    """Forwards acknowledged votes upstream in bounded micro-batches.
+
+    Votes are queued as they arrive and submitted in batches of at most the
+    given size, collected for at most the given interval. Only one batch is
+    submitted at a time, so bursts of votes never exceed the batch size of
+    concurrent upstream submissions.
+
+    Every vote is still its own upstream submission, since ohmyform has no
+    way to write several at once. Batching caps their concurrency, and with
+    GraphQL batching enabled, operations of a batch share HTTP requests.
+
+    Votes are acknowledged before they are submitted, so votes that fail
+    upstream are retried with an exponential backoff before the batch is
+    done. Meanwhile, no other batch is submitted and new votes are queued,
+    or refused once the queue is full.
+
+    Args:
+        size: Maximum number of votes in a batch.
+        interval: Maximum number of seconds a batch is collected for.
+        capacity: Maximum number of queued votes.
+        retries: Maximum number of retries of a failed vote.
+        backoff: Number of seconds before the first retry.
+        metrics: Metrics to update.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        interval: float,
+        capacity: int,
+        retries: int,
+        backoff: float,
+        metrics: Metrics,
+    ) -> None:
+        self._size = size
+        self._interval = interval
+        self._queue: asyncio.Queue[Vote] = asyncio.Queue(capacity)
+        self._retries = retries
+        self._backoff = backoff
+        self._metrics = metrics
+        self._flushing: asyncio.Future | None = None
+        # Votes taken from the queue, but not flushed yet
+        self._batch: list[Vote] = []
+
+    @property
+    def depth(self) -> int:
+        """Get number of queued votes."""
+
+        return self._queue.qsize()
+
+    def offer(self, vote: Vote) -> bool:
+        """Queue a vote, unless the queue is full."""
+
+        try:
+            self._queue.put_nowait(vote)
+        except asyncio.QueueFull:
+            return False
+
+        return True
+
+    def _take(self, batch: list[Vote]) -> None:
+        """Move queued votes to a batch until it is full."""
+
+        while len(batch) < self._size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+    async def _collect(self) -> None:
+        """Wait for a batch of votes.
+
+        The batch is kept on the batcher, so votes collected before it is
+        cancelled are still drained.
+        """
+
+        self._batch.append(await self._queue.get())
+        deadline = monotonic() + self._interval
+        self._take(self._batch)
+
+        while len(self._batch) < self._size:
+            timeout = deadline - monotonic()
+
+            if timeout <= 0:
+                break
+
+            try:
+                self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+            self._take(self._batch)
+
+    async def _flush(
+        self, batch: list[Vote], submit: Callable[[Vote], Awaitable[None]]
+    ) -> None:
+        """Submit a batch of votes, retrying failed votes."""
+
+        start = monotonic()
+        pending = batch
+
+        for attempt in range(self._retries + 1):
+            if attempt > 0:
+                self._metrics.votes_submitted.labels("retry").inc(len(pending))
+                await asyncio.sleep(self._backoff * 2 ** (attempt - 1))
+
+            results = await asyncio.gather(
+                *(submit(vote) for vote in pending), return_exceptions=True
+            )
+            pending = [
+                vote
+                for vote, result in zip(pending, results)
+                if isinstance(result, Exception)
+            ]
+
+            if not pending:
+                break
+
+        end = monotonic()
+
+        failed = len(pending)
+        self._metrics.votes_batch_size.observe(len(batch))
+        self._metrics.votes_flush_duration.observe(end - start)
+        self._metrics.votes_submitted.labels("success").inc(len(batch) - failed)
+        self._metrics.votes_submitted.labels("failure").inc(failed)
+
+        for vote in batch:
+            self._metrics.votes_latency.observe(end - vote.received)
+
+    async def run(self, submit: Callable[[Vote], Awaitable[None]]) -> None:
+        """Submit queued votes until cancelled."""
+
+        while True:
+            await self._collect()
+            batch, self._batch = self._batch, []
+
+            # Batches in flight are finished, even if the batcher is cancelled
+            self._flushing = asyncio.ensure_future(self._flush(batch, submit))
+            await asyncio.shield(self._flushing)
+
+    async def drain(self, submit: Callable[[Vote], Awaitable[None]]) -> None:
+        """Submit all votes that are in flight, being collected or queued."""
+
+        if self._flushing is not None:
+            with suppress(Exception):
+                await self._flushing
+
+        batch, self._batch = self._batch, []
+        self._take(batch)
+
+        while batch:
+            await self._flush(batch, submit)
+            batch = []
+            self._take(batch)
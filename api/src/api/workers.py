@@ -0,0 +1,228 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from time import monotonic
+from typing import Any, Callable, TypeVar
+
+from api.metrics import Metrics
+
+T = TypeVar("T")
+
+
+class WorkerError(Exception):
+    """Raised when a job could not be run by a worker."""
+
+    pass
+
+
+class WorkerBusyError(WorkerError):
+    """Raised when too many jobs are waiting for a worker."""
+
+    def __init__(self) -> None:
+        super().__init__("Too many jobs are waiting for a worker.")
+
+
+class WorkerTimeoutError(WorkerError):
+    """Raised when a job takes too long."""
+
+    def __init__(self, timeout: float) -> None:
+        self._timeout = timeout
+        super().__init__(f"Job did not finish in {timeout} seconds.")
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+
+class WorkerPool:
+    """Runs CPU-bound jobs off the event loop, in a pool of worker processes.
+
+    At most one job per process runs at a time, others wait in a bounded
+    queue, so heavy work is rejected instead of piling up. Jobs and their
+    arguments must be picklable, so large data should be passed by reference,
+    e.g. as a path of a memory-mapped file.
+
+    A running process can't be interrupted, so when a job times out, the pool
+    is replaced and its processes are terminated. Other jobs running at the
+    time fail as well. Pools broken by a crashed process are replaced too.
+    When a caller stops waiting for a job that is already running, e.g. because
+    it was cancelled, the job keeps its process until it finishes.
+
+    Without processes, jobs run in threads, which can't be terminated.
+
+    Args:
+        processes: Number of worker processes, 0 to use threads.
+        queue: Maximum number of jobs waiting for a worker.
+        timeout: Maximum number of seconds a job can take.
+        start_method: How worker processes are started.
+        metrics: Metrics to update.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        queue: int,
+        timeout: float,
+        start_method: str,
+        metrics: Metrics,
+    ) -> None:
+        self._processes = processes
+        self._queue = queue
+        self._timeout = timeout
+        self._start_method = start_method
+        self._metrics = metrics
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots = asyncio.Semaphore(max(processes, 1))
+        self._waiting = 0
+        self._running = 0
+
+    @property
+    def waiting(self) -> int:
+        """Get number of jobs waiting for a worker."""
+
+        return self._waiting
+
+    @property
+    def running(self) -> int:
+        """Get number of running jobs."""
+
+        return self._running
+
+    def _create(self) -> ProcessPoolExecutor:
+        """Create a pool of worker processes."""
+
+        return ProcessPoolExecutor(
+            max_workers=self._processes,
+            mp_context=multiprocessing.get_context(self._start_method),
+        )
+
+    def start(self) -> None:
+        """Start the worker processes."""
+
+        if self._processes > 0 and self._executor is None:
+            self._executor = self._create()
+
+    async def close(self) -> None:
+        """Stop the worker processes, cancelling waiting jobs."""
+
+        executor, self._executor = self._executor, None
+
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, cancel_futures=True)
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        """Replace a pool that is broken or has a job that can't be interrupted."""
+
+        if self._executor is executor:
+            self._executor = self._create()
+
+        # Executors can't cancel running jobs, only their processes can be
+        # stopped. Executors don't expose them, so this relies on the private
+        # _processes mapping of CPython's ProcessPoolExecutor (3.8 to 3.13).
+        processes = getattr(executor, "_processes", None) or {}
+
+        for process in list(processes.values()):
+            process.terminate()
+
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self) -> None:
+        """Free the slot of a job that left its process."""
+
+        self._running -= 1
+        self._slots.release()
+
+    def _submit(self, executor: ProcessPoolExecutor, job: Callable[[], T]) -> Future:
+        """Submit a job, holding its slot until it leaves its process.
+
+        Jobs whose callers stopped waiting are still running, so their slots
+        are released only once they finish, fail or are cancelled.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        def _done(_: Future) -> None:
+            # Done callbacks run in a thread of the executor
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:
+                # The loop is closed, so the pool is gone as well
+                pass
+
+        try:
+            future = executor.submit(job)
+        except Exception:
+            self._release()
+            raise
+
+        future.add_done_callback(_done)
+        return future
+
+    async def _execute(
+        self, executor: ProcessPoolExecutor | None, func: Callable[..., T], *args: Any
+    ) -> T:
+        """Execute a job in a worker process or a thread."""
+
+        try:
+            if executor is None:
+                future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+            else:
+                future = asyncio.wrap_future(
+                    self._submit(executor, partial(func, *args))
+                )
+
+            return await asyncio.wait_for(future, self._timeout)
+        except asyncio.TimeoutError as e:
+            if executor is not None:
+                self._recycle(executor)
+
+            raise WorkerTimeoutError(self._timeout) from e
+        except BrokenProcessPool as e:
+            self._recycle(executor)
+            raise WorkerError("Worker process stopped unexpectedly.") from e
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a job and wait for its result."""
+
+        job = getattr(func, "__qualname__", type(func).__qualname__)
+
+        if self._processes > 0:
+            if self._slots.locked() and self._waiting >= self._queue:
+                self._metrics.worker_jobs.labels(job, "rejected").inc()
+                raise WorkerBusyError()
+
+            self._waiting += 1
+
+            try:
+                await self._slots.acquire()
+            finally:
+                self._waiting -= 1
+
+        self._running += 1
+        executor = self._executor
+        start = monotonic()
+        result = "success"
+
+        try:
+            return await self._execute(executor, func, *args)
+        except WorkerTimeoutError:
+            result = "timeout"
+            raise
+        except asyncio.CancelledError:
+            result = "cancelled"
+            raise
+        except Exception:
+            result = "failure"
+            raise
+        finally:
+            # Slots of jobs in processes are freed once the jobs leave them
+            if executor is None:
+                self._running -= 1
+
+                if self._processes > 0:
+                    self._slots.release()
+
+            self._metrics.worker_jobs.labels(job, result).inc()
+            self._metrics.worker_duration.labels(job).observe(monotonic() - start)
@@ -0,0 +1,158 @@
+from datetime import date
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from api.models import data as dm
+from api.results.aggregate import ResultsAggregator
+
+COMMON = {"description": None, "required": False, "default": None}
+
+OPTIONS = [
+    dm.RadioFormFieldOption(id="a", title="A", value="a"),
+    dm.RadioFormFieldOption(id="b", title="B", value="b"),
+    dm.RadioFormFieldOption(id="c", title="C", value="c"),
+]
+
+FORM = dm.Form(
+    id="form",
+    title="Form",
+    fields=[
+        dm.RadioFormField(id="radio", title="Radio", options=OPTIONS, **COMMON),
+        dm.CheckboxFormField(
+            id="checkbox",
+            title="Checkbox",
+            options=[
+                dm.CheckboxFormFieldOption(**option.model_dump()) for option in OPTIONS
+            ],
+            **COMMON,
+        ),
+        dm.YesNoFormField(id="yesno", title="Yes/No", **COMMON),
+        dm.SliderFormField(
+            id="slider", title="Slider", min=0, max=10, step=2.5, **COMMON
+        ),
+        dm.NumberFormField(id="number", title="Number", **COMMON),
+        dm.DateFormField(id="date", title="Date", **COMMON),
+        dm.TextFormField(id="text", title="Text", **COMMON),
+    ],
+)
+
+NUMBERS = [1.0, 2.0, None, float("nan"), 3.0, float("inf"), 10.0]
+
+TABLE = pa.table(
+    {
+        "radio": pa.array(["a", "b", "a", None, "a", "x", None], pa.string()),
+        "checkbox": pa.array(
+            [["a", "b"], [], None, ["c"], ["a"], ["b", "c"], None],
+            pa.list_(pa.string()),
+        ),
+        "yesno": pa.array([True, False, True, None, True, None, False], pa.bool_()),
+        "slider": pa.array([0, 2.5, 2.5, 10, None, 7.5, 10], pa.float64()),
+        "number": pa.array(NUMBERS, pa.float64()),
+        "date": pa.array(
+            [date(2024, 1, 2), date(2024, 1, 1), None, date(2024, 1, 2)] + [None] * 3,
+            pa.date32(),
+        ),
+        "text": pa.array(["x", None, "y", None, None, "z", ""], pa.string()),
+    }
+)
+
+
+@pytest.fixture
+def results() -> dict[str, dm.FieldResults]:
+    aggregated = ResultsAggregator(bins=4, max_bins=10).aggregate(FORM, TABLE)
+
+    assert aggregated.id == "form"
+    assert aggregated.submissions == 7
+
+    return {field.id: field for field in aggregated.fields}
+
+
+def counts(results: dm.OptionsFieldResults) -> dict[str, int]:
+    return {option.value: option.count for option in results.options}
+
+
+def test_options(results: dict[str, dm.FieldResults]) -> None:
+    radio = results["radio"]
+    checkbox = results["checkbox"]
+
+    assert radio.answered == 5
+    assert counts(radio) == {"a": 3, "b": 1, "c": 0}
+    assert checkbox.answered == 4
+    assert counts(checkbox) == {"a": 2, "b": 2, "c": 2}
+
+
+def test_yesno(results: dict[str, dm.FieldResults]) -> None:
+    yesno = results["yesno"]
+
+    assert (yesno.answered, yesno.yes, yesno.no) == (5, 3, 2)
+    assert yesno.ratio == pytest.approx(0.6)
+
+
+def test_slider_bins_are_centered_on_positions(
+    results: dict[str, dm.FieldResults]
+) -> None:
+    histogram = results["slider"].histogram
+
+    assert [(bin.start, bin.end) for bin in histogram] == [
+        (-1.25, 1.25),
+        (1.25, 3.75),
+        (3.75, 6.25),
+        (6.25, 8.75),
+        (8.75, 11.25),
+    ]
+    assert [bin.count for bin in histogram] == [1, 2, 0, 1, 2]
+
+
+def test_slider_falls_back_to_bins() -> None:
+    aggregator = ResultsAggregator(bins=4, max_bins=10)
+    fine = dm.SliderFormField(
+        id="slider", title="Slider", min=0, max=100, step=1, **COMMON
+    )
+    coarse = dm.SliderFormField(
+        id="slider", title="Slider", min=0, max=10, step=0, **COMMON
+    )
+
+    assert aggregator.edges(fine) == 4
+    assert aggregator.edges(coarse) == 4
+
+
+def test_numeric_skips_non_finite_values(results: dict[str, dm.FieldResults]) -> None:
+    number = results["number"]
+    values = np.array([1.0, 2.0, 3.0, 10.0])
+
+    assert number.answered == 4
+    assert number.mean == pytest.approx(4.0)
+    assert (number.min, number.max) == (1.0, 10.0)
+    assert number.quantiles == {
+        str(percentile): pytest.approx(np.percentile(values, percentile))
+        for percentile in ResultsAggregator.PERCENTILES
+    }
+    assert len(number.histogram) == 4
+    assert sum(bin.count for bin in number.histogram) == 4
+
+
+def test_numeric_without_values() -> None:
+    table = pa.table({"number": pa.array([None, float("nan")], pa.float64())})
+    form = FORM.model_copy(update={"fields": [FORM.fields[4]]})
+
+    (number,) = ResultsAggregator(bins=4, max_bins=10).aggregate(form, table).fields
+
+    assert number.answered == 0
+    assert number.mean is None
+    assert number.histogram == []
+
+
+def test_date(results: dict[str, dm.FieldResults]) -> None:
+    histogram = results["date"].histogram
+
+    assert results["date"].answered == 3
+    assert [(day.day, day.count) for day in histogram] == [
+        (date(2024, 1, 1), 1),
+        (date(2024, 1, 2), 2),
+    ]
+
+
+def test_text(results: dict[str, dm.FieldResults]) -> None:
+    assert results["text"].answered == 4
@@ -0,0 +1,250 @@
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+
+import httpx
+import pytest
+from gql import gql
+from gql.transport.exceptions import TransportProtocolError
+
+from api.graphql import errors as ge
+from api.graphql import models as gm
+from api.graphql.batching import BatchingHTTPXTransport
+from api.graphql.client import GraphQLRawClient
+
+pytestmark = pytest.mark.anyio
+
+QUERY = gql("query echo($id: ID!) { echo(id: $id) }")
+
+
+class Server:
+    """GraphQL server echoing the ID of every operation.
+
+    Operations with an ID starting with "error" fail, and operations with an
+    ID starting with "broken" get an answer that is not a GraphQL result.
+    """
+
+    def __init__(self) -> None:
+        self.requests: list[dict | list] = []
+
+    def _answer(self, payload: dict) -> dict:
+        id = payload["variables"]["id"]
+
+        if id.startswith("error"):
+            return {"data": None, "errors": [{"message": f"failed {id}"}]}
+
+        if id.startswith("broken"):
+            return {"unexpected": id}
+
+        return {"data": {"echo": id}}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        self.requests.append(payload)
+
+        if isinstance(payload, list):
+            return httpx.Response(200, json=[self._answer(p) for p in payload])
+
+        return httpx.Response(200, json=self._answer(payload))
+
+
+@pytest.fixture
+def server() -> Server:
+    return Server()
+
+
+@pytest.fixture
+def sizes() -> list[int]:
+    return []
+
+
+@pytest.fixture
+async def transport(
+    server: Server, sizes: list[int]
+) -> AsyncGenerator[BatchingHTTPXTransport, None]:
+    transport = BatchingHTTPXTransport(
+        url="http://graphql/graphql",
+        window=0.05,
+        size=3,
+        on_batch=sizes.append,
+        transport=httpx.MockTransport(server.handle),
+    )
+    await transport.connect()
+
+    try:
+        yield transport
+    finally:
+        await transport.close()
+
+
+async def echo(
+    transport: BatchingHTTPXTransport, id: str, headers: dict | None = None
+) -> str:
+    result = await transport.execute(
+        QUERY, variable_values={"id": id}, extra_args={"headers": headers or {}}
+    )
+
+    if result.errors:
+        raise RuntimeError(result.errors[0]["message"])
+
+    return result.data["echo"]
+
+
+async def test_results_are_routed_to_callers(
+    transport: BatchingHTTPXTransport, server: Server, sizes: list[int]
+) -> None:
+    results = await asyncio.gather(
+        echo(transport, "a"),
+        echo(transport, "error1"),
+        echo(transport, "b"),
+        return_exceptions=True,
+    )
+
+    assert results[0] == "a"
+    assert isinstance(results[1], RuntimeError)
+    assert str(results[1]) == "failed error1"
+    assert results[2] == "b"
+    assert sizes == [3]
+    assert len(server.requests) == 1
+    assert [p["variables"]["id"] for p in server.requests[0]] == ["a", "error1", "b"]
+
+
+async def test_invalid_results_fail_only_their_callers(
+    transport: BatchingHTTPXTransport,
+) -> None:
+    results = await asyncio.gather(
+        echo(transport, "a"), echo(transport, "broken"), return_exceptions=True
+    )
+
+    assert results[0] == "a"
+    assert isinstance(results[1], TransportProtocolError)
+
+
+async def test_full_batches_are_split(
+    transport: BatchingHTTPXTransport, server: Server, sizes: list[int]
+) -> None:
+    ids = [f"id{i}" for i in range(7)]
+
+    assert await asyncio.gather(*(echo(transport, id) for id in ids)) == ids
+    assert sizes == [3, 3, 1]
+    # The last batch holds a single operation, which is sent as a plain request
+    assert isinstance(server.requests[-1], dict)
+
+
+async def test_single_operations_are_not_batched(
+    transport: BatchingHTTPXTransport, server: Server, sizes: list[int]
+) -> None:
+    assert await echo(transport, "a") == "a"
+    assert sizes == [1]
+    assert server.requests == [
+        {"query": server.requests[0]["query"], "variables": {"id": "a"}}
+    ]
+
+
+async def test_operations_with_other_headers_are_sent_apart(
+    transport: BatchingHTTPXTransport, server: Server
+) -> None:
+    results = await asyncio.gather(
+        echo(transport, "a", {"Authorization": "Bearer 1"}),
+        echo(transport, "b", {"Authorization": "Bearer 2"}),
+    )
+
+    assert results == ["a", "b"]
+    assert len(server.requests) == 2
+
+
+async def test_cancelled_callers_are_left_out(
+    transport: BatchingHTTPXTransport, server: Server, sizes: list[int]
+) -> None:
+    tasks = [asyncio.create_task(echo(transport, id)) for id in ("a", "b", "c")]
+    await asyncio.sleep(0)
+    tasks[1].cancel()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert results[0] == "a"
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert results[2] == "c"
+    assert sizes == [2]
+    assert [p["variables"]["id"] for p in server.requests[0]] == ["a", "c"]
+
+
+async def test_mismatched_answers_fail_the_batch(sizes: list[int]) -> None:
+    def handle(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=[{"data": {"echo": "a"}}])
+
+    transport = BatchingHTTPXTransport(
+        url="http://graphql/graphql",
+        window=0.05,
+        size=3,
+        transport=httpx.MockTransport(handle),
+    )
+    await transport.connect()
+
+    try:
+        results = await asyncio.gather(
+            echo(transport, "a"), echo(transport, "b"), return_exceptions=True
+        )
+    finally:
+        await transport.close()
+
+    assert all(isinstance(result, TransportProtocolError) for result in results)
+
+
+async def test_close_sends_waiting_batches(server: Server) -> None:
+    transport = BatchingHTTPXTransport(
+        url="http://graphql/graphql",
+        window=60.0,
+        size=10,
+        transport=httpx.MockTransport(server.handle),
+    )
+    await transport.connect()
+
+    tasks = [asyncio.create_task(echo(transport, id)) for id in ("a", "b")]
+    await asyncio.sleep(0)
+    await transport.close()
+
+    assert await asyncio.gather(*tasks) == ["a", "b"]
+
+
+async def test_client_routes_errors_of_batched_reads(server: Server) -> None:
+    def handle(request: httpx.Request) -> httpx.Response:
+        payloads = json.loads(request.content)
+        server.requests.append(payloads)
+
+        def answer(payload: dict) -> dict:
+            id = payload["variables"]["id"]
+
+            if id == "missing":
+                return {
+                    "data": None,
+                    "errors": [
+                        {
+                            "message": "invalid id passed",
+                            "extensions": {"code": "INTERNAL_SERVER_ERROR"},
+                        }
+                    ],
+                }
+
+            return {"data": {"form": {"id": id, "title": id, "fields": []}}}
+
+        return httpx.Response(200, json=[answer(p) for p in payloads])
+
+    client = GraphQLRawClient("http://graphql/graphql", batch_size=4, batch_window=0.05)
+    # Route the HTTPX client of the transport to the handler
+    client._client.transport.kwargs["transport"] = httpx.MockTransport(handle)
+    tokens = gm.Tokens(access="access", refresh="refresh")
+
+    async with client:
+        results = await asyncio.gather(
+            *(
+                client.get_form(gm.GetFormRequest(id=id), tokens)
+                for id in ("a", "missing", "b")
+            ),
+            return_exceptions=True,
+        )
+
+    assert results[0].form.id == "a"
+    assert isinstance(results[1], ge.NotFoundError)
+    assert results[2].form.id == "b"
+    assert len(server.requests) == 1
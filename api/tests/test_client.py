@@ -0,0 +1,73 @@
+import json
+
+import httpx
+import pytest
+
+from api.graphql import models as gm
+from api.graphql.client import GraphQLRawClient
+
+pytestmark = pytest.mark.anyio
+
+TOKENS = gm.Tokens(access="access", refresh="refresh")
+
+
+def form(fields: dict) -> dict:
+    return {"id": "form", "title": "Form", "fields": [fields]}
+
+
+@pytest.fixture
+def queries() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def client(queries: list[str]) -> GraphQLRawClient:
+    def handle(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        queries.append(payload["query"])
+        field = {"id": "field", "idx": 0, "type": "textfield", "title": "Field"}
+        return httpx.Response(200, json={"data": {"form": form(field)}})
+
+    client = GraphQLRawClient("http://graphql/graphql")
+    # Route the HTTPX client of the transport to the handler
+    client._client.transport.kwargs["transport"] = httpx.MockTransport(handle)
+    return client
+
+
+async def test_selection_reduces_query(
+    client: GraphQLRawClient, queries: list[str]
+) -> None:
+    request = gm.GetFormRequest(id="form", selection=frozenset({"title"}))
+
+    async with client:
+        response = await client.get_form(request, TOKENS)
+
+    assert response.form.fields[0].title == "Field"
+    assert response.form.fields[0].options == []
+    assert "title" in queries[0]
+    assert "description" not in queries[0]
+    assert "options" not in queries[0]
+
+
+async def test_full_query_without_selection(
+    client: GraphQLRawClient, queries: list[str]
+) -> None:
+    async with client:
+        await client.get_form(gm.GetFormRequest(id="form"), TOKENS)
+
+    for attribute in ("description", "required", "defaultValue", "options"):
+        assert attribute in queries[0]
+
+
+def test_queries_are_cached_per_selection(client: GraphQLRawClient) -> None:
+    title = client._get_form_query(frozenset({"title"}))
+
+    assert client._get_form_query(frozenset({"title"})) is title
+    assert client._get_form_query(frozenset({"options"})) is not title
+    assert client._get_form_query(None) is client._get_form_query(None)
+
+
+def test_selection_is_not_sent_as_variable() -> None:
+    request = gm.GetFormRequest(id="form", selection=frozenset({"title"}))
+
+    assert request.model_dump(mode="json") == {"id": "form"}
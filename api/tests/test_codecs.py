@@ -0,0 +1,118 @@
+from datetime import date
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from api.api.routes.forms.models import (
+    GetResponse,
+    ListResponse,
+    SubmitRequest,
+    SubmitResponse,
+)
+from api.api.routes.results.models import ResultsResponse
+from api.codecs import Codec, CodecError, MsgspecCodec, OrjsonCodec
+from api.models import data as dm
+
+MODELS = [
+    ListResponse(
+        pager=dm.FormPager(
+            entries=[dm.FormPagerEntry(id="form", title='Größe ✓   "quoted"')],
+            total=1,
+            limit=10,
+            start=0,
+        )
+    ),
+    GetResponse(
+        form=dm.Form(
+            id="form",
+            title="Form",
+            fields=[
+                dm.RadioFormField(
+                    id="radio",
+                    title="Radio",
+                    description=None,
+                    required=True,
+                    options=[dm.RadioFormFieldOption(id="a", title=None, value="a")],
+                    default="a",
+                ),
+                dm.SliderFormField(
+                    id="slider",
+                    title="Slider",
+                    description="Tab\there",
+                    required=False,
+                    min=-1e20,
+                    max=1e20,
+                    step=0.1,
+                    default=1e-7,
+                ),
+                dm.DateFormField(
+                    id="date",
+                    title="Date",
+                    description=None,
+                    required=False,
+                    default=date(2024, 2, 29),
+                ),
+                dm.CheckboxFormField(
+                    id="checkbox",
+                    title="Checkbox",
+                    description=None,
+                    required=False,
+                    options=[],
+                    default=["x", "y"],
+                ),
+            ],
+        )
+    ),
+    SubmitResponse(confirmation=dm.SubmissionConfirmation(submission="submission")),
+    ResultsResponse(
+        results=dm.FormResults(
+            id="form",
+            submissions=3,
+            fields=[
+                dm.NumericFieldResults(
+                    id="slider",
+                    answered=3,
+                    mean=1 / 3,
+                    stddev=0.0,
+                    min=0.0,
+                    max=1.5,
+                    quantiles={"50": 0.25},
+                    histogram=[dm.HistogramBin(start=0.0, end=1.5, count=3)],
+                ),
+                dm.YesNoFieldResults(id="yesno", answered=0, yes=0, no=0, ratio=None),
+            ],
+        )
+    ),
+]
+
+
+@pytest.fixture(params=[MsgspecCodec, OrjsonCodec])
+def codec(request: pytest.FixtureRequest) -> Codec:
+    return request.param()
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: type(model).__name__)
+def test_encode_matches_pydantic(codec: Codec, model: BaseModel) -> None:
+    assert codec.encode(model) == model.model_dump_json(by_alias=True).encode()
+
+
+def test_validate_uses_aliases(codec: Codec) -> None:
+    data = (
+        b'{"submission":{"metadata":{"device":{"type":"desktop","name":"test"}},'
+        b'"fields":{"radio":"a"}},"resume":{"submission":"s","token":"t"}}'
+    )
+
+    request = codec.validate(data, SubmitRequest)
+
+    assert request == SubmitRequest.model_validate_json(data)
+    assert codec.encode(request) == request.model_dump_json(by_alias=True).encode()
+
+
+def test_validate_rejects_invalid_json(codec: Codec) -> None:
+    with pytest.raises(CodecError):
+        codec.validate(b"{", SubmitRequest)
+
+
+def test_validate_rejects_invalid_models(codec: Codec) -> None:
+    with pytest.raises(ValidationError):
+        codec.validate(b'{"submission":{}}', SubmitRequest)
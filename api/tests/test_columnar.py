@@ -0,0 +1,113 @@
+import multiprocessing
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+
+from api.models import data as dm
+from api.results.columnar import ResultsStore
+
+FORM = dm.Form(
+    id="form",
+    title="Form",
+    fields=[
+        dm.NumberFormField(
+            id="number", title="Number", description=None, required=False, default=None
+        )
+    ],
+)
+
+
+def submissions(start: int, stop: int) -> list[dm.ExportedSubmission]:
+    return [
+        dm.ExportedSubmission(
+            id=f"s{i}",
+            created="2024-01-01T00:00:00+00:00",
+            last_modified=None,
+            complete=100.0,
+            fields={"number": i},
+        )
+        for i in range(start, stop)
+    ]
+
+
+def append(path: str, start: int, stop: int) -> None:
+    store = ResultsStore(path)
+
+    for i in range(start, stop, 10):
+        store.append(FORM, "v1", submissions(i, i + 10), i + 10)
+
+
+def test_append(tmp_path: Path) -> None:
+    store = ResultsStore(str(tmp_path))
+
+    store.append(FORM, "v1", submissions(0, 5), 5)
+    manifest = store.append(FORM, "v1", submissions(5, 8), 10)
+
+    assert manifest.submissions == 10
+    assert len(manifest.segments) == 2
+    assert store.ids("form") == {f"s{i}" for i in range(8)}
+
+
+def test_append_skips_known_submissions(tmp_path: Path) -> None:
+    store = ResultsStore(str(tmp_path))
+
+    store.append(FORM, "v1", submissions(0, 5), 5)
+    manifest = store.append(FORM, "v1", submissions(3, 8), 8)
+
+    assert store.read("form").column("submission").to_pylist() == [
+        f"s{i}" for i in range(8)
+    ]
+    assert manifest.submissions == 8
+
+
+def test_concurrent_appends_keep_all_segments(tmp_path: Path) -> None:
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=append, args=(str(tmp_path), start, start + 200))
+        for start in (0, 200, 400, 600)
+    ]
+
+    for process in processes:
+        process.start()
+
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    store = ResultsStore(str(tmp_path))
+    ids = store.read("form").column("submission").to_pylist()
+
+    assert sorted(ids) == sorted(f"s{i}" for i in range(800))
+
+
+def test_clear_keeps_lock_files(tmp_path: Path) -> None:
+    store = ResultsStore(str(tmp_path))
+
+    store.append(FORM, "v1", submissions(0, 5), 5)
+    store.clear("form")
+
+    assert store.manifest("form") is None
+    assert (tmp_path / ResultsStore.LOCKS / "form").exists()
+
+
+def test_read_closes_segment_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = ResultsStore(str(tmp_path))
+    sources = []
+    memory_map = pa.memory_map
+
+    def _memory_map(path: str) -> pa.MemoryMappedFile:
+        sources.append(memory_map(path))
+        return sources[-1]
+
+    for i in range(0, 30, 10):
+        store.append(FORM, "v1", submissions(i, i + 10), i + 10)
+
+    monkeypatch.setattr(pa, "memory_map", _memory_map)
+    table = store.read("form")
+
+    assert len(sources) == 3
+    assert all(source.closed for source in sources)
+    assert table.column("number").to_pylist() == list(range(30))
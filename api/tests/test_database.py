@@ -0,0 +1,248 @@
+import os
+from collections.abc import AsyncGenerator
+from uuid import uuid4
+
+import asyncpg
+import pytest
+from hashids import Hashids
+
+from api.database.client import DatabaseClient
+from api.database.errors import ConnectError, NotFoundError
+from api.graphql.models import GetFormRequest
+
+pytestmark = pytest.mark.anyio
+
+SALT = "secret"
+MIN_LENGTH = 10
+
+# Subset of the tables of the GraphQL service that forms are read from
+SCHEMA = """
+    CREATE TABLE form (
+      id SERIAL PRIMARY KEY,
+      title VARCHAR NOT NULL
+    );
+    CREATE TABLE form_field (
+      id SERIAL PRIMARY KEY,
+      "formId" INTEGER REFERENCES form (id),
+      idx INTEGER,
+      type VARCHAR NOT NULL,
+      title VARCHAR NOT NULL,
+      description TEXT NOT NULL,
+      required BOOLEAN NOT NULL,
+      "defaultValue" TEXT
+    );
+    CREATE TABLE form_field_option (
+      id SERIAL PRIMARY KEY,
+      "fieldId" INTEGER REFERENCES form_field (id),
+      title VARCHAR,
+      value VARCHAR NOT NULL
+    );
+"""
+
+
+def connection() -> dict:
+    """Get connection parameters of the test server from the environment."""
+
+    return {
+        "host": os.environ.get("PGHOST", "localhost"),
+        "port": int(os.environ.get("PGPORT", "5432")),
+        "user": os.environ.get("PGUSER", "postgres"),
+        "password": os.environ.get("PGPASSWORD", ""),
+    }
+
+
+@pytest.fixture
+async def database() -> AsyncGenerator[str, None]:
+    """Create a database with the tables of forms, dropped afterwards."""
+
+    try:
+        admin = await asyncpg.connect(**connection(), database="postgres", timeout=2)
+    except (OSError, asyncpg.PostgresError) as e:
+        pytest.skip(f"Postgres is not reachable: {e}")
+
+    name = f"test_{uuid4().hex}"
+    await admin.execute(f"CREATE DATABASE {name}")
+
+    try:
+        conn = await asyncpg.connect(**connection(), database=name)
+
+        try:
+            await conn.execute(SCHEMA)
+        finally:
+            await conn.close()
+
+        yield name
+    finally:
+        await admin.execute(f"DROP DATABASE {name}")
+        await admin.close()
+
+
+@pytest.fixture
+async def conn(database: str) -> AsyncGenerator[asyncpg.Connection, None]:
+    conn = await asyncpg.connect(**connection(), database=database)
+
+    try:
+        yield conn
+    finally:
+        await conn.close()
+
+
+@pytest.fixture
+async def client(database: str) -> AsyncGenerator[DatabaseClient, None]:
+    client = DatabaseClient(
+        **connection(),
+        name=database,
+        salt=SALT,
+        min_length=MIN_LENGTH,
+        pool_min=0,
+        pool_max=2,
+        timeout=5.0,
+        backoff=0.0,
+    )
+
+    async with client:
+        yield client
+
+
+async def insert_form(conn: asyncpg.Connection, title: str) -> int:
+    return await conn.fetchval(
+        "INSERT INTO form (title) VALUES ($1) RETURNING id", title
+    )
+
+
+async def insert_field(
+    conn: asyncpg.Connection,
+    form: int,
+    idx: int,
+    type: str,
+    default: str | None = None,
+) -> int:
+    return await conn.fetchval(
+        """
+        INSERT INTO form_field
+          ("formId", idx, type, title, description, required, "defaultValue")
+        VALUES ($1, $2, $3, $4, '', false, $5)
+        RETURNING id
+        """,
+        form,
+        idx,
+        type,
+        f"Field {idx}",
+        default,
+    )
+
+
+async def insert_option(
+    conn: asyncpg.Connection, field: int, value: str, title: str | None = None
+) -> int:
+    return await conn.fetchval(
+        """
+        INSERT INTO form_field_option ("fieldId", title, value)
+        VALUES ($1, $2, $3)
+        RETURNING id
+        """,
+        field,
+        title,
+        value,
+    )
+
+
+async def test_ids_round_trip(client: DatabaseClient, conn: asyncpg.Connection) -> None:
+    hashids = Hashids(salt=SALT, min_length=MIN_LENGTH)
+    form = await insert_form(conn, "Form")
+    field = await insert_field(conn, form, 0, "radio")
+    option = await insert_option(conn, field, "a", "A")
+
+    id = hashids.encode(form)
+    response = await client.get_form(GetFormRequest(id=id))
+
+    assert response.form.id == id
+    assert response.form.title == "Form"
+    assert [hashids.decode(f.id) for f in response.form.fields] == [(field,)]
+    assert hashids.decode(response.form.fields[0].options[0].id) == (option,)
+
+
+async def test_fields_are_ordered_by_index(
+    client: DatabaseClient, conn: asyncpg.Connection
+) -> None:
+    form = await insert_form(conn, "Form")
+    await insert_field(conn, form, 1, "textfield")
+    await insert_field(conn, form, 0, "number", default="5")
+
+    id = Hashids(salt=SALT, min_length=MIN_LENGTH).encode(form)
+    response = await client.get_form(GetFormRequest(id=id))
+
+    assert [f.idx for f in response.form.fields] == [0, 1]
+    assert response.form.fields[0].default_value == "5"
+
+
+async def test_empty_form(client: DatabaseClient, conn: asyncpg.Connection) -> None:
+    form = await insert_form(conn, "Empty")
+
+    id = Hashids(salt=SALT, min_length=MIN_LENGTH).encode(form)
+    response = await client.get_form(GetFormRequest(id=id))
+
+    assert response.form.title == "Empty"
+    assert response.form.fields == []
+
+
+async def test_slider_options_keep_order(
+    client: DatabaseClient, conn: asyncpg.Connection
+) -> None:
+    form = await insert_form(conn, "Slider")
+    slider = await insert_field(conn, form, 0, "slider")
+    other = await insert_field(conn, form, 1, "radio")
+
+    # Options of another field are interleaved, bounds are min, max and step
+    await insert_option(conn, slider, "0")
+    await insert_option(conn, other, "x", "X")
+    await insert_option(conn, slider, "10")
+    await insert_option(conn, other, "y", "Y")
+    await insert_option(conn, slider, "2")
+
+    id = Hashids(salt=SALT, min_length=MIN_LENGTH).encode(form)
+    response = await client.get_form(GetFormRequest(id=id))
+    fields = response.form.fields
+
+    assert [o.value for o in fields[0].options] == ["0", "10", "2"]
+    assert [o.value for o in fields[1].options] == ["x", "y"]
+
+
+async def test_missing_form(client: DatabaseClient) -> None:
+    id = Hashids(salt=SALT, min_length=MIN_LENGTH).encode(12345)
+
+    with pytest.raises(NotFoundError):
+        await client.get_form(GetFormRequest(id=id))
+
+
+async def test_invalid_id(client: DatabaseClient) -> None:
+    with pytest.raises(NotFoundError):
+        await client.get_form(GetFormRequest(id="not a hashid"))
+
+
+async def test_unreachable_database() -> None:
+    states = []
+    client = DatabaseClient(
+        host="127.0.0.1",
+        port=1,
+        user="user",
+        password="password",
+        name="database",
+        salt=SALT,
+        min_length=MIN_LENGTH,
+        pool_min=1,
+        pool_max=1,
+        timeout=1.0,
+        backoff=60.0,
+        on_state=states.append,
+    )
+    id = Hashids(salt=SALT, min_length=MIN_LENGTH).encode(1)
+
+    with pytest.raises(ConnectError):
+        await client.get_form(GetFormRequest(id=id))
+
+    # Calls fail fast during the backoff, without reporting the state again
+    with pytest.raises(ConnectError, match="recently"):
+        await client.get_form(GetFormRequest(id=id))
+
+    assert states == [False]
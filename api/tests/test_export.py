@@ -0,0 +1,49 @@
+import csv
+import io
+
+from api.export import CsvExporter
+from api.models import data as dm
+
+
+def form(*titles: str) -> dm.Form:
+    return dm.Form(
+        id="form",
+        title="Form",
+        fields=[
+            dm.TextFormField(
+                id=f"field{i}",
+                title=title,
+                description=None,
+                required=False,
+                default=None,
+            )
+            for i, title in enumerate(titles)
+        ],
+    )
+
+
+def parse(data: bytes) -> list[list[str]]:
+    return list(csv.reader(io.StringIO(data.decode())))
+
+
+def test_header_escapes_formulas() -> None:
+    exporter = CsvExporter(form('=HYPERLINK("x")', "+1", "-1", "@SUM(A1)", "Name"))
+
+    [header] = parse(exporter.header())
+
+    assert header[4:] == ['\'=HYPERLINK("x")', "'+1", "'-1", "'@SUM(A1)", "Name"]
+
+
+def test_rows_escape_formulas() -> None:
+    exporter = CsvExporter(form("Text"))
+    submission = dm.ExportedSubmission(
+        id="s0",
+        created="2024-01-01T00:00:00+00:00",
+        last_modified=None,
+        complete=100.0,
+        fields={"field0": "=1+1"},
+    )
+
+    [row] = parse(exporter.rows([submission]))
+
+    assert row[4] == "'=1+1"
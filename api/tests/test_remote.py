@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from api.cache.remote import RemoteFormCache
+from api.models import data as dm
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def server() -> FakeServer:
+    return FakeServer()
+
+
+@pytest.fixture
+def redis(server: FakeServer) -> FakeRedis:
+    return FakeRedis(server=server)
+
+
+@pytest.fixture
+def form() -> dm.Form:
+    return dm.Form(
+        id="form",
+        title="Form",
+        fields=[
+            dm.DropdownFormField(
+                id="field",
+                title="Field",
+                description=None,
+                required=True,
+                options=[dm.DropdownFormFieldOption(id="a", title="A", value="a")],
+                default=None,
+            )
+        ],
+    )
+
+
+def build(
+    redis: FakeRedis, ttl: float = 60.0, backoff: float = 60.0
+) -> RemoteFormCache:
+    return RemoteFormCache(redis, ttl=ttl, prefix="test", backoff=backoff)
+
+
+async def test_get_missing(redis: FakeRedis) -> None:
+    cache = build(redis)
+
+    assert await cache.get("form") is None
+
+
+async def test_put_and_get(redis: FakeRedis, form: dm.Form) -> None:
+    cache = build(redis)
+
+    await cache.put(form)
+
+    assert await cache.get("form") == form
+    assert await redis.exists("test:forms:v1:form") == 1
+
+
+async def test_put_sets_ttl(redis: FakeRedis, form: dm.Form) -> None:
+    cache = build(redis, ttl=60.0)
+
+    await cache.put(form)
+
+    assert 0 < await redis.pttl("test:forms:v1:form") <= 60000
+
+
+async def test_entries_expire(redis: FakeRedis, form: dm.Form) -> None:
+    cache = build(redis, ttl=0.05)
+
+    await cache.put(form)
+    await asyncio.sleep(0.1)
+
+    assert await cache.get("form") is None
+
+
+async def test_put_is_skipped_without_ttl(redis: FakeRedis, form: dm.Form) -> None:
+    cache = build(redis, ttl=0.0)
+
+    await cache.put(form)
+
+    assert await redis.exists("test:forms:v1:form") == 0
+
+
+async def test_invalid_entries_are_ignored(redis: FakeRedis) -> None:
+    cache = build(redis)
+
+    await redis.set("test:forms:v1:form", b"not msgpack")
+
+    assert await cache.get("form") is None
+
+
+async def test_invalidate(redis: FakeRedis, form: dm.Form) -> None:
+    cache = build(redis)
+    other = form.model_copy(update={"id": "other"})
+
+    await cache.put(form)
+    await cache.put(other)
+    await cache.invalidate("form")
+
+    assert await cache.get("form") is None
+    assert await cache.get("other") == other
+
+    await cache.invalidate()
+
+    assert await cache.get("other") is None
+
+
+async def test_falls_back_when_redis_fails(
+    server: FakeServer, redis: FakeRedis, form: dm.Form
+) -> None:
+    cache = build(redis, backoff=60.0)
+    await cache.put(form)
+
+    server.connected = False
+
+    assert await cache.get("form") is None
+    await cache.put(form.model_copy(update={"id": "other"}))
+
+    # Redis is skipped during the backoff, even once it is back
+    server.connected = True
+
+    assert await cache.get("form") is None
+    await cache.put(form.model_copy(update={"id": "other"}))
+    assert await redis.exists("test:forms:v1:other") == 0
+
+
+async def test_retries_after_backoff(
+    server: FakeServer, redis: FakeRedis, form: dm.Form
+) -> None:
+    cache = build(redis, backoff=0.0)
+
+    server.connected = False
+
+    assert await cache.get("form") is None
+
+    server.connected = True
+    await cache.put(form)
+
+    assert await cache.get("form") == form
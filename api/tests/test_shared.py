@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from api.cache.models import CachedForm
+from api.cache.shared import SharedFormCache
+from api.models import data as dm
+
+
+def cached(id: str, version: str = "v1") -> CachedForm:
+    return CachedForm(
+        form=dm.Form(id=id, title="Form", fields=[]), version=version, fetched=0.0
+    )
+
+
+def test_bodies_are_mapped(tmp_path: Path) -> None:
+    cache = SharedFormCache(str(tmp_path))
+    form = cached("form")
+
+    cache.put(form)
+    assert cache.put_body(form, "identity", b"body")
+
+    body = cache.get_body(form, "identity")
+
+    assert isinstance(body, memoryview)
+    assert body == b"body"
+    assert cache.get_body(form, "gzip") is None
+
+
+def test_mapped_bodies_survive_invalidation(tmp_path: Path) -> None:
+    cache = SharedFormCache(str(tmp_path))
+    form = cached("form")
+
+    cache.put(form)
+    cache.put_body(form, "identity", b"body")
+    body = cache.get_body(form, "identity")
+    cache.invalidate("form")
+
+    assert body == b"body"
+    assert cache.get(form.form.id) is None
+    assert cache.get_body(form, "identity") is None
+
+
+def test_new_versions_remove_old_bodies(tmp_path: Path) -> None:
+    cache = SharedFormCache(str(tmp_path))
+    old, new = cached("form", "v1"), cached("form", "v2")
+
+    cache.put(old)
+    cache.put_body(old, "identity", b"old")
+    cache.put(new)
+
+    assert cache.get_body(old, "identity") is None
+    assert cache.get(new.form.id).version == "v2"
+
+
+def test_invalidate_escapes_ids(tmp_path: Path) -> None:
+    cache = SharedFormCache(str(tmp_path))
+    forms = [cached("form"), cached("f*"), cached("[f]orm")]
+
+    for form in forms:
+        cache.put(form)
+        cache.put_body(form, "identity", b"body")
+
+    cache.invalidate("f*")
+    cache.invalidate("[f]orm")
+
+    assert cache.get("form") is not None
+    assert cache.get_body(forms[0], "identity") == b"body"
+    assert cache.get("f*") is None
+    assert cache.get("[f]orm") is None
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+
+from api.api.routes.results.service import Service
+from api.models import data as dm
+from api.results.columnar import ResultsStore
+
+pytestmark = pytest.mark.anyio
+
+FORM = dm.Form(
+    id="form",
+    title="Form",
+    fields=[
+        dm.NumberFormField(
+            id="number", title="Number", description=None, required=False, default=None
+        )
+    ],
+)
+
+
+def submissions(start: int, stop: int) -> list[dm.ExportedSubmission]:
+    return [
+        dm.ExportedSubmission(
+            id=f"s{i}",
+            created="2024-01-01T00:00:00+00:00",
+            last_modified=None,
+            complete=100.0,
+            fields={"number": i},
+        )
+        for i in range(start, stop)
+    ]
+
+
+def service(path: Path) -> Service:
+    return Service(
+        forms=None,
+        store=ResultsStore(str(path)),
+        aggregator=None,
+        tallies=None,
+        workers=None,
+        segment_size=10,
+    )
+
+
+async def test_read_streams_a_chunk_per_batch(tmp_path: Path) -> None:
+    results = service(tmp_path)
+
+    for i in range(0, 30, 10):
+        results._store.append(FORM, "v1", submissions(i, i + 10), i + 10)
+
+    chunks = list(await results.read("form"))
+    table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+
+    # One chunk per segment and one for the end of the stream
+    assert len(chunks) == 4
+    assert table.column("number").to_pylist() == list(range(30))
+
+
+async def test_read_without_snapshot(tmp_path: Path) -> None:
+    assert await service(tmp_path).read("form") is None
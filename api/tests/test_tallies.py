@@ -0,0 +1,169 @@
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from redis.exceptions import ResponseError
+
+from api.models import data as dm
+from api.results.aggregate import ResultsAggregator
+from api.results.tallies import (
+    MemoryTallyStore,
+    QuantileSketch,
+    RedisTallyStore,
+    Tallies,
+    Tally,
+    TallyStore,
+)
+
+pytestmark = pytest.mark.anyio
+
+ACCURACY = 0.01
+
+FORM = dm.Form(
+    id="form",
+    title="Form",
+    fields=[
+        dm.NumberFormField(
+            id="number", title="Number", description=None, required=False, default=None
+        ),
+        dm.RadioFormField(
+            id="radio",
+            title="Radio",
+            description=None,
+            required=False,
+            options=[
+                dm.RadioFormFieldOption(id="a", title="A", value="a"),
+                dm.RadioFormFieldOption(id="b", title="B", value="b"),
+            ],
+            default=None,
+        ),
+    ],
+)
+
+
+@pytest.fixture
+def server() -> FakeServer:
+    return FakeServer()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request: pytest.FixtureRequest, server: FakeServer) -> TallyStore:
+    if request.param == "memory":
+        return MemoryTallyStore()
+
+    return RedisTallyStore(FakeRedis(server=server), prefix="test")
+
+
+def increments(value: float) -> Tally:
+    return Tally(
+        counts={"x:answered": 1, "x:sum": value, "x:squares": value * value},
+        minimums={"x": value},
+        maximums={"x": value},
+    )
+
+
+def test_sketch_values_are_within_accuracy() -> None:
+    sketch = QuantileSketch(accuracy=ACCURACY)
+
+    for value in (-1234.5, -1.0, 0.001, 0.5, 1.0, 7.0, 1e6):
+        estimate = sketch.value(sketch.bucket(value))
+        assert abs(estimate - value) <= ACCURACY * abs(value)
+
+    assert sketch.value(sketch.bucket(0)) == 0.0
+
+
+def test_sketch_quantiles() -> None:
+    sketch = QuantileSketch(accuracy=ACCURACY)
+    buckets: dict[str, float] = {}
+
+    for value in range(1, 101):
+        bucket = sketch.bucket(value)
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+
+    quantiles = sketch.quantiles(buckets, [10, 50, 90])
+
+    for quantile, expected in zip(quantiles, [10.9, 50.5, 90.1]):
+        assert quantile == pytest.approx(expected, rel=2 * ACCURACY, abs=1)
+
+    assert sketch.quantiles({}, [50]) == []
+
+
+async def test_add_and_get(store: TallyStore) -> None:
+    await store.add("form", increments(1.0))
+    await store.add("form", increments(3.0))
+
+    tally = await store.get("form")
+
+    assert tally.counts == {"x:answered": 2, "x:sum": 4.0, "x:squares": 10.0}
+    assert tally.minimums == {"x": 1.0}
+    assert tally.maximums == {"x": 3.0}
+
+
+async def test_fractional_then_integral_sums(store: TallyStore) -> None:
+    await store.add("form", increments(1.5))
+    await store.add("form", increments(2.0))
+
+    tally = await store.get("form")
+
+    assert tally.counts["x:sum"] == 3.5
+    assert tally.counts["x:squares"] == 6.25
+    assert tally.counts["x:answered"] == 2
+
+
+async def test_clear(store: TallyStore) -> None:
+    await store.add("form", increments(1.0))
+    await store.add("other", increments(1.0))
+    await store.clear("form")
+
+    assert await store.get("form") == Tally(counts={}, minimums={}, maximums={})
+    assert (await store.get("other")).counts["x:answered"] == 1
+
+
+async def test_redis_outage_empties_tallies(server: FakeServer) -> None:
+    store = RedisTallyStore(FakeRedis(server=server), prefix="test")
+    await store.add("form", increments(1.0))
+
+    server.connected = False
+    await store.add("form", increments(1.0))
+
+    assert await store.get("form") == Tally(counts={}, minimums={}, maximums={})
+
+    server.connected = True
+
+    assert (await store.get("form")).counts["x:answered"] == 1
+
+
+async def test_rejected_commands_raise(server: FakeServer) -> None:
+    redis = FakeRedis(server=server)
+    store = RedisTallyStore(redis, prefix="test")
+
+    # A key of the wrong type makes Redis reject the increments
+    await redis.set("test:tallies:form:counts", "value")
+
+    with pytest.raises(ResponseError, match="WRONGTYPE"):
+        await store.add("form", increments(1.0))
+
+
+async def test_results(store: TallyStore) -> None:
+    tallies = Tallies(
+        store=store,
+        sketch=QuantileSketch(accuracy=ACCURACY),
+        aggregator=ResultsAggregator(bins=4, max_bins=10),
+    )
+
+    for number, radio in ((1.5, "a"), (2.0, "a"), (4.5, "b"), (None, None)):
+        await tallies.record(FORM, {"number": number, "radio": radio})
+
+    results = await tallies.results(FORM)
+    number, radio = results.fields
+
+    assert results.submissions == 4
+    assert number.answered == 3
+    assert number.mean == pytest.approx(8 / 3)
+    assert number.min == 1.5
+    assert number.max == 4.5
+    assert sum(bin.count for bin in number.histogram) == 3
+    assert [option.count for option in radio.options] == [2, 1]
+
+    await tallies.clear("form")
+
+    assert (await tallies.results(FORM)).submissions == 0
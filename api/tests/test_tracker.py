@@ -0,0 +1,78 @@
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from api.api.app import AppBuilder
+from api.config.models import Config
+from api.submissions.tracker import (
+    MemorySubmissionTracker,
+    RedisSubmissionTracker,
+    SubmissionTracker,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def server() -> FakeServer:
+    return FakeServer()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def tracker(request: pytest.FixtureRequest, server: FakeServer) -> SubmissionTracker:
+    if request.param == "memory":
+        return MemorySubmissionTracker(ttl=60, capacity=10)
+
+    return RedisSubmissionTracker(FakeRedis(server=server), prefix="test", ttl=60)
+
+
+async def test_resume(tracker: SubmissionTracker) -> None:
+    progress = await tracker.start("form", "submission", "token")
+    await tracker.mark(progress, "a")
+    await tracker.mark(progress, "b")
+
+    resumed = await tracker.get("submission", "token")
+
+    assert resumed.form == "form"
+    assert resumed.fields == {"a", "b"}
+    assert await tracker.get("submission", "other") is None
+
+
+async def test_finish(tracker: SubmissionTracker) -> None:
+    progress = await tracker.start("form", "submission", "token")
+    await tracker.mark(progress, "a")
+    await tracker.finish(progress)
+
+    assert await tracker.get("submission", "token") is None
+
+
+async def test_redis_progress_is_shared(server: FakeServer) -> None:
+    first = RedisSubmissionTracker(FakeRedis(server=server), prefix="test", ttl=60)
+    second = RedisSubmissionTracker(FakeRedis(server=server), prefix="test", ttl=60)
+
+    progress = await first.start("form", "submission", "token")
+    await first.mark(progress, "a")
+
+    assert (await second.get("submission", "token")).fields == {"a"}
+
+
+async def test_redis_outage_loses_progress(server: FakeServer) -> None:
+    tracker = RedisSubmissionTracker(FakeRedis(server=server), prefix="test", ttl=60)
+
+    server.connected = False
+    progress = await tracker.start("form", "submission", "token")
+    await tracker.mark(progress, "a")
+
+    assert progress.fields == {"a"}
+    assert await tracker.get("submission", "token") is None
+
+    server.connected = True
+
+    assert await tracker.get("submission", "token") is None
+
+
+def test_memory_tracker_requires_single_worker() -> None:
+    config = Config.model_validate({"server": {"workers": 2}})
+
+    with pytest.raises(ValueError, match="requires Redis"):
+        AppBuilder(config).build()
@@ -0,0 +1,98 @@
+import asyncio
+from collections import Counter
+from time import monotonic
+
+import pytest
+
+from api.metrics import Metrics
+from api.submissions.models import Vote
+from api.submissions.votes import VoteBatcher
+
+pytestmark = pytest.mark.anyio
+
+
+def vote(value: str) -> Vote:
+    return Vote(form="form", field="field", value=value, received=monotonic())
+
+
+def build(metrics: Metrics, retries: int = 2) -> VoteBatcher:
+    return VoteBatcher(
+        size=10,
+        interval=0.0,
+        capacity=100,
+        retries=retries,
+        backoff=0.0,
+        metrics=metrics,
+    )
+
+
+def submitted(metrics: Metrics, result: str) -> float:
+    return metrics.registry.get_sample_value(
+        "api_votes_submitted_total", {"result": result}
+    )
+
+
+class FlakySubmitter:
+    """Submits votes, failing the first attempts of each."""
+
+    def __init__(self, failures: int) -> None:
+        self._failures = failures
+        self.attempts: Counter[str] = Counter()
+        self.submitted: list[str] = []
+
+    async def __call__(self, vote: Vote) -> None:
+        self.attempts[vote.value] += 1
+
+        if self.attempts[vote.value] <= self._failures:
+            raise RuntimeError("upstream failed")
+
+        self.submitted.append(vote.value)
+
+
+async def test_failed_votes_are_retried() -> None:
+    metrics = Metrics()
+    batcher = build(metrics, retries=2)
+    submit = FlakySubmitter(failures=2)
+
+    for value in "abc":
+        batcher.offer(vote(value))
+
+    await batcher.drain(submit)
+
+    assert sorted(submit.submitted) == ["a", "b", "c"]
+    assert submit.attempts == {"a": 3, "b": 3, "c": 3}
+    assert submitted(metrics, "success") == 3
+    assert submitted(metrics, "retry") == 6
+    assert submitted(metrics, "failure") == 0
+
+
+async def test_retries_are_bounded() -> None:
+    metrics = Metrics()
+    batcher = build(metrics, retries=1)
+    submit = FlakySubmitter(failures=5)
+
+    batcher.offer(vote("a"))
+    await batcher.drain(submit)
+
+    assert submit.attempts == {"a": 2}
+    assert submit.submitted == []
+    assert submitted(metrics, "failure") == 1
+
+
+async def test_batches_in_retry_are_drained() -> None:
+    metrics = Metrics()
+    batcher = build(metrics, retries=3)
+    submit = FlakySubmitter(failures=1)
+
+    task = asyncio.create_task(batcher.run(submit))
+    batcher.offer(vote("a"))
+    await asyncio.sleep(0.01)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    batcher.offer(vote("b"))
+    await batcher.drain(submit)
+
+    assert sorted(submit.submitted) == ["a", "b"]
@@ -0,0 +1,81 @@
+import asyncio
+import operator
+import time
+
+import pytest
+
+from api.metrics import Metrics
+from api.workers import WorkerBusyError, WorkerPool, WorkerTimeoutError
+
+pytestmark = pytest.mark.anyio
+
+
+def build(timeout: float = 10.0) -> WorkerPool:
+    pool = WorkerPool(
+        processes=1,
+        queue=0,
+        timeout=timeout,
+        start_method="spawn",
+        metrics=Metrics(),
+    )
+    pool.start()
+    return pool
+
+
+async def wait_until(condition, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+
+async def test_run() -> None:
+    pool = build()
+
+    try:
+        assert await pool.run(operator.add, 1, 2) == 3
+        assert pool.running == 0
+    finally:
+        await pool.close()
+
+
+async def test_cancelled_jobs_keep_their_slots_until_they_finish() -> None:
+    pool = build()
+
+    try:
+        # Start the process, so the job below starts right away
+        await pool.run(operator.add, 1, 2)
+
+        task = asyncio.create_task(pool.run(time.sleep, 1.0))
+        await asyncio.sleep(0.3)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # The process is still busy, so no other job is let in
+        assert pool.running == 1
+
+        with pytest.raises(WorkerBusyError):
+            await pool.run(operator.add, 1, 2)
+
+        await wait_until(lambda: pool.running == 0)
+
+        assert await pool.run(operator.add, 1, 2) == 3
+    finally:
+        await pool.close()
+
+
+async def test_timeouts_free_slots_once_processes_stop() -> None:
+    pool = build(timeout=0.5)
+
+    try:
+        with pytest.raises(WorkerTimeoutError):
+            await pool.run(time.sleep, 30.0)
+
+        await wait_until(lambda: pool.running == 0)
+
+        assert await pool.run(operator.add, 1, 2) == 3
+    finally:
+        await pool.close()